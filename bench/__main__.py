@@ -4,56 +4,114 @@ import argparse
 import asyncio
 import json
 import os
+import sys
 import time
 
+from .arrival import ARRIVAL_PATTERNS
+from .backends import get_backend
+from .calibrate import client_floor_flags, load_client_floor
+from .checkpoint import RunManifest, manifest_path, resume_conflicts, set_manifest
 from .client import ScenarioResult, get_gpu_stats
-from .config import FRAMEWORK_CONFIG, MODEL_PRESETS
-from .scenarios import SCENARIOS
+from .config import FRAMEWORK_CONFIG, MODEL_PRESETS, RUN_OPTIONS
+from .dashboard import Dashboard, set_dashboard
+from .multirun import MULTI_MODES, PointGate, compare_results, set_gate, set_lane
+from .rawlog import RAW_LABELS, RawResultWriter, set_raw_writer
+from .scenarios import OPT_IN_SCENARIOS, SCENARIOS
+from .server_metrics import set_scraper, start_scraper
+from .soak import parse_duration
+from .telemetry import TELEMETRY_SOURCES, set_telemetry, start_telemetry
+from .transport import TRANSPORT_MODES, set_shared_session, start_shared_session
+from .workloads import parse_cache_mode, parse_length_distribution, reset_salt_sequence
 
 
-async def run_benchmark(framework: str, scenarios: list[str], output_dir: str, model_preset: str = "gpt-oss-20b"):
-    """벤치마크 실행."""
-    from .client import check_server_health
+def _write_json(path: str, data: dict):
+    """임시 파일에 쓴 뒤 교체해 중간 저장 중 중단되어도 파일이 깨지지 않게 한다."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
 
-    # 서버 상태 확인
-    config = FRAMEWORK_CONFIG[framework]
-    print(f"\nChecking {framework} server at {config['base_url']}...")
-    healthy = await check_server_health(config["base_url"])
-    if not healthy:
-        print(f"ERROR: {framework} server is not responding at {config['base_url']}")
-        print("Please start the server first. See docs/benchmark_design.md for instructions.")
-        return
 
-    print(f"Server is healthy. Starting benchmark...")
-    print(f"Model: {config['model']}")
+async def _run_framework(
+    framework: str, scenarios: list[str], output_dir: str, model_preset: str, resume: bool
+) -> tuple[dict, list[ScenarioResult]]:
+    """프레임워크 하나의 시나리오 실행과 결과 저장. 저장한 결과 데이터와 ScenarioResult 목록을 반환."""
+    config = FRAMEWORK_CONFIG[framework]
 
-    all_results = []
-    for scenario_name in scenarios:
-        if scenario_name not in SCENARIOS:
-            print(f"Unknown scenario: {scenario_name}. Skipping.")
-            continue
-        scenario_func = SCENARIOS[scenario_name]
-        results = await scenario_func(framework)
-        all_results.extend(results)
-
-    # 결과 저장 (모델명을 파일명에 포함하여 다른 모델 결과와 구분)
+    # 결과 저장 경로 (모델명을 파일명에 포함하여 다른 모델 결과와 구분)
     os.makedirs(output_dir, exist_ok=True)
     output_file = os.path.join(output_dir, f"{framework}_{model_preset}_results.json")
+    raw_file = os.path.join(output_dir, f"{framework}_{model_preset}_raw.jsonl")
     output_data = {
         "framework": framework,
         "model_preset": model_preset,
         "model": config["model"],
+        "api": get_backend(config).name,
+        "transport": RUN_OPTIONS["transport"],
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         "server_config": config,
         "gpu_info": get_gpu_stats(),
-        "results": [r.to_dict() for r in all_results],
+        "raw_results_file": os.path.basename(raw_file),
+        "complete": False,
+        "results": [],
     }
 
-    with open(output_file, "w") as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    # 요청별 원시 결과는 실행 중 JSONL로 계속 기록
+    writer = RawResultWriter(raw_file, run_id=output_data["timestamp"])
+    set_raw_writer(writer)
+
+    # 서버 /metrics 수집 (큐 깊이, KV 캐시 사용률, prefix cache 적중)
+    scraper = await start_scraper(config) if RUN_OPTIONS["server_metrics"] else None
+    set_scraper(scraper)
+    print(f"Server metrics ({framework}): {scraper.url if scraper else 'off'}")
+
+    # 파라미터 포인트마다 체크포인트 (--resume 시 완료 포인트 재사용)
+    manifest = RunManifest(manifest_path(output_dir, framework, model_preset), framework, model_preset, resume=resume)
+    set_manifest(manifest)
+    if resume:
+        print(f"Resuming {framework}: {len(manifest.points)} completed points in {manifest.path}")
+
+    all_results = []
+    try:
+        for scenario_name in scenarios:
+            if scenario_name not in SCENARIOS:
+                print(f"Unknown scenario: {scenario_name}. Skipping.")
+                continue
+            scenario_func = SCENARIOS[scenario_name]
+            token = RAW_LABELS.set({"scenario": scenario_name})
+            try:
+                results = await scenario_func(framework)
+            finally:
+                RAW_LABELS.reset(token)
+                writer.flush()
+            all_results.extend(results)
+
+            # 시나리오마다 중간 저장 (중단되어도 완료된 시나리오는 남음)
+            output_data["results"] = [r.to_dict() for r in all_results]
+            _write_json(output_file, output_data)
+    finally:
+        set_raw_writer(None)
+        set_manifest(None)
+        set_scraper(None)
+        if scraper is not None:
+            await scraper.stop()
+        writer.close()
+
+    # 클라이언트 하한 보정 결과가 있으면 하한에 가까운 지표 표시
+    floor = load_client_floor(output_dir, framework)
+    if floor:
+        for r in all_results:
+            r.client_floor_flags = client_floor_flags(r, floor)
+
+    output_data["complete"] = True
+    output_data["results"] = [r.to_dict() for r in all_results]
+    _write_json(output_file, output_data)
 
     print(f"\n{'='*60}")
     print(f"Results saved to: {output_file}")
+    print(f"Per-request records: {raw_file} ({writer.records} new)")
+    if manifest.resumed:
+        print(f"Resumed points (not re-run): {manifest.resumed}")
     print(f"{'='*60}")
 
     # 요약 출력
@@ -63,23 +121,156 @@ async def run_benchmark(framework: str, scenarios: list[str], output_dir: str, m
     for r in all_results:
         print(
             f"  [{r.scenario}] conc={r.concurrency} in={r.input_tokens} "
-            f"| TTFT={r.avg_ttft_ms}ms | throughput={r.total_token_throughput}tok/s "
+            f"| TTFT={r.avg_ttft_ms}ms | ITL p99={r.p99_itl_ms}ms | throughput={r.total_token_throughput}tok/s "
             f"| p99={r.p99_latency_ms}ms | success={r.success_rate}%"
+            + (f" | CLIENT-BOUND: {','.join(r.client_floor_flags)}" if r.client_floor_flags else "")
+            + (f" | LENGTH-DIVERGENT: {r.output_length.get('delivered_mean')}/{r.output_length.get('requested_mean')} tok"
+               if r.length_divergence else "")
+        )
+    if floor is None:
+        print("  (no client floor calibration; run 'python -m bench calibrate' to flag client-bound numbers)")
+    return output_data, all_results
+
+
+async def _run_lane(framework: str, gate: PointGate | None, *args) -> tuple[dict, list[ScenarioResult]]:
+    """다중 프레임워크 실행의 프레임워크 태스크 (컨텍스트 변수는 이 태스크 안에서만 유효)."""
+    set_lane(framework)
+    reset_salt_sequence()
+    try:
+        return await _run_framework(framework, *args)
+    finally:
+        if gate is not None:
+            await gate.finish(framework)
+
+
+async def _run_multi(
+    frameworks: list[str], scenarios: list[str], output_dir: str, model_preset: str, resume: bool, multi_mode: str
+):
+    """여러 프레임워크를 interleave(포인트 단위 round-robin) 또는 parallel로 실행하고 결과를 합친다."""
+    gate = PointGate(frameworks) if multi_mode == "interleave" else None
+    set_gate(gate)
+    try:
+        runs = await asyncio.gather(*[
+            _run_lane(fw, gate, scenarios, output_dir, model_preset, resume) for fw in frameworks
+        ])
+    finally:
+        set_gate(None)
+
+    comparison = compare_results({fw: results for fw, (_, results) in zip(frameworks, runs)})
+    combined_file = os.path.join(output_dir, f"{'_vs_'.join(frameworks)}_{model_preset}_combined.json")
+    _write_json(combined_file, {
+        "frameworks": frameworks,
+        "mode": multi_mode,
+        "model_preset": model_preset,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "schedule": gate.schedule if gate is not None else [],
+        "comparison": comparison,
+        "runs": {fw: data for fw, (data, _) in zip(frameworks, runs)},
+    })
+
+    print(f"\n{'='*60}")
+    print(f"COMPARISON - {' vs '.join(frameworks)} ({multi_mode})")
+    print(f"{'='*60}")
+    for row in comparison:
+        cells = " | ".join(
+            f"{fw}: TTFT={m['avg_ttft_ms']}ms {m['total_token_throughput']}tok/s" for fw, m in row["frameworks"].items()
         )
+        same = [f"{pair}: {','.join(metrics)}" for pair, metrics in row["no_significant_difference"].items() if metrics]
+        print(f"  [{row['scenario']}] conc={row['concurrency']} in={row['input_tokens']} | {cells}"
+              + (f" | no significant difference ({'; '.join(same)})" if same else ""))
+    print(f"Combined results: {combined_file}")
+
+
+async def run_benchmark(
+    frameworks: list[str],
+    scenarios: list[str],
+    output_dir: str,
+    model_preset: str = "gpt-oss-20b",
+    resume: bool = False,
+    multi_mode: str = "interleave",
+):
+    """벤치마크 실행. resume=True면 매니페스트에 기록된 완료 포인트는 건너뛴다.
+
+    프레임워크가 여럿이면 같은 워크로드로 함께 실행하고 비교 결과 파일을 추가로 남긴다.
+    """
+    from .client import check_server_health
+
+    # 서버 상태 확인 (하나라도 응답이 없으면 비교가 성립하지 않으므로 중단)
+    for framework in frameworks:
+        config = FRAMEWORK_CONFIG[framework]
+        print(f"\nChecking {framework} server at {config['base_url']}...")
+        healthy = await check_server_health(config["base_url"])
+        if not healthy:
+            print(f"ERROR: {framework} server is not responding at {config['base_url']}")
+            print("Please start the server first. See docs/benchmark_design.md for instructions.")
+            return
+
+    print(f"Server is healthy. Starting benchmark...")
+    for framework in frameworks:
+        config = FRAMEWORK_CONFIG[framework]
+        print(f"Model ({framework}): {config['model']}")
+        print(f"API ({framework}): {get_backend(config).name}")
+
+    # shared 전송 모드: 실행 전체에서 세션 하나를 공유 (포인트마다 커넥션 미리 연결)
+    shared_session = start_shared_session()
+    set_shared_session(shared_session)
+    print(f"Transport: {RUN_OPTIONS['transport']}" + (f" via {RUN_OPTIONS['unix_socket']}" if RUN_OPTIONS["unix_socket"] else ""))
+
+    # 실행 중 GPU 상태를 백그라운드에서 샘플링 (프레임워크들이 같은 호스트면 공유)
+    telemetry = start_telemetry(RUN_OPTIONS["gpu_telemetry"])
+    set_telemetry(telemetry)
+    print(f"GPU telemetry: {telemetry.source.name if telemetry else 'off (one-shot nvidia-smi per point)'}")
+
+    # 실시간 대시보드 (포인트별 tqdm 막대 대신)
+    dashboard = Dashboard() if RUN_OPTIONS["dashboard"] else None
+    set_dashboard(dashboard)
+    if dashboard is not None:
+        dashboard.start()
+
+    try:
+        if len(frameworks) == 1:
+            set_lane(frameworks[0])
+            await _run_framework(frameworks[0], scenarios, output_dir, model_preset, resume)
+        else:
+            await _run_multi(frameworks, scenarios, output_dir, model_preset, resume, multi_mode)
+    finally:
+        set_dashboard(None)
+        if dashboard is not None:
+            await dashboard.stop()
+        set_telemetry(None)
+        if telemetry is not None:
+            telemetry.stop()
+        set_shared_session(None)
+        if shared_session is not None:
+            await shared_session.close()
 
 
 def main():
+    # 보조 명령: python -m bench mock-server|calibrate ...
+    if sys.argv[1:2] == ["mock-server"]:
+        from .mock_server import main as mock_server_main
+        return mock_server_main(sys.argv[2:])
+    if sys.argv[1:2] == ["calibrate"]:
+        from .calibrate import main as calibrate_main
+        return calibrate_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(description="LLM Serving Framework Benchmark")
     parser.add_argument(
         "--framework",
         required=True,
-        choices=["sglang", "vllm", "ollama"],
-        help="Target framework to benchmark",
+        help="Target framework(s), comma-separated for a side-by-side run: "
+             f"{','.join(FRAMEWORK_CONFIG)} (mock: local mock server, see 'python -m bench mock-server -h')",
+    )
+    parser.add_argument(
+        "--multi-mode",
+        default="interleave",
+        choices=MULTI_MODES,
+        help="With several frameworks: interleave parameter points round-robin (default) or run them in parallel",
     )
     parser.add_argument(
         "--scenario",
         default="all",
-        help="Comma-separated scenario names: single,concurrent,long_context,prefix_cache,all",
+        help="Comma-separated scenario names: single,concurrent,long_context,prefill_heavy,decode_heavy,interference,prefix_cache,prefix_tree,multi_turn,workload,korean,rate_sweep,goodput,soak,all (all excludes soak)",
     )
     parser.add_argument(
         "--model",
@@ -92,28 +283,218 @@ def main():
         default=None,
         help="Output directory (default: results/<framework>/)",
     )
+    parser.add_argument(
+        "--arrival",
+        default=RUN_OPTIONS["arrival"],
+        choices=ARRIVAL_PATTERNS,
+        help="Arrival pattern for open-loop scenarios (default: poisson)",
+    )
+    parser.add_argument(
+        "--trace-file",
+        default=None,
+        help="Timestamp trace file replayed when --arrival trace",
+    )
+    parser.add_argument(
+        "--goodput-search",
+        default=RUN_OPTIONS["goodput_search"],
+        choices=["concurrency", "rate"],
+        help="Axis searched by the goodput scenario (default: concurrency)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=RUN_OPTIONS["workers"],
+        help="Load generator processes; >1 shards requests across processes for high concurrency (default: 1)",
+    )
+    parser.add_argument(
+        "--gpu-telemetry",
+        default=RUN_OPTIONS["gpu_telemetry"],
+        choices=TELEMETRY_SOURCES,
+        help="Background GPU sampler source; fake generates synthetic values for GPU-less machines (default: auto)",
+    )
+    parser.add_argument(
+        "--dataset",
+        default=None,
+        help="JSONL conversations (ShareGPT 'conversations' or OpenAI 'messages') sampled by the workload scenario",
+    )
+    parser.add_argument(
+        "--input-len-dist",
+        default=RUN_OPTIONS["input_len_dist"],
+        help="Synthetic input length distribution, e.g. 512 or lognormal:mean=512,sigma=0.8,min=16,max=4096",
+    )
+    parser.add_argument(
+        "--output-len-dist",
+        default=RUN_OPTIONS["output_len_dist"],
+        help="Synthetic output length distribution (same format as --input-len-dist)",
+    )
+    parser.add_argument(
+        "--transport",
+        default=RUN_OPTIONS["transport"],
+        choices=TRANSPORT_MODES,
+        help="Connection handling: per-point session (default), shared pre-warmed session, or fresh connection per request",
+    )
+    parser.add_argument(
+        "--unix-socket",
+        default=None,
+        help="Connect to a local server over this Unix domain socket instead of TCP",
+    )
+    parser.add_argument(
+        "--api",
+        default=RUN_OPTIONS["api"],
+        choices=["openai", "native"],
+        help="Request API: openai (/v1/chat/completions) or native (e.g. Ollama /api/chat with server-side timings)",
+    )
+    parser.add_argument(
+        "--output-length",
+        default=RUN_OPTIONS["output_length"],
+        choices=["fixed", "natural"],
+        help="fixed: force exactly max_tokens where supported (ignore_eos/min_tokens); natural: stop at EOS (default: fixed)",
+    )
+    parser.add_argument(
+        "--cache-mode",
+        default=RUN_OPTIONS["cache_mode"],
+        help="Prefix cache control for repeated-prompt scenarios: cold (unique salt per request), "
+             "warm (identical prompts), or ratio:<0..1> (fraction of requests sharing the prompt)",
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=RUN_OPTIONS["trials"],
+        help="Repeated trials per parameter point; samples are pooled and bootstrap CIs reported (default: 1)",
+    )
+    parser.add_argument(
+        "--ci-target",
+        type=float,
+        default=RUN_OPTIONS["ci_target"],
+        help="Keep adding trials until the mean TTFT/latency CI width is below this fraction of the mean, e.g. 0.05",
+    )
+    parser.add_argument(
+        "--max-trials",
+        type=int,
+        default=None,
+        help="Upper bound on trials per point when --ci-target is set (default: 10)",
+    )
+    parser.add_argument(
+        "--soak-duration",
+        default=str(int(RUN_OPTIONS["soak_duration_sec"])),
+        help="How long the soak scenario holds load, e.g. 3600, 30m, 4h (default: 3600 seconds)",
+    )
+    parser.add_argument(
+        "--soak-concurrency",
+        type=int,
+        default=RUN_OPTIONS["soak_concurrency"],
+        help="Concurrent requests kept in flight by the soak scenario (default: 16)",
+    )
+    parser.add_argument(
+        "--soak-window",
+        type=float,
+        default=RUN_OPTIONS["soak_window_sec"],
+        help="Soak metric window length in seconds (default: 60)",
+    )
+    parser.add_argument(
+        "--soak-stop-error-pct",
+        type=float,
+        default=RUN_OPTIONS["soak_stop_error_pct"],
+        help="Stop the soak scenario early when a window's error rate reaches this percent; 0 disables (default: 50)",
+    )
+    parser.add_argument(
+        "--dashboard",
+        action="store_true",
+        help="Live terminal dashboard (throughput, in-flight, TTFT/ITL p50/p99, errors, GPU) instead of progress bars",
+    )
+    parser.add_argument(
+        "--no-server-metrics",
+        action="store_true",
+        help="Do not scrape the framework's Prometheus metrics endpoint during the run",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip parameter points already completed in the run manifest and continue",
+    )
     args = parser.parse_args()
 
+    frameworks = list(dict.fromkeys(f.strip() for f in args.framework.split(",") if f.strip()))
+    for framework in frameworks:
+        if framework not in FRAMEWORK_CONFIG:
+            parser.error(f"unknown framework '{framework}' (choose from {', '.join(FRAMEWORK_CONFIG)})")
+    if not frameworks:
+        parser.error("--framework is empty")
+    if args.arrival == "trace" and not args.trace_file:
+        parser.error("--arrival trace requires --trace-file")
+    if args.api == "native":
+        # 프레임워크마다 API가 섞이면 비교가 성립하지 않으므로 하나라도 없으면 거부
+        missing = [f for f in frameworks if not FRAMEWORK_CONFIG[f].get("native_api")]
+        if missing:
+            parser.error(f"--api native is not available for {', '.join(missing)}")
+    for spec in (args.input_len_dist, args.output_len_dist):
+        try:
+            parse_length_distribution(spec)
+        except ValueError as e:
+            parser.error(str(e))
+    try:
+        parse_cache_mode(args.cache_mode)
+        soak_duration = parse_duration(args.soak_duration)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.soak_window <= 0 or args.soak_concurrency < 1:
+        parser.error("--soak-window must be positive and --soak-concurrency at least 1")
+    RUN_OPTIONS["arrival"] = args.arrival
+    RUN_OPTIONS["trace_path"] = args.trace_file
+    RUN_OPTIONS["goodput_search"] = args.goodput_search
+    RUN_OPTIONS["workers"] = max(1, args.workers)
+    RUN_OPTIONS["gpu_telemetry"] = args.gpu_telemetry
+    RUN_OPTIONS["server_metrics"] = not args.no_server_metrics
+    RUN_OPTIONS["dataset_path"] = args.dataset
+    RUN_OPTIONS["input_len_dist"] = args.input_len_dist
+    RUN_OPTIONS["output_len_dist"] = args.output_len_dist
+    RUN_OPTIONS["cache_mode"] = args.cache_mode
+    RUN_OPTIONS["output_length"] = args.output_length
+    RUN_OPTIONS["api"] = args.api
+    RUN_OPTIONS["transport"] = args.transport
+    RUN_OPTIONS["trials"] = max(1, args.trials)
+    RUN_OPTIONS["ci_target"] = max(0.0, args.ci_target)
+    RUN_OPTIONS["max_trials"] = args.max_trials or (10 if args.ci_target > 0 else RUN_OPTIONS["trials"])
+    RUN_OPTIONS["unix_socket"] = args.unix_socket
+    RUN_OPTIONS["dashboard"] = args.dashboard
+    RUN_OPTIONS["soak_duration_sec"] = soak_duration
+    RUN_OPTIONS["soak_concurrency"] = args.soak_concurrency
+    RUN_OPTIONS["soak_window_sec"] = args.soak_window
+    RUN_OPTIONS["soak_stop_error_pct"] = max(0.0, args.soak_stop_error_pct)
+
     # 모델 프리셋 적용
     if args.model in MODEL_PRESETS:
         preset = MODEL_PRESETS[args.model]
-        FRAMEWORK_CONFIG[args.framework]["model"] = preset[args.framework]
+        for framework in frameworks:
+            FRAMEWORK_CONFIG[framework]["model"] = preset[framework]
 
     if args.scenario == "all":
-        scenarios = list(SCENARIOS.keys())
+        scenarios = [s for s in SCENARIOS if s not in OPT_IN_SCENARIOS]
     else:
         scenarios = [s.strip() for s in args.scenario.split(",")]
 
-    # 프로젝트 루트 기준으로 results/<framework>/
+    # 프로젝트 루트 기준으로 results/<framework>/ (여러 개면 results/<a>_vs_<b>/)
     project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_dir = args.output_dir or os.path.join(project_dir, "results", args.framework)
+    output_dir = args.output_dir or os.path.join(project_dir, "results", "_vs_".join(frameworks))
+    if args.resume:
+        for framework in frameworks:
+            path = manifest_path(output_dir, framework, args.model)
+            conflicts = resume_conflicts(path, framework, args.model)
+            if conflicts:
+                parser.error(f"--resume: {path} was recorded with different settings: {', '.join(conflicts)}. "
+                             "Rerun with the original options or use a new --output-dir")
 
-    print(f"Framework: {args.framework}")
-    print(f"Model: {FRAMEWORK_CONFIG[args.framework]['model']}")
+    print(f"Framework: {', '.join(frameworks)}" + (f" ({args.multi_mode})" if len(frameworks) > 1 else ""))
+    for framework in frameworks:
+        print(f"Model ({framework}): {FRAMEWORK_CONFIG[framework]['model']}")
     print(f"Scenarios: {', '.join(scenarios)}")
+    if RUN_OPTIONS["max_trials"] > 1:
+        print(f"Trials: {RUN_OPTIONS['trials']}-{max(RUN_OPTIONS['trials'], RUN_OPTIONS['max_trials'])}"
+              + (f" (until CI width <= {RUN_OPTIONS['ci_target']:.0%})" if RUN_OPTIONS["ci_target"] else ""))
     print(f"Output: {output_dir}")
 
-    asyncio.run(run_benchmark(args.framework, scenarios, output_dir, args.model))
+    asyncio.run(run_benchmark(frameworks, scenarios, output_dir, args.model, resume=args.resume,
+                              multi_mode=args.multi_mode))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""오픈 루프 부하용 도착 스케줄 생성 (poisson, constant, gamma, trace)."""
+
+import json
+
+import numpy as np
+
+ARRIVAL_PATTERNS = ("poisson", "constant", "gamma", "trace")
+
+
+def poisson_schedule(rate: float, num_requests: int, seed: int = 0) -> np.ndarray:
+    """Poisson 도착: 지수 분포 간격. 반환값은 시작 시점 기준 오프셋(초)."""
+    rng = np.random.default_rng(seed)
+    gaps = rng.exponential(1.0 / rate, num_requests)
+    gaps[0] = 0.0
+    return np.cumsum(gaps)
+
+
+def constant_schedule(rate: float, num_requests: int) -> np.ndarray:
+    """고정 간격 도착."""
+    return np.arange(num_requests, dtype=np.float64) / rate
+
+
+def gamma_schedule(rate: float, num_requests: int, burstiness: float = 0.5, seed: int = 0) -> np.ndarray:
+    """Gamma 분포 간격 도착.
+
+    burstiness는 gamma shape 값이다. 1.0이면 Poisson과 같고,
+    1보다 작을수록 요청이 몰려서 도착한다 (평균 rate는 유지).
+    """
+    rng = np.random.default_rng(seed)
+    gaps = rng.gamma(burstiness, 1.0 / (rate * burstiness), num_requests)
+    gaps[0] = 0.0
+    return np.cumsum(gaps)
+
+
+def load_trace(path: str, time_scale: float = 1.0) -> np.ndarray:
+    """타임스탬프 trace 파일 로드.
+
+    한 줄에 숫자 하나(초) 또는 {"timestamp": <초>} 형태의 JSONL을 받는다.
+    첫 요청이 0초가 되도록 정규화하고, time_scale로 재생 속도를 조절한다
+    (0.5 = 2배속).
+    """
+    timestamps = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                timestamps.append(float(json.loads(line)["timestamp"]))
+            else:
+                timestamps.append(float(line.split(",")[0]))
+    if not timestamps:
+        raise ValueError(f"Trace file has no timestamps: {path}")
+    offsets = np.sort(np.asarray(timestamps, dtype=np.float64))
+    return (offsets - offsets[0]) * time_scale
+
+
+def build_schedule(
+    pattern: str,
+    rate: float,
+    num_requests: int,
+    seed: int = 0,
+    burstiness: float = 0.5,
+    trace_path: str | None = None,
+) -> np.ndarray:
+    """패턴 이름으로 도착 스케줄 생성.
+
+    trace 패턴은 파일의 평균 도착률이 rate가 되도록 시간축을 늘리거나 줄이고
+    (rate <= 0이면 원본 속도로 재생), num_requests보다 길면 앞부분만 사용한다.
+    """
+    if pattern == "poisson":
+        return poisson_schedule(rate, num_requests, seed)
+    if pattern == "constant":
+        return constant_schedule(rate, num_requests)
+    if pattern == "gamma":
+        return gamma_schedule(rate, num_requests, burstiness, seed)
+    if pattern == "trace":
+        if not trace_path:
+            raise ValueError("trace pattern requires a trace file")
+        offsets = load_trace(trace_path)[:num_requests]
+        if rate > 0 and len(offsets) > 1 and offsets[-1] > 0:
+            native_rate = (len(offsets) - 1) / offsets[-1]
+            offsets = offsets * (native_rate / rate)
+        return offsets
+    raise ValueError(f"Unknown arrival pattern: {pattern} (choices: {', '.join(ARRIVAL_PATTERNS)})")
@@ -0,0 +1,193 @@
+"""요청 백엔드: 엔드포인트, 요청 본문, 스트림 파서.
+
+send_request는 백엔드가 만든 파서에 응답 바이트를 넘기기만 하므로, 프레임워크의
+네이티브 API도 같은 측정 경로(TTFT, 청크 도착 시각, 토큰 수)로 비교할 수 있다.
+
+    openai  /v1/chat/completions SSE (모든 프레임워크 공통, 기본값)
+    ollama  Ollama 네이티브 /api/chat NDJSON. 마지막 줄의 load/prompt_eval/eval duration으로
+            서버 측 prefill/decode 시간을 함께 기록한다 (OpenAI 호환 shim 오버헤드 분리용)
+
+--api native면 FRAMEWORK_CONFIG의 native_api 백엔드를 쓴다. SGLang /generate 같은 다른
+네이티브 API는 url/supports_fixed_length/build_payload/new_parser를 가진 백엔드를
+BACKENDS에 추가하면 된다.
+"""
+
+import json
+
+from .config import RUN_OPTIONS
+from .sse import SSEStreamParser, has_string
+
+_NS_PER_MS = 1_000_000
+
+
+def _eos_ignoring_length(payload: dict, max_tokens: int, fixed_length: bool):
+    """vLLM/SGLang: ignore_eos + min_tokens로 정확히 max_tokens개 생성."""
+    if fixed_length:
+        payload["ignore_eos"] = True
+        payload["min_tokens"] = max_tokens
+
+
+def _ollama_length(payload: dict, max_tokens: int, fixed_length: bool):
+    """Ollama: num_predict는 상한일 뿐 EOS 무시 옵션이 없어 고정 길이를 보장하지 못한다."""
+    payload.setdefault("options", {})["num_predict"] = max_tokens
+
+
+def _openai_length(payload: dict, max_tokens: int, fixed_length: bool):
+    """표준 OpenAI 파라미터만 (max_tokens)."""
+
+
+# FRAMEWORK_CONFIG["payload_adapter"] -> 출력 길이 제어 파라미터 적용 함수
+PAYLOAD_ADAPTERS = {
+    "vllm": _eos_ignoring_length,
+    "sglang": _eos_ignoring_length,
+    "ollama": _ollama_length,
+    "openai": _openai_length,
+}
+FIXED_LENGTH_ADAPTERS = {"vllm", "sglang"}
+
+
+class OllamaStreamParser:
+    """Ollama /api/chat NDJSON 스트림용 증분 파서 (SSEStreamParser와 같은 인터페이스).
+
+    줄마다 message.content / message.thinking 문자열이 있는지 바이트 수준에서 판단하고,
+    done 줄만 전체 파싱해 eval_count와 서버 측 duration(ns)을 읽는다.
+    """
+
+    __slots__ = ("_buf", "capture_text", "content_events", "reasoning_events", "usage", "error", "done",
+                 "pieces", "server_timing")
+
+    def __init__(self, capture_text: bool = False):
+        self._buf = b""
+        self.capture_text = capture_text
+        self.content_events = 0
+        self.reasoning_events = 0
+        self.usage = None
+        self.error = ""
+        self.done = False
+        self.pieces = []
+        self.server_timing = None
+
+    @property
+    def text(self) -> str:
+        return "".join(json.loads(p)["message"]["content"] for p in self.pieces)
+
+    def feed(self, chunk: bytes) -> int:
+        """바이트 청크를 처리하고 새로 완성된 토큰 줄 수를 반환."""
+        if self._buf:
+            chunk = self._buf + chunk
+        lines = chunk.split(b"\n")
+        self._buf = lines.pop()
+        count = 0
+        for line in lines:
+            if has_string(line, b'"content":'):
+                count += 1
+                self.content_events += 1
+                if self.capture_text:
+                    self.pieces.append(line)
+            elif has_string(line, b'"thinking":'):
+                count += 1
+                self.reasoning_events += 1
+            if b'"done":true' in line or b'"error":' in line:
+                self._finish(line)
+        return count
+
+    def _finish(self, line: bytes):
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        if data.get("error"):
+            self.error = str(data["error"])
+        if not data.get("done"):
+            return
+        self.done = True
+        if data.get("eval_count") is not None:
+            self.usage = {"prompt_tokens": data.get("prompt_eval_count") or 0, "completion_tokens": data["eval_count"]}
+        self.server_timing = {
+            "load_ms": round((data.get("load_duration") or 0) / _NS_PER_MS, 2),
+            "prefill_ms": round((data.get("prompt_eval_duration") or 0) / _NS_PER_MS, 2),
+            "decode_ms": round((data.get("eval_duration") or 0) / _NS_PER_MS, 2),
+        }
+
+
+class OpenAIChatBackend:
+    """OpenAI 호환 /v1/chat/completions (SSE)."""
+
+    name = "openai"
+
+    def url(self, config: dict) -> str:
+        return f"{config['base_url']}{config['chat_endpoint']}"
+
+    def supports_fixed_length(self, config: dict) -> bool:
+        return config.get("payload_adapter", "openai") in FIXED_LENGTH_ADAPTERS
+
+    def build_payload(self, config: dict, messages: list[dict], max_tokens: int, fixed_length: bool) -> dict:
+        """마지막 청크에 usage를 받도록 요청하고, payload_adapter로 출력 길이 파라미터를 붙인다."""
+        payload = {
+            "model": config["model"],
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        PAYLOAD_ADAPTERS[config.get("payload_adapter", "openai")](payload, max_tokens, fixed_length)
+        return payload
+
+    def new_parser(self, capture_text: bool) -> SSEStreamParser:
+        return SSEStreamParser(capture_text=capture_text)
+
+
+class OllamaChatBackend:
+    """Ollama 네이티브 /api/chat (NDJSON). 출력 길이는 options.num_predict (상한)."""
+
+    name = "ollama"
+    endpoint = "/api/chat"
+
+    def url(self, config: dict) -> str:
+        return f"{config['base_url']}{self.endpoint}"
+
+    def supports_fixed_length(self, config: dict) -> bool:
+        return False
+
+    def build_payload(self, config: dict, messages: list[dict], max_tokens: int, fixed_length: bool) -> dict:
+        payload = {
+            "model": config["model"],
+            "messages": messages,
+            "stream": True,
+            "options": {"temperature": 0},
+        }
+        _ollama_length(payload, max_tokens, fixed_length)
+        return payload
+
+    def new_parser(self, capture_text: bool) -> OllamaStreamParser:
+        return OllamaStreamParser(capture_text=capture_text)
+
+
+BACKENDS = {
+    "openai": OpenAIChatBackend(),
+    "ollama": OllamaChatBackend(),
+}
+
+
+def get_backend(config: dict):
+    """RUN_OPTIONS["api"]가 native이고 프레임워크에 네이티브 백엔드가 있으면 그것, 아니면 OpenAI 호환."""
+    if RUN_OPTIONS["api"] == "native" and config.get("native_api"):
+        return BACKENDS[config["native_api"]]
+    return BACKENDS["openai"]
+
+
+def supports_fixed_length(config: dict) -> bool:
+    """현재 백엔드로 EOS를 무시하고 max_tokens만큼 생성하도록 강제할 수 있는지."""
+    return get_backend(config).supports_fixed_length(config)
+
+
+def build_payload(config: dict, messages: list[dict], max_tokens: int, fixed_length: bool | None = None) -> dict:
+    """현재 백엔드 형식의 스트리밍 요청 본문.
+
+    fixed_length=True면 지원하는 프레임워크에서 EOS를 무시하고 정확히 max_tokens개를 생성하게 한다.
+    None이면 RUN_OPTIONS["output_length"]를 따른다.
+    """
+    if fixed_length is None:
+        fixed_length = RUN_OPTIONS["output_length"] == "fixed"
+    return get_backend(config).build_payload(config, messages, max_tokens, fixed_length)
@@ -0,0 +1,145 @@
+"""클라이언트 오버헤드 자체 보정 (client floor 측정).
+
+같은 프로세스에서 지연 0인 모의 서버를 띄우고 run_concurrent_requests 전체 경로
+(payload 인코딩, 커넥션, SSE 파싱, as_completed 스케줄링, tqdm)를 그대로 실행해
+클라이언트만으로 생기는 TTFT/ITL 하한과 최대 req/s, chunks/s를 측정한다.
+결과는 results/<framework>/<framework>_client_floor.json에 저장되고, 이후 벤치마크
+결과 중 이 하한에 가까운 수치는 client_floor_flags로 표시된다.
+
+    python -m bench calibrate --framework vllm
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from .client import ScenarioResult, run_concurrent_requests
+from .config import CLIENT_FLOOR_FACTOR, FRAMEWORK_CONFIG, RUN_OPTIONS
+from .mock_server import LATENCY_PRESETS, start_mock_server
+from .prompts import generate_prompt
+
+
+def floor_path(output_dir: str, framework: str) -> str:
+    return os.path.join(output_dir, f"{framework}_client_floor.json")
+
+
+async def measure_client_floor(
+    concurrency_levels: list[int],
+    input_tokens: int = 512,
+    output_tokens: int = 256,
+    requests_per_level: int = 200,
+) -> dict:
+    """지연 0 모의 서버 대상으로 동시성 레벨별 클라이언트 하한 측정."""
+    runner, base_url = await start_mock_server(LATENCY_PRESETS["zero"])
+    saved_url = FRAMEWORK_CONFIG["mock"]["base_url"]
+    FRAMEWORK_CONFIG["mock"]["base_url"] = base_url
+
+    messages = [{"role": "user", "content": generate_prompt(input_tokens)}]
+    levels = {}
+    try:
+        for conc in concurrency_levels:
+            num_requests = max(requests_per_level, conc * 4)
+            print(f"\n--- Calibration: concurrency {conc}, Requests: {num_requests} ---")
+            results, elapsed = await run_concurrent_requests(
+                "mock", [messages] * num_requests, output_tokens, concurrency=conc
+            )
+            sr = ScenarioResult(
+                scenario="client_floor",
+                framework="mock",
+                concurrency=conc,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                num_requests=num_requests,
+                results=results,
+                total_time_sec=round(elapsed, 2),
+            )
+            sr.compute_aggregates()
+            chunks = sum(len(r.token_times_ms) for r in results if r.success)
+            levels[str(conc)] = {
+                "avg_ttft_ms": sr.avg_ttft_ms,
+                "p50_ttft_ms": sr.p50_ttft_ms,
+                "p99_ttft_ms": sr.p99_ttft_ms,
+                "avg_itl_ms": sr.avg_itl_ms,
+                "p50_itl_ms": sr.p50_itl_ms,
+                "p99_itl_ms": sr.p99_itl_ms,
+                "max_request_throughput": sr.request_throughput,
+                "max_chunk_throughput": round(chunks / elapsed, 2) if elapsed > 0 else 0.0,
+                "success_rate": sr.success_rate,
+            }
+            print(
+                f"  TTFT p50/p99: {sr.p50_ttft_ms}/{sr.p99_ttft_ms} ms | ITL p50/p99: {sr.p50_itl_ms}/{sr.p99_itl_ms} ms"
+                f" | {sr.request_throughput} req/s | {levels[str(conc)]['max_chunk_throughput']} chunks/s"
+            )
+    finally:
+        FRAMEWORK_CONFIG["mock"]["base_url"] = saved_url
+        await runner.cleanup()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "workers": RUN_OPTIONS["workers"],
+        "levels": levels,
+    }
+
+
+def default_floor_dir(framework: str) -> str:
+    """calibrate의 기본 저장 위치 (results/<framework>/)."""
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(project_dir, "results", framework)
+
+
+def load_client_floor(output_dir: str, framework: str) -> dict | None:
+    """output_dir의 보정 파일, 없으면 기본 위치의 파일 (다중 프레임워크 결과는 results/<a>_vs_<b>/에 저장되므로)."""
+    for directory in (output_dir, default_floor_dir(framework)):
+        path = floor_path(directory, framework)
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+    return None
+
+
+def _nearest_level(floor: dict, concurrency: int) -> dict:
+    levels = sorted(int(c) for c in floor["levels"])
+    # 오픈 루프(concurrency=0)는 가장 낮은 레벨과 비교
+    idx = int(np.searchsorted(levels, max(concurrency, 1), side="right")) - 1
+    return floor["levels"][str(levels[max(idx, 0)])]
+
+
+def client_floor_flags(sr: ScenarioResult, floor: dict, factor: float = CLIENT_FLOOR_FACTOR) -> list[str]:
+    """측정값이 클라이언트 하한의 factor배 이내면 신뢰할 수 없는 지표로 표시."""
+    ref = _nearest_level(floor, sr.concurrency)
+    flags = []
+    if 0 < sr.avg_ttft_ms <= ref["avg_ttft_ms"] * factor:
+        flags.append("ttft")
+    if 0 < sr.avg_itl_ms <= ref["avg_itl_ms"] * factor:
+        flags.append("itl")
+    if ref["max_request_throughput"] > 0 and sr.request_throughput * factor >= ref["max_request_throughput"]:
+        flags.append("request_throughput")
+    return flags
+
+
+def main(argv: list[str] | None = None):
+    from .scenarios import CONCURRENT_LOAD_LEVELS
+
+    parser = argparse.ArgumentParser(prog="python -m bench calibrate", description="Measure the benchmark client's own overhead floor")
+    parser.add_argument("--framework", required=True, choices=list(FRAMEWORK_CONFIG.keys()),
+                        help="Framework whose results directory receives the floor file")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: results/<framework>/)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level (default: 200)")
+    parser.add_argument("--workers", type=int, default=RUN_OPTIONS["workers"], help="Load generator processes (default: 1)")
+    args = parser.parse_args(argv)
+
+    RUN_OPTIONS["workers"] = max(1, args.workers)
+    output_dir = args.output_dir or default_floor_dir(args.framework)
+
+    floor = asyncio.run(measure_client_floor(CONCURRENT_LOAD_LEVELS, requests_per_level=args.requests))
+    os.makedirs(output_dir, exist_ok=True)
+    path = floor_path(output_dir, args.framework)
+    with open(path, "w") as f:
+        json.dump(floor, f, indent=2)
+    print(f"\nClient floor saved to: {path}")
@@ -0,0 +1,120 @@
+"""실행 매니페스트 기반 체크포인트와 재개 (--resume).
+
+파라미터 포인트(ScenarioResult 1개)가 끝날 때마다 (framework, model preset, scenario,
+파라미터) 키로 결과를 매니페스트 파일에 기록한다. --resume으로 다시 실행하면
+완료된 포인트는 서버에 요청하지 않고 저장된 집계값을 그대로 사용한다.
+
+측정값을 바꾸는 실행 옵션(MANIFEST_OPTIONS)은 매니페스트 헤더에 기록하며, 프레임워크/모델
+프리셋이나 이 옵션이 달라진 상태로는 재개하지 않는다 (다른 조건의 결과가 섞이지 않게).
+"""
+
+import contextvars
+import json
+import os
+import time
+
+from .client import ScenarioResult
+from .config import RUN_OPTIONS
+
+# 다중 프레임워크 실행에서는 프레임워크 태스크마다 따로 설정된다
+_manifest: contextvars.ContextVar = contextvars.ContextVar("manifest", default=None)
+
+# 포인트 키에 들어가지 않지만 측정값을 바꾸는 RUN_OPTIONS 항목 (cache_mode, soak 길이/동시성은 키에 포함)
+MANIFEST_OPTIONS = (
+    "arrival", "trace_path", "goodput_search", "workers",
+    "dataset_path", "input_len_dist", "output_len_dist",
+    "output_length", "api", "transport", "unix_socket",
+    "trials", "max_trials", "ci_target",
+    "soak_window_sec", "soak_stop_error_pct",
+)
+
+
+def manifest_path(output_dir: str, framework: str, model_preset: str) -> str:
+    return os.path.join(output_dir, f"{framework}_{model_preset}_manifest.json")
+
+
+def run_options() -> dict:
+    """매니페스트 헤더에 기록하는 현재 실행 옵션."""
+    return {name: RUN_OPTIONS[name] for name in MANIFEST_OPTIONS}
+
+
+def resume_conflicts(path: str, framework: str, model_preset: str) -> list[str]:
+    """path의 매니페스트를 현재 설정으로 재개할 수 없는 이유 (파일이 없거나 모두 같으면 빈 리스트)."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        data = json.load(f)
+    recorded = {"framework": data.get("framework"), "model_preset": data.get("model_preset")}
+    if "run_options" not in data:
+        return ["run options were not recorded (manifest from an older version)"]
+    recorded.update(data["run_options"])
+    current = {"framework": framework, "model_preset": model_preset, **run_options()}
+    return [
+        f"{name}={recorded[name]!r} (now {value!r})" if name in recorded else f"{name} not recorded"
+        for name, value in current.items()
+        if recorded.get(name, object()) != value
+    ]
+
+
+class RunManifest:
+    """완료된 파라미터 포인트 -> ScenarioResult dict 저장소. 매 기록마다 원자적으로 저장."""
+
+    def __init__(self, path: str, framework: str, model_preset: str, resume: bool = False):
+        self.path = path
+        self.framework = framework
+        self.model_preset = model_preset
+        self.options = run_options()
+        self.points: dict[str, dict] = {}
+        self.resumed = 0
+        if resume and os.path.exists(path):
+            conflicts = resume_conflicts(path, framework, model_preset)
+            if conflicts:
+                raise ValueError(f"cannot resume {path}: {', '.join(conflicts)}")
+            with open(path) as f:
+                self.points = json.load(f).get("points", {})
+
+    def key(self, scenario: str, **params) -> str:
+        parts = [self.framework, self.model_preset, scenario]
+        parts += [f"{k}={params[k]}" for k in sorted(params)]
+        return "|".join(parts)
+
+    def get(self, key: str) -> ScenarioResult | None:
+        d = self.points.get(key)
+        return ScenarioResult.from_dict(d) if d is not None else None
+
+    def save(self, key: str, sr: ScenarioResult):
+        self.points[key] = sr.to_dict()
+        data = {
+            "framework": self.framework,
+            "model_preset": self.model_preset,
+            "run_options": self.options,
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "points": self.points,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def set_manifest(manifest: RunManifest | None):
+    _manifest.set(manifest)
+
+
+def completed_point(scenario: str, **params) -> ScenarioResult | None:
+    """이미 완료된 포인트면 저장된 결과를 반환 (활성 매니페스트가 없으면 None)."""
+    manifest = _manifest.get()
+    if manifest is None:
+        return None
+    sr = manifest.get(manifest.key(scenario, **params))
+    if sr is not None:
+        manifest.resumed += 1
+        print(f"  (resume) {scenario} {params} already completed, skipping")
+    return sr
+
+
+def checkpoint_point(sr: ScenarioResult, **params):
+    """포인트 결과를 매니페스트에 기록 (키는 sr.scenario + params)."""
+    manifest = _manifest.get()
+    if manifest is not None:
+        manifest.save(manifest.key(sr.scenario, **params), sr)
@@ -1,28 +1,83 @@
 """RequestResult, ScenarioResult, HTTP 요청, GPU 조회."""
 
 import asyncio
-import json
 import statistics
 import subprocess
 import time
-from dataclasses import asdict, dataclass, field
+from array import array
+from dataclasses import asdict, dataclass, field, fields, replace
 
 import aiohttp
 import numpy as np
-from tqdm import tqdm
 
-from .config import FRAMEWORK_CONFIG, REQUEST_TIMEOUT
+from .config import (
+    FRAMEWORK_CONFIG,
+    ITL_STALL_THRESHOLD_MS,
+    OUTPUT_LENGTH_DIVERGENCE_PCT,
+    OUTPUT_LENGTH_TOLERANCE,
+    REQUEST_TIMEOUT,
+    RUN_OPTIONS,
+    SKETCH_WINDOW_SEC,
+    SLO_ITL_MS,
+    SLO_P99_TTFT_MS,
+)
+from .backends import BACKENDS, build_payload, get_backend, supports_fixed_length
+from .dashboard import live_stats, progress
+from .rawlog import begin_point, record_result
+from .sketch import window_summaries
+from .stats import point_confidence, run_trials
+from .transport import RequestTiming, open_session
+from .tokenizer import count_prompt_tokens, count_tokens, get_tokenizer
 
 
 @dataclass
 class RequestResult:
     """단일 요청의 결과."""
     success: bool
-    ttft_ms: float = 0.0          # Time to First Token (ms)
+    ttft_ms: float = 0.0          # Time to First Token (ms), reasoning 토큰 포함
+    content_ttft_ms: float = 0.0  # 첫 콘텐츠(답변) 토큰까지 (ms), reasoning이 없으면 ttft_ms와 같음
     total_latency_ms: float = 0.0  # 총 레이턴시 (ms)
-    tokens_generated: int = 0      # 생성된 토큰 수
+    tokens_generated: int = 0      # 생성된 토큰 수 (reasoning 포함, token_count_source 참고)
+    reasoning_tokens: int = 0      # 그중 reasoning 토큰 수 (delta.reasoning_content 등)
+    prompt_tokens: int = 0         # 입력 토큰 수 (usage 또는 로컬 토크나이저)
+    token_count_source: str = ""   # usage: 서버 usage 필드, tokenizer: 로컬 토크나이저, chunks: SSE 청크 수 근사
     token_throughput: float = 0.0  # tokens/sec (이 요청 기준)
     error: str = ""
+    index: int = -1                # messages_list 내 요청 순번
+    max_tokens: int = 0            # 이 요청의 max_tokens (워크로드에 따라 요청마다 다를 수 있음)
+    start_offset_ms: float = 0.0   # 실행 시작 기준 실제 전송 시각 (ms)
+    scheduled_ms: float = 0.0      # 오픈 루프: 예정 전송 시각 (ms)
+    send_lag_ms: float = 0.0       # 오픈 루프: 예정 대비 실제 전송 지연 (ms)
+    trial: int = 0                 # 반복 시행 번호 (bench.stats.run_trials)
+    # 서버가 보고한 단계별 시간 (ms, 네이티브 Ollama API 등 지원하는 백엔드만)
+    server_load_ms: float = 0.0
+    server_prefill_ms: float = 0.0
+    server_decode_ms: float = 0.0
+    # 연결 단계 시간 (ms, 요청 시작 기준, bench.transport). 재사용 커넥션이면 dns/connect는 0
+    dns_ms: float = 0.0
+    pool_wait_ms: float = 0.0      # 커넥션 풀 대기
+    connect_ms: float = 0.0        # 새 TCP/Unix 소켓 연결
+    first_byte_ms: float = 0.0     # 응답 헤더 수신까지
+    conn_reused: bool = False
+    # 콘텐츠 청크별 도착 시각 (요청 시작 기준 ms)
+    token_times_ms: array = field(default_factory=lambda: array("d"), repr=False)
+    output_text: str = field(default="", repr=False)  # capture_text=True일 때만 (멀티턴 대화 이어가기용)
+
+    @property
+    def mean_itl_ms(self) -> float:
+        """첫 토큰 이후 토큰 간 평균 지연 (ms) = TPOT."""
+        if self.tokens_generated < 2:
+            return 0.0
+        return (self.total_latency_ms - self.ttft_ms) / (self.tokens_generated - 1)
+
+    def inter_token_latencies(self) -> np.ndarray:
+        """연속한 청크 간 지연 (ms)."""
+        return np.diff(np.frombuffer(self.token_times_ms, dtype=np.float64))
+
+
+def meets_slo(r: RequestResult, ttft_ms: float = SLO_P99_TTFT_MS, itl_ms: float = SLO_ITL_MS) -> bool:
+    """요청이 TTFT/ITL SLO를 모두 만족했는지 여부."""
+    return r.success and 0 < r.ttft_ms <= ttft_ms and r.mean_itl_ms <= itl_ms
 
 
 @dataclass
@@ -45,12 +100,70 @@ class ScenarioResult:
     p50_latency_ms: float = 0.0
     p95_latency_ms: float = 0.0
     p99_latency_ms: float = 0.0
+    # TPOT: 요청별 (총 레이턴시 - TTFT) / (토큰 수 - 1)
+    avg_tpot_ms: float = 0.0
+    p50_tpot_ms: float = 0.0
+    p95_tpot_ms: float = 0.0
+    p99_tpot_ms: float = 0.0
+    max_tpot_ms: float = 0.0
+    # ITL: 모든 요청의 연속 청크 간 지연 분포
+    avg_itl_ms: float = 0.0
+    p50_itl_ms: float = 0.0
+    p95_itl_ms: float = 0.0
+    p99_itl_ms: float = 0.0
+    max_itl_ms: float = 0.0
+    itl_stall_count: int = 0       # ITL_STALL_THRESHOLD_MS 초과 간격 수
+    stalled_requests: int = 0      # stall이 한 번 이상 발생한 요청 수
     total_token_throughput: float = 0.0
     request_throughput: float = 0.0
     success_rate: float = 0.0
     total_time_sec: float = 0.0
-    gpu_memory_mb: float = 0.0
-    gpu_utilization_pct: float = 0.0
+    avg_prompt_tokens: float = 0.0  # 실측 입력 토큰 수 평균 (usage/토크나이저)
+    token_count_source: str = ""    # 출력 토큰 수 출처 (요청별 출처가 섞이면 "mixed")
+    # 요청 대비 실제 출력 길이 분포와 reasoning 토큰, 불일치 여부
+    output_length: dict = field(default_factory=dict)
+    length_divergence: bool = False
+    fixed_length: bool | None = None  # 출력 길이를 ignore_eos/min_tokens로 고정했는지 (None이면 실행 옵션으로 판단)
+    # 요청 백엔드와 서버 측 prefill/decode 시간 대비 클라이언트 측정값
+    api: str = ""
+    server_timing: dict = field(default_factory=dict)
+    transport: dict = field(default_factory=dict)  # 전송 모드와 새/재사용 커넥션별 연결 시간, TTFT
+    gpu_memory_mb: float = 0.0        # 텔레메트리가 있으면 실행 구간 peak
+    gpu_utilization_pct: float = 0.0  # 텔레메트리가 있으면 실행 구간 평균
+    gpu_telemetry: dict = field(default_factory=dict)  # peak/mean 값과 시계열
+    server_metrics: dict = field(default_factory=dict)  # 서버 /metrics 구간 요약 (큐 깊이, KV 캐시, prefix 적중률)
+
+    # 오픈 루프 (rate 기반) 실행 정보
+    arrival_pattern: str = ""
+    offered_rate_rps: float = 0.0
+    avg_send_lag_ms: float = 0.0
+    p99_send_lag_ms: float = 0.0
+    slo_met: bool | None = None
+
+    # Goodput: TTFT/ITL SLO를 만족한 요청 기준 처리량
+    goodput_rps: float = 0.0
+    slo_attainment_pct: float = 0.0
+    goodput_search: dict = field(default_factory=dict)  # goodput 시나리오의 탐색 기록
+
+    # 합성/데이터셋 워크로드 구성과 캐시 적중 예상/콜드, 턴별 TTFT
+    workload: dict = field(default_factory=dict)
+    ttft_by_cache: dict = field(default_factory=dict)
+    ttft_by_turn: dict = field(default_factory=dict)  # 멀티턴 세션: 턴별 TTFT와 기록 길이 대비 기울기
+    cache_mode: str = ""  # 반복 프롬프트 시나리오의 캐시 제어 모드 (cold, warm, ratio:x)
+
+    # prefill/decode 분리 측정
+    prefill_throughput: float = 0.0  # prefill 위주 시나리오: 처리한 입력 tok/s
+    decode_throughput: float = 0.0   # decode 위주 시나리오: 배치 전체가 디코드 중인 구간의 출력 tok/s
+    interference: dict = field(default_factory=dict)  # prefill 주입 구간 안팎의 decode ITL 비교
+
+    # 지표별 부트스트랩 신뢰구간과 표본/시행 수 (bench.stats.point_confidence)
+    confidence: dict = field(default_factory=dict)
+    # 완료 시각 기준 구간별 TTFT/레이턴시 분위수와 처리량 (bench.sketch, 긴 포인트만)
+    windows: list = field(default_factory=list)
+    soak: dict = field(default_factory=dict)  # soak 시나리오: 구간 지표 추세 검정, 오류 burst, 조기 중단 사유
+
+    # 클라이언트 하한에 가까워 신뢰할 수 없는 지표 (ttft, itl, request_throughput)
+    client_floor_flags: list = field(default_factory=list)
 
     def compute_aggregates(self):
         """개별 결과로부터 집계 메트릭 계산."""
@@ -67,25 +180,156 @@ class ScenarioResult:
 
         if ttfts:
             self.avg_ttft_ms = round(statistics.mean(ttfts), 2)
-            self.p50_ttft_ms = round(np.percentile(ttfts, 50), 2)
-            self.p95_ttft_ms = round(np.percentile(ttfts, 95), 2)
-            self.p99_ttft_ms = round(np.percentile(ttfts, 99), 2)
+            self.p50_ttft_ms = round(float(np.percentile(ttfts, 50)), 2)
+            self.p95_ttft_ms = round(float(np.percentile(ttfts, 95)), 2)
+            self.p99_ttft_ms = round(float(np.percentile(ttfts, 99)), 2)
 
         if latencies:
             self.avg_latency_ms = round(statistics.mean(latencies), 2)
-            self.p50_latency_ms = round(np.percentile(latencies, 50), 2)
-            self.p95_latency_ms = round(np.percentile(latencies, 95), 2)
-            self.p99_latency_ms = round(np.percentile(latencies, 99), 2)
+            self.p50_latency_ms = round(float(np.percentile(latencies, 50)), 2)
+            self.p95_latency_ms = round(float(np.percentile(latencies, 95)), 2)
+            self.p99_latency_ms = round(float(np.percentile(latencies, 99)), 2)
+
+        prompt_counts = [r.prompt_tokens for r in successful if r.prompt_tokens > 0]
+        if prompt_counts:
+            self.avg_prompt_tokens = round(statistics.mean(prompt_counts), 2)
+        sources = {r.token_count_source for r in successful}
+        self.token_count_source = sources.pop() if len(sources) == 1 else "mixed"
+
+        tpots = [r.mean_itl_ms for r in successful if r.tokens_generated >= 2]
+        if tpots:
+            self.avg_tpot_ms = round(statistics.mean(tpots), 2)
+            self.p50_tpot_ms = round(float(np.percentile(tpots, 50)), 2)
+            self.p95_tpot_ms = round(float(np.percentile(tpots, 95)), 2)
+            self.p99_tpot_ms = round(float(np.percentile(tpots, 99)), 2)
+            self.max_tpot_ms = round(max(tpots), 2)
+
+        gaps_per_request = [r.inter_token_latencies() for r in successful]
+        gaps_per_request = [g for g in gaps_per_request if g.size]
+        if gaps_per_request:
+            itls = np.concatenate(gaps_per_request)
+            self.avg_itl_ms = round(float(itls.mean()), 2)
+            self.p50_itl_ms, self.p95_itl_ms, self.p99_itl_ms = (
+                round(float(v), 2) for v in np.percentile(itls, [50, 95, 99])
+            )
+            self.max_itl_ms = round(float(itls.max()), 2)
+            self.itl_stall_count = int((itls > ITL_STALL_THRESHOLD_MS).sum())
+            self.stalled_requests = sum(1 for g in gaps_per_request if (g > ITL_STALL_THRESHOLD_MS).any())
 
         if self.total_time_sec > 0:
             self.total_token_throughput = round(total_tokens / self.total_time_sec, 2)
             self.request_throughput = round(len(successful) / self.total_time_sec, 2)
 
+        if self.fixed_length is None:
+            self.fixed_length = (RUN_OPTIONS["output_length"] == "fixed"
+                                 and supports_fixed_length(FRAMEWORK_CONFIG.get(self.framework, {})))
+        self._compute_output_length(successful)
+        if not self.api:
+            self.api = get_backend(FRAMEWORK_CONFIG.get(self.framework, {})).name
+        self._compute_server_timing(successful)
+        self._compute_transport(successful)
+        self.confidence = point_confidence(successful)
+        # 시행이 여럿이면 start_offset_ms 기준이 시행마다 달라 구간을 나누지 않는다
+        if self.total_time_sec >= 2 * SKETCH_WINDOW_SEC and len({r.trial for r in self.results}) == 1:
+            self.windows = window_summaries(self.results)
+
+        good = sum(1 for r in successful if meets_slo(r))
+        self.slo_attainment_pct = round(good / len(self.results) * 100, 2)
+        if self.total_time_sec > 0:
+            self.goodput_rps = round(good / self.total_time_sec, 2)
+
+        if self.arrival_pattern:
+            lags = [r.send_lag_ms for r in self.results]
+            self.avg_send_lag_ms = round(statistics.mean(lags), 2)
+            self.p99_send_lag_ms = round(float(np.percentile(lags, 99)), 2)
+
+    def compute_from_aggregator(self, aggregator):
+        """요청별 결과 대신 StreamingAggregator(bench.sketch)로 집계 필드를 채운다 (장시간 실행, 상수 메모리).
+
+        분위수는 스케치의 상대 오차 이내 근사이고, 출력 길이/서버 timing/전송 요약과 CI는 계산하지 않는다.
+        """
+        aggregator.fill(self)
+        if self.fixed_length is None:
+            self.fixed_length = (RUN_OPTIONS["output_length"] == "fixed"
+                                 and supports_fixed_length(FRAMEWORK_CONFIG.get(self.framework, {})))
+        if not self.api:
+            self.api = get_backend(FRAMEWORK_CONFIG.get(self.framework, {})).name
+
+    def _compute_output_length(self, successful: list[RequestResult]):
+        """요청한 max_tokens 대비 실제 생성 길이. 불일치 비율이 기준을 넘으면 length_divergence."""
+        delivered = np.array([r.tokens_generated for r in successful], dtype=np.float64)
+        requested = np.array([r.max_tokens for r in successful], dtype=np.float64)
+        p50, p99 = np.percentile(delivered, [50, 99])
+        summary = {
+            "requested_mean": round(float(requested.mean()), 2),
+            "delivered_mean": round(float(delivered.mean()), 2),
+            "delivered_min": int(delivered.min()),
+            "delivered_p50": round(float(p50), 2),
+            "delivered_p99": round(float(p99), 2),
+            "delivered_max": int(delivered.max()),
+            "reasoning_mean": round(statistics.mean(r.reasoning_tokens for r in successful), 2),
+        }
+        known = requested > 0
+        if known.any():
+            tolerance = np.maximum(1.0, requested[known] * OUTPUT_LENGTH_TOLERANCE)
+            diff = delivered[known] - requested[known]
+            summary["short_pct"] = round(float((diff < -tolerance).mean() * 100), 2)
+            summary["long_pct"] = round(float((diff > tolerance).mean() * 100), 2)
+            self.length_divergence = summary["short_pct"] + summary["long_pct"] > OUTPUT_LENGTH_DIVERGENCE_PCT
+        self.output_length = summary
+
+    def _compute_server_timing(self, successful: list[RequestResult]):
+        """서버 보고 prefill/decode 시간과 클라이언트 측정값의 차이 (HTTP, API 변환 등 서버 밖 오버헤드)."""
+        timed = [r for r in successful if r.server_prefill_ms > 0]
+        if not timed:
+            return
+        self.server_timing = {
+            "count": len(timed),
+            "avg_load_ms": round(statistics.mean(r.server_load_ms for r in timed), 2),
+            "avg_prefill_ms": round(statistics.mean(r.server_prefill_ms for r in timed), 2),
+            "avg_decode_ms": round(statistics.mean(r.server_decode_ms for r in timed), 2),
+            "avg_client_ttft_ms": round(statistics.mean(r.ttft_ms for r in timed), 2),
+            "avg_client_decode_ms": round(statistics.mean(r.total_latency_ms - r.ttft_ms for r in timed), 2),
+            # 첫 토큰까지 중 서버가 load/prefill에 쓰지 않은 시간
+            "avg_ttft_overhead_ms": round(
+                statistics.mean(r.ttft_ms - r.server_load_ms - r.server_prefill_ms for r in timed), 2
+            ),
+        }
+
+    def _compute_transport(self, successful: list[RequestResult]):
+        """새 커넥션/재사용 커넥션 요청의 연결 단계 시간과 TTFT 비교."""
+        new = [r for r in successful if not r.conn_reused]
+        reused = [r for r in successful if r.conn_reused]
+
+        def avg(values):
+            values = list(values)
+            return round(statistics.mean(values), 3) if values else None
+
+        self.transport = {
+            "mode": RUN_OPTIONS["transport"],
+            "unix_socket": bool(RUN_OPTIONS["unix_socket"]),
+            "new_connections": len(new),
+            "reused_connections": len(reused),
+            "avg_dns_ms": avg(r.dns_ms for r in new),
+            "avg_connect_ms": avg(r.connect_ms for r in new),
+            "avg_pool_wait_ms": avg(r.pool_wait_ms for r in successful),
+            "avg_first_byte_ms": avg(r.first_byte_ms for r in successful),
+            "avg_ttft_new_conn_ms": avg(r.ttft_ms for r in new),
+            "avg_ttft_reused_conn_ms": avg(r.ttft_ms for r in reused),
+        }
+
     def to_dict(self):
-        d = asdict(self)
+        # 요청별 결과는 제외 (asdict의 깊은 복사 비용도 피함)
+        d = asdict(replace(self, results=[]))
         d.pop("results", None)
         return d
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "ScenarioResult":
+        """to_dict 결과에서 복원 (체크포인트 재개용, 요청별 결과는 없음)."""
+        names = {f.name for f in fields(cls)} - {"results"}
+        return cls(**{k: v for k, v in d.items() if k in names})
+
 
 def get_gpu_stats() -> dict:
     """nvidia-smi로 GPU 메모리 및 활용률 조회."""
@@ -114,9 +358,9 @@ def get_gpu_stats() -> dict:
 
 
 async def check_server_health(base_url: str) -> bool:
-    """서버 health 체크."""
+    """서버 health 체크 (실행과 같은 전송 모드/소켓으로 연결)."""
     health_paths = ["/health", "/v1/models", "/api/tags"]
-    async with aiohttp.ClientSession() as session:
+    async with open_session(limit=1) as session:
         for path in health_paths:
             try:
                 async with session.get(
@@ -129,47 +373,75 @@ async def check_server_health(base_url: str) -> bool:
     return False
 
 
+def max_tokens_at(max_tokens: int | list[int], index: int) -> int:
+    """요청별 max_tokens (정수면 모든 요청에 같은 값, 목록이면 index번째 값)."""
+    return max_tokens if isinstance(max_tokens, int) else int(max_tokens[index])
+
+
 async def send_request(
     session: aiohttp.ClientSession,
     url: str,
     payload: dict,
+    tokenizer=None,
+    capture_text: bool = False,
+    backend=None,
 ) -> RequestResult:
-    """단일 스트리밍 요청을 보내고 TTFT, 총 레이턴시, 생성 토큰 수를 측정."""
+    """단일 스트리밍 요청을 보내고 TTFT, 총 레이턴시, 생성 토큰 수, 청크별 도착 시각을 측정.
+
+    토큰 수는 서버의 usage 청크를 우선 사용하고, 없으면 tokenizer로 응답 텍스트를
+    다시 세며, 둘 다 없으면 콘텐츠 청크 수로 근사한다.
+    capture_text=True면 응답 텍스트를 output_text에 담는다.
+    backend는 스트림 파서를 정하며 없으면 OpenAI 호환 SSE로 처리한다 (bench.backends).
+    대시보드가 켜져 있으면 시작/종료 때만 실시간 카운터를 갱신한다 (bench.dashboard).
+    """
+    token_times = array("d")
+    live = live_stats()
+    if live is None:
+        return await _stream_request(session, url, payload, tokenizer, capture_text, backend, token_times)
+    live.begin(token_times)
+    result = None
+    try:
+        result = await _stream_request(session, url, payload, tokenizer, capture_text, backend, token_times)
+        return result
+    finally:
+        live.end(token_times, result)
+
+
+async def _stream_request(session, url, payload, tokenizer, capture_text, backend, token_times) -> RequestResult:
     start_time = time.perf_counter()
-    first_token_time = None
-    tokens_generated = 0
+    first_token_time = first_content_time = None
+    backend = backend or BACKENDS["openai"]
+    parser = backend.new_parser(capture_text=capture_text or tokenizer is not None)
+    timing = RequestTiming(start_time)
+    done_time = None
 
     try:
         async with session.post(
             url,
             json=payload,
             timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            trace_request_ctx=timing,
         ) as resp:
             if resp.status != 200:
                 body = await resp.text()
                 return RequestResult(success=False, error=f"HTTP {resp.status}: {body[:200]}")
 
-            async for line in resp.content:
-                decoded = line.decode("utf-8").strip()
-                if not decoded or not decoded.startswith("data:"):
-                    continue
-                data_str = decoded[5:].strip()
-                if data_str == "[DONE]":
+            async for chunk in resp.content.iter_any():
+                n = parser.feed(chunk)
+                if n:
+                    now = time.perf_counter()
+                    if first_token_time is None:
+                        first_token_time = now
+                    offset_ms = (now - start_time) * 1000
+                    for _ in range(n):
+                        token_times.append(offset_ms)
+                    if first_content_time is None and parser.content_events:
+                        first_content_time = now
+                if parser.done:
+                    # 종료 청크까지 읽어야 커넥션이 닫히지 않고 풀로 돌아간다 (재사용)
+                    done_time = time.perf_counter()
+                    await resp.content.read()
                     break
-                try:
-                    data = json.loads(data_str)
-                    choices = data.get("choices", [])
-                    if choices:
-                        delta = choices[0].get("delta", {})
-                        content = delta.get("content", "")
-                        if content:
-                            if first_token_time is None:
-                                first_token_time = time.perf_counter()
-                            # Approximate token count by splitting on spaces
-                            # More accurate: count SSE chunks with content
-                            tokens_generated += 1
-                except json.JSONDecodeError:
-                    continue
 
     except asyncio.TimeoutError:
         return RequestResult(
@@ -184,9 +456,33 @@ async def send_request(
             error=str(e),
         )
 
-    end_time = time.perf_counter()
+    end_time = done_time or time.perf_counter()
     total_latency = (end_time - start_time) * 1000  # ms
+
+    if parser.error:
+        return RequestResult(success=False, total_latency_ms=round(total_latency, 2), error=parser.error[:200])
+
+    # reasoning 토큰은 이벤트 수로 세고, usage에 세부 항목이 있으면 그 값을 쓴다
+    reasoning_tokens = parser.reasoning_events
+    tokens_generated = parser.content_events + reasoning_tokens
+    usage = parser.usage
+    prompt_tokens = 0
+    if usage and usage.get("completion_tokens") is not None:
+        tokens_generated = usage["completion_tokens"]
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        details = usage.get("completion_tokens_details") or {}
+        if details.get("reasoning_tokens") is not None:
+            reasoning_tokens = details["reasoning_tokens"]
+        source = "usage"
+    elif tokenizer is not None:
+        tokens_generated = count_tokens(tokenizer, parser.text) + reasoning_tokens
+        prompt_tokens = count_prompt_tokens(tokenizer, payload["messages"])
+        source = "tokenizer"
+    else:
+        source = "chunks"
+    server_timing = parser.server_timing or {}
     ttft = (first_token_time - start_time) * 1000 if first_token_time else 0.0
+    content_ttft = (first_content_time - start_time) * 1000 if first_content_time else 0.0
 
     # 생성 시간 (첫 토큰 이후) 기반 throughput
     generation_time = (end_time - first_token_time) if first_token_time else (end_time - start_time)
@@ -195,47 +491,292 @@ async def send_request(
     return RequestResult(
         success=True,
         ttft_ms=round(ttft, 2),
+        content_ttft_ms=round(content_ttft, 2),
         total_latency_ms=round(total_latency, 2),
         tokens_generated=tokens_generated,
+        reasoning_tokens=reasoning_tokens,
+        server_load_ms=server_timing.get("load_ms", 0.0),
+        server_prefill_ms=server_timing.get("prefill_ms", 0.0),
+        server_decode_ms=server_timing.get("decode_ms", 0.0),
+        **timing.as_fields(),
         token_throughput=round(tok_throughput, 2),
+        prompt_tokens=prompt_tokens,
+        token_count_source=source,
+        token_times_ms=token_times,
+        output_text=parser.text if capture_text else "",
     )
 
 
+async def _cancel_pending(tasks: list[asyncio.Task]):
+    """조기 중단 시 남은 요청 태스크 정리."""
+    pending = [t for t in tasks if not t.done()]
+    for t in pending:
+        t.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 async def run_concurrent_requests(
     framework: str,
     messages_list: list[list[dict]],
-    max_tokens: int,
+    max_tokens: int | list[int],
     concurrency: int,
+    stop_condition=None,
+    fixed_length: bool | None = None,
 ) -> tuple[list[RequestResult], float]:
-    """동시 요청을 실행하고 결과 리스트와 총 소요 시간을 반환."""
+    """동시 요청을 실행하고 결과 리스트와 총 소요 시간을 반환.
+
+    max_tokens는 정수 또는 messages_list와 같은 길이의 요청별 목록이다.
+    fixed_length는 build_payload 참고.
+
+    stop_condition(results)이 True를 반환하면 남은 요청을 취소하고
+    그때까지 완료된 결과만 반환한다. RUN_OPTIONS["workers"] > 1이면
+    멀티 프로세스 부하 생성기(bench.distributed)로 위임한다.
+    --trials/--ci-target이면 같은 요청 목록을 반복 시행한다 (stop_condition이 있으면 한 번만).
+    """
+    return await run_trials(
+        lambda msgs: _run_concurrent_once(framework, msgs, max_tokens, concurrency, stop_condition, fixed_length),
+        messages_list,
+        repeat=stop_condition is None,
+    )
+
+
+async def _run_concurrent_once(framework, messages_list, max_tokens, concurrency, stop_condition, fixed_length):
+    if RUN_OPTIONS["workers"] > 1:
+        from .distributed import run_distributed_requests
+        return await run_distributed_requests(
+            framework, messages_list, max_tokens, RUN_OPTIONS["workers"],
+            concurrency=concurrency, stop_condition=stop_condition, fixed_length=fixed_length,
+        )
+
     config = FRAMEWORK_CONFIG[framework]
-    url = f"{config['base_url']}{config['chat_endpoint']}"
+    backend = get_backend(config)
+    url = backend.url(config)
+    tokenizer = get_tokenizer(framework)
 
     semaphore = asyncio.Semaphore(concurrency)
     results = []
+    labels = {"framework": framework, "point": begin_point(), "mode": "closed", "concurrency": concurrency}
 
-    async def bounded_request(session, messages):
+    async def bounded_request(session, index, messages):
         async with semaphore:
-            payload = {
-                "model": config["model"],
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": 0,
-                "stream": True,
-            }
-            return await send_request(session, url, payload)
-
-    connector = aiohttp.TCPConnector(limit=concurrency + 10)
-    async with aiohttp.ClientSession(connector=connector) as session:
+            request_max_tokens = max_tokens_at(max_tokens, index)
+            payload = build_payload(config, messages, request_max_tokens, fixed_length)
+            sent = time.perf_counter()
+            result = await send_request(session, url, payload, tokenizer, backend=backend)
+            result.index = index
+            result.max_tokens = request_max_tokens
+            result.start_offset_ms = round((sent - start) * 1000, 2)
+            return result
+
+    async with open_session(concurrency + 10, config["base_url"], warm=concurrency) as session:
         start = time.perf_counter()
-        tasks = [bounded_request(session, msgs) for msgs in messages_list]
+        tasks = [
+            asyncio.ensure_future(bounded_request(session, i, msgs))
+            for i, msgs in enumerate(messages_list)
+        ]
 
-        with tqdm(total=len(tasks), desc=f"{framework} (c={concurrency})", ncols=80) as pbar:
+        with progress(total=len(tasks), desc=f"{framework} (c={concurrency})") as pbar:
             for coro in asyncio.as_completed(tasks):
                 result = await coro
                 results.append(result)
+                record_result(result, **labels)
                 pbar.update(1)
+                if stop_condition is not None and stop_condition(results):
+                    break
+
+        elapsed = time.perf_counter() - start
+        await _cancel_pending(tasks)
+
+    return results, elapsed
+
+
+async def run_open_loop_requests(
+    framework: str,
+    messages_list: list[list[dict]],
+    max_tokens: int | list[int],
+    schedule,
+    stop_condition=None,
+) -> tuple[list[RequestResult], float]:
+    """오픈 루프 요청 실행: schedule(초 단위 오프셋)에 맞춰 응답을 기다리지 않고 전송.
+
+    동시 요청 수를 제한하지 않으므로 서버가 밀리면 큐잉이 그대로 TTFT에 드러난다.
+    각 결과에는 예정 전송 시각과 실제 전송 지연(send_lag_ms)이 기록되어
+    클라이언트 측 지연을 구분할 수 있다. stop_condition과 반복 시행은 run_concurrent_requests와 같다.
+    """
+    return await run_trials(
+        lambda msgs: _run_open_loop_once(framework, msgs, max_tokens, schedule, stop_condition),
+        messages_list,
+        repeat=stop_condition is None,
+    )
+
+
+async def _run_open_loop_once(framework, messages_list, max_tokens, schedule, stop_condition):
+    if RUN_OPTIONS["workers"] > 1:
+        from .distributed import run_distributed_requests
+        return await run_distributed_requests(
+            framework, messages_list, max_tokens, RUN_OPTIONS["workers"],
+            schedule=schedule, stop_condition=stop_condition,
+        )
+
+    config = FRAMEWORK_CONFIG[framework]
+    backend = get_backend(config)
+    url = backend.url(config)
+    tokenizer = get_tokenizer(framework)
+    results = []
+    labels = {"framework": framework, "point": begin_point(), "mode": "open", "concurrency": 0}
+
+    async def scheduled_request(session, index, messages, offset):
+        request_max_tokens = max_tokens_at(max_tokens, index)
+        payload = build_payload(config, messages, request_max_tokens)
+        sent = time.perf_counter()
+        result = await send_request(session, url, payload, tokenizer, backend=backend)
+        result.index = index
+        result.max_tokens = request_max_tokens
+        result.scheduled_ms = round(offset * 1000, 2)
+        result.start_offset_ms = round((sent - start) * 1000, 2)
+        result.send_lag_ms = round(result.start_offset_ms - result.scheduled_ms, 2)
+        return result
+
+    # limit=0: 커넥션 풀 대기로 인한 숨은 큐잉 방지
+    async with open_session(0, config["base_url"], warm=len(messages_list)) as session:
+        start = time.perf_counter()
+        tasks = []
+        stopped = asyncio.Event()
+
+        def on_done(task):
+            pbar.update(1)
+            if task.cancelled():
+                return
+            results.append(task.result())
+            record_result(results[-1], **labels)
+            if stop_condition is not None and stop_condition(results):
+                stopped.set()
+
+        with progress(total=len(messages_list), desc=f"{framework} (open-loop)") as pbar:
+            for i, (messages, offset) in enumerate(zip(messages_list, schedule)):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(stopped.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                if stopped.is_set():
+                    break
+                task = asyncio.create_task(scheduled_request(session, i, messages, float(offset)))
+                task.add_done_callback(on_done)
+                tasks.append(task)
+            if tasks and not stopped.is_set():
+                all_done = asyncio.gather(*tasks, return_exceptions=True)
+                stop_waiter = asyncio.ensure_future(stopped.wait())
+                await asyncio.wait([all_done, stop_waiter], return_when=asyncio.FIRST_COMPLETED)
+                stop_waiter.cancel()
+
+        elapsed = time.perf_counter() - start
+        await _cancel_pending(tasks)
+
+    return results, elapsed
+
 
+async def run_interference_requests(
+    framework: str,
+    decode_messages: list[list[dict]],
+    decode_tokens: int,
+    prefill_messages: list[list[dict]],
+    prefill_offsets: list[float],
+) -> tuple[list[RequestResult], list[RequestResult], float]:
+    """decode 스트림에 긴 prefill을 끼워 넣는 간섭 실행.
+
+    decode 요청은 모두 시작 시각에 보내 고정 길이(decode_tokens)로 생성시키고,
+    prefill 요청(max_tokens=1)은 prefill_offsets(초) 시각에 하나씩 보낸다.
+    두 그룹의 start_offset_ms는 같은 기준 시각이므로 청크 도착 시각과 prefill 구간을
+    직접 비교할 수 있다. prefill 결과의 index는 len(decode_messages)부터 이어진다.
+    """
+    config = FRAMEWORK_CONFIG[framework]
+    backend = get_backend(config)
+    url = backend.url(config)
+    tokenizer = get_tokenizer(framework)
+    num_decode = len(decode_messages)
+    labels = {"framework": framework, "point": begin_point(), "mode": "interference", "concurrency": num_decode}
+
+    async def one(session, index, messages, max_tokens, offset, pbar):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        payload = build_payload(config, messages, max_tokens, fixed_length=True)
+        sent = time.perf_counter()
+        result = await send_request(session, url, payload, tokenizer, backend=backend)
+        result.index = index
+        result.max_tokens = max_tokens
+        result.start_offset_ms = round((sent - start) * 1000, 2)
+        record_result(result, role="decode" if index < num_decode else "prefill", **labels)
+        pbar.update(1)
+        return result
+
+    async with open_session(0, config["base_url"], warm=num_decode + len(prefill_messages)) as session:
+        start = time.perf_counter()
+        total = num_decode + len(prefill_messages)
+        with progress(total=total, desc=f"{framework} (interference)") as pbar:
+            results = await asyncio.gather(
+                *[one(session, i, msgs, decode_tokens, 0.0, pbar) for i, msgs in enumerate(decode_messages)],
+                *[one(session, num_decode + k, msgs, 1, float(offset), pbar)
+                  for k, (msgs, offset) in enumerate(zip(prefill_messages, prefill_offsets))],
+            )
+        elapsed = time.perf_counter() - start
+
+    return list(results[:num_decode]), list(results[num_decode:]), elapsed
+
+
+async def run_session_requests(
+    framework: str,
+    sessions: list[list[list[dict]]],
+    max_tokens: int,
+    think_time_sec: float = 1.0,
+    seed: int = 0,
+) -> tuple[list[RequestResult], float]:
+    """멀티턴 대화 세션 실행: 사용자마다 턴을 순서대로 보내고 실제 응답을 다음 턴에 이어 붙인다.
+
+    sessions[u]는 사용자 u의 턴별 새 메시지 목록이다 (첫 턴은 시스템 프롬프트 포함).
+    턴 사이에는 평균 think_time_sec의 지수 분포 대기를 두며, 모든 사용자가 동시에
+    진행하므로 동시 요청 수는 최대 사용자 수다. 요청이 실패하면 그 사용자의 세션은 끝난다.
+    결과의 index는 u * 턴 수 + 턴 번호다.
+    """
+    config = FRAMEWORK_CONFIG[framework]
+    backend = get_backend(config)
+    url = backend.url(config)
+    tokenizer = get_tokenizer(framework)
+    num_turns = max((len(turns) for turns in sessions), default=0)
+    results = []
+    labels = {"framework": framework, "point": begin_point(), "mode": "session", "concurrency": len(sessions)}
+
+    async def user_session(session, user, turns, pbar):
+        rng = np.random.default_rng(seed * 100003 + user)
+        history = []
+        for turn, new_messages in enumerate(turns):
+            if turn > 0 and think_time_sec > 0:
+                await asyncio.sleep(rng.exponential(think_time_sec))
+            history.extend(new_messages)
+            payload = build_payload(config, history, max_tokens)
+            sent = time.perf_counter()
+            result = await send_request(session, url, payload, tokenizer, capture_text=True, backend=backend)
+            result.index = user * num_turns + turn
+            result.max_tokens = max_tokens
+            result.start_offset_ms = round((sent - start) * 1000, 2)
+            results.append(result)
+            record_result(result, user=user, turn=turn, **labels)
+            pbar.update(1)
+            if not result.success:
+                pbar.update(len(turns) - turn - 1)
+                return
+            history.append({"role": "assistant", "content": result.output_text})
+
+    async with open_session(len(sessions) + 10, config["base_url"], warm=len(sessions)) as session:
+        start = time.perf_counter()
+        total = sum(len(turns) for turns in sessions)
+        with progress(total=total, desc=f"{framework} (sessions={len(sessions)})") as pbar:
+            await asyncio.gather(*[
+                user_session(session, u, turns, pbar) for u, turns in enumerate(sessions)
+            ])
         elapsed = time.perf_counter() - start
 
     return results, elapsed
@@ -5,16 +5,34 @@ FRAMEWORK_CONFIG = {
         "base_url": "http://localhost:30000",
         "model": "openai/gpt-oss-20b",
         "chat_endpoint": "/v1/chat/completions",
+        "metrics_path": "/metrics",  # 서버를 --enable-metrics로 실행해야 노출됨
+        "payload_adapter": "sglang",  # 출력 길이 제어 파라미터 (backends.PAYLOAD_ADAPTERS)
+        "native_api": None,           # --api native에서 쓸 백엔드 (backends.BACKENDS), /generate는 미구현
     },
     "vllm": {
         "base_url": "http://localhost:8000",
         "model": "openai/gpt-oss-20b",
         "chat_endpoint": "/v1/chat/completions",
+        "metrics_path": "/metrics",
+        "payload_adapter": "vllm",
+        "native_api": None,
     },
     "ollama": {
         "base_url": "http://localhost:11434",
         "model": "gpt-oss:20b",
         "chat_endpoint": "/v1/chat/completions",
+        "metrics_path": None,  # Prometheus 엔드포인트 없음
+        "payload_adapter": "ollama",  # num_predict만 지원 (ignore_eos 없음, EOS에서 조기 종료 가능)
+        "native_api": "ollama",       # /api/chat NDJSON (서버 측 prefill/decode 시간 포함)
+    },
+    # GPU 없이 하네스 검증용 모의 서버: python -m bench mock-server
+    "mock": {
+        "base_url": "http://localhost:8090",
+        "model": "openai/gpt-oss-20b",
+        "chat_endpoint": "/v1/chat/completions",
+        "metrics_path": "/metrics",  # vLLM 형식 메트릭
+        "payload_adapter": "vllm",
+        "native_api": "ollama",       # 모의 서버는 Ollama /api/chat도 제공
     },
 }
 
@@ -24,12 +42,97 @@ MODEL_PRESETS = {
         "sglang": "openai/gpt-oss-20b",
         "vllm": "openai/gpt-oss-20b",
         "ollama": "gpt-oss:20b",
+        "mock": "openai/gpt-oss-20b",
+        "tokenizer": "openai/gpt-oss-20b",  # 로컬 토큰 수 계산용 (transformers 필요)
     },
     "llama3.1-8b": {
         "sglang": "meta-llama/Llama-3.1-8B-Instruct",
         "vllm": "meta-llama/Llama-3.1-8B-Instruct",
         "ollama": "llama3.1:8b",
+        "mock": "meta-llama/Llama-3.1-8B-Instruct",
+        "tokenizer": "meta-llama/Llama-3.1-8B-Instruct",
     },
 }
 
 REQUEST_TIMEOUT = 300  # seconds
+
+# 측정값이 클라이언트 하한(python -m bench calibrate)의 이 배수 이내면 신뢰 불가로 표시
+CLIENT_FLOOR_FACTOR = 3.0
+
+# 토큰 간 지연이 이 값을 넘으면 디코드 stall로 집계 (ms)
+ITL_STALL_THRESHOLD_MS = 250
+
+# 서비스 수준 목표 (rate_sweep, goodput 등에서 SLO 위반 판단 기준)
+SLO_P99_TTFT_MS = 500
+SLO_MIN_SUCCESS_RATE = 99.0
+SLO_ITL_MS = 100           # 요청별 평균 토큰 간 지연 상한 (ms)
+SLO_ATTAINMENT_PCT = 99.0  # goodput 탐색: SLO 충족 요청 비율 목표 (%)
+
+# 오픈 루프 요청률 스윕 (rate_sweep): 단계별 목표 도착률(req/s)과 포인트당 길이
+RATE_SWEEP_RATES = [1, 2, 4, 8, 12, 16, 24, 32, 48, 64]
+RATE_SWEEP_DURATION_SEC = 30
+RATE_SWEEP_MIN_REQUESTS = 20
+
+# 요청한 출력 길이(max_tokens)와 실제 생성 길이 차이 판정
+OUTPUT_LENGTH_TOLERANCE = 0.02       # 요청 길이 대비 이 비율 이내면 일치로 간주
+OUTPUT_LENGTH_DIVERGENCE_PCT = 5.0   # 불일치 요청 비율이 이 값(%)을 넘으면 포인트에 표시
+
+# 부트스트랩 신뢰구간 (bench/stats.py)
+BOOTSTRAP_RESAMPLES = 2000
+CONFIDENCE_LEVEL = 0.95
+CI_CONVERGENCE_METRICS = ["ttft_mean", "latency_mean"]  # --ci-target 수렴 판정에 쓰는 지표
+
+# 스트리밍 분위수 스케치 (bench/sketch.py)
+SKETCH_RELATIVE_ACCURACY = 0.01  # 분위수 상대 오차
+SKETCH_MAX_BINS = 2048           # 스케치당 버킷 수 상한 (넘으면 가장 낮은 버킷끼리 합침)
+SKETCH_WINDOW_SEC = 10.0         # 구간별 분위수 기본 구간 길이
+SKETCH_MAX_WINDOWS = 360         # 구간 수 상한 (넘으면 인접 구간을 합쳐 구간 길이를 두 배로)
+
+# soak 시나리오 (bench/soak.py)
+SOAK_WARMUP_WINDOWS = 1          # 추세 검정에서 제외하는 앞쪽 구간 수 (램프업)
+SOAK_MIN_TREND_WINDOWS = 8       # 추세 검정에 필요한 최소 완료 구간 수
+SOAK_TREND_ALPHA = 0.05          # Mann-Kendall 유의수준
+SOAK_MIN_TREND_CHANGE_PCT = 5.0  # 유의한 추세라도 실행 전체 변화량이 이 비율(%) 미만이면 저하로 보지 않음
+SOAK_ERROR_BURST_PCT = 5.0       # 구간 오류율이 이 값(%)을 넘으면 오류 burst로 기록
+SOAK_MIN_WINDOW_REQUESTS = 10    # 조기 중단 판단에 필요한 구간 최소 요청 수
+
+# 실시간 대시보드 (bench/dashboard.py, --dashboard)
+DASHBOARD_REFRESH_SEC = 1.0        # 터미널 갱신 간격
+DASHBOARD_LOG_INTERVAL_SEC = 10.0  # 터미널이 아닐 때 상태 한 줄 출력 간격
+DASHBOARD_WINDOW_SEC = 10.0        # 처리량/TTFT/ITL을 계산하는 최근 구간
+DASHBOARD_SAMPLES = 4096           # 보관하는 최근 완료 요청 수 상한
+DASHBOARD_ITL_REQUESTS = 256       # ITL 분위수에 쓰는 최근 요청 수 (갱신 비용 제한)
+
+# 백그라운드 GPU 텔레메트리 (bench/telemetry.py)
+GPU_SAMPLE_INTERVAL_MS = 200
+GPU_SAMPLE_CAPACITY = 36000    # 링 버퍼 크기 (200ms 간격 기준 2시간)
+SERIES_MAX_POINTS = 300        # 결과 JSON에 넣는 포인트별 텔레메트리 시계열 최대 길이
+
+# 서버 Prometheus 메트릭 수집 간격 (bench/server_metrics.py)
+METRICS_SCRAPE_INTERVAL_SEC = 1.0
+
+# CLI 인자로 덮어쓰는 실행 옵션
+RUN_OPTIONS = {
+    "arrival": "poisson",  # 오픈 루프 도착 패턴: poisson, constant, gamma, trace
+    "trace_path": None,    # arrival=trace일 때 타임스탬프 파일
+    "goodput_search": "concurrency",  # goodput 탐색 축: concurrency 또는 rate
+    "workers": 1,          # 부하 생성 프로세스 수 (1이면 단일 이벤트 루프)
+    "gpu_telemetry": "auto",  # GPU 샘플 소스: auto, nvml, nvidia-smi, fake, off
+    "server_metrics": True,   # 실행 중 서버 /metrics 수집
+    "dataset_path": None,     # workload 시나리오: JSONL 데이터셋 (ShareGPT/OpenAI messages 형식)
+    "input_len_dist": "lognormal:mean=512,sigma=0.8,min=16,max=4096",  # 데이터셋이 없을 때 합성 입력 길이 분포
+    "output_len_dist": "lognormal:mean=256,sigma=0.6,min=16,max=1024",  # 합성 출력 길이 분포
+    "transport": "per-point",  # 커넥션 재사용: per-point, shared(미리 연결한 공유 세션), fresh(요청마다 새 연결)
+    "unix_socket": None,       # 로컬 서버 Unix 도메인 소켓 경로 (TCP 대신)
+    "api": "openai",       # 요청 API: openai(/v1/chat/completions) 또는 native(프레임워크 네이티브 API)
+    "output_length": "fixed",  # fixed: 지원 프레임워크에서 EOS 무시하고 max_tokens만큼 생성, natural: EOS에서 종료
+    "cache_mode": "cold",  # 반복 프롬프트 캐시 제어: cold(요청별 salt), warm(동일 프롬프트), ratio:<0~1>
+    "trials": 1,           # 포인트당 최소 반복 시행 수
+    "max_trials": 1,       # ci_target을 만족할 때까지 늘릴 수 있는 최대 시행 수
+    "ci_target": 0.0,      # TTFT/레이턴시 평균 CI 상대 폭 목표 (0이면 자동 연장 안 함)
+    "soak_duration_sec": 3600.0,  # soak 시나리오: 부하 유지 시간
+    "soak_concurrency": 16,       # soak 시나리오: 동시 요청 수 (closed-loop)
+    "soak_window_sec": 60.0,      # soak 시나리오: 구간 길이
+    "soak_stop_error_pct": 50.0,  # soak 시나리오: 구간 오류율이 이 값(%) 이상이면 조기 중단 (0이면 끔)
+    "dashboard": False,    # 실행 중 터미널 대시보드 (tqdm 막대 대신)
+}
@@ -0,0 +1,214 @@
+"""실행 중 터미널 대시보드 (--dashboard).
+
+send_request가 요청 시작/종료 때만 LiveStats를 갱신하고(청크마다 하는 일은 없음), 별도
+asyncio 태스크가 DASHBOARD_REFRESH_SEC 간격으로 최근 DASHBOARD_WINDOW_SEC 동안의 처리량,
+진행 중 요청 수, TTFT/ITL p50/p99, 오류 수, GPU 텔레메트리를 그린다.
+
+진행 중 요청의 생성 토큰 수는 send_request가 채우는 청크 도착 시각 배열의 길이로 읽으므로
+긴 스트림도 처리량에 바로 반영된다. 카운터는 이벤트 루프 스레드에서만 갱신하므로 잠금이
+없다 (분산 워커 결과도 코디네이터 수집 스레드가 이벤트 루프로 넘겨 반영).
+
+터미널이면 화면 아래쪽 블록을 ANSI로 다시 그리고 다른 출력은 블록 위로 흘려보내며,
+터미널이 아니면(nohup 로그 등) DASHBOARD_LOG_INTERVAL_SEC마다 한 줄 상태를 출력한다.
+대시보드가 켜지면 포인트별 tqdm 막대는 끄고 현재 포인트 진행률을 대시보드에 표시한다.
+"""
+
+import asyncio
+import sys
+import time
+from collections import deque
+
+import numpy as np
+from tqdm import tqdm
+
+from .config import (
+    DASHBOARD_ITL_REQUESTS,
+    DASHBOARD_LOG_INTERVAL_SEC,
+    DASHBOARD_REFRESH_SEC,
+    DASHBOARD_SAMPLES,
+    DASHBOARD_WINDOW_SEC,
+)
+from .multirun import current_lane
+from .telemetry import get_telemetry
+
+_dashboard = None
+
+
+class LiveStats:
+    """프레임워크 하나의 실시간 카운터."""
+
+    __slots__ = ("active", "completed", "errors", "tokens_done", "recent", "point")
+
+    def __init__(self):
+        self.active: dict[int, object] = {}  # 진행 중 요청의 청크 도착 시각 배열 (id -> array)
+        self.completed = 0
+        self.errors = 0
+        self.tokens_done = 0
+        # 최근 성공 요청: (완료 시각, TTFT ms, 청크 도착 시각 배열)
+        self.recent: deque = deque(maxlen=DASHBOARD_SAMPLES)
+        self.point = None  # 현재 포인트 (설명, 총 요청 수, 시작 시점 completed)
+
+    def begin(self, token_times):
+        self.active[id(token_times)] = token_times
+
+    def end(self, token_times, result):
+        """요청 종료 (result가 None이면 취소된 요청)."""
+        self.active.pop(id(token_times), None)
+        if result is not None:
+            self.add_result(result)
+
+    def add_result(self, result):
+        self.completed += 1
+        self.tokens_done += len(result.token_times_ms)
+        if not result.success:
+            self.errors += 1
+        elif result.ttft_ms > 0:
+            self.recent.append((time.perf_counter(), result.ttft_ms, result.token_times_ms))
+
+    def tokens(self) -> int:
+        return self.tokens_done + sum(len(times) for times in list(self.active.values()))
+
+
+def _percentiles(values) -> str:
+    if not len(values):
+        return "-/-"
+    p50, p99 = np.percentile(values, [50, 99])
+    return f"{p50:.1f}/{p99:.1f}"
+
+
+class _StdoutProxy:
+    """다른 출력이 나가기 전에 대시보드 블록을 지운다 (다음 갱신 때 다시 그림)."""
+
+    def __init__(self, dashboard, stream):
+        self._dashboard = dashboard
+        self._stream = stream
+
+    def write(self, text):
+        if text:
+            self._dashboard.clear()
+        return self._stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class Dashboard:
+    """LiveStats들을 주기적으로 그리는 렌더러."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.ansi = self.stream.isatty()
+        self.lanes: dict[str, LiveStats] = {}
+        self.origin = time.perf_counter()
+        self.drawn = 0  # 현재 화면에 그려진 블록 줄 수
+        self._history: dict[str, deque] = {}  # 프레임워크별 (시각, 누적 토큰, 누적 완료) 스냅샷
+        self._task = None
+        self._stdout = None
+
+    def lane(self, framework: str) -> LiveStats:
+        stats = self.lanes.get(framework)
+        if stats is None:
+            stats = self.lanes[framework] = LiveStats()
+        return stats
+
+    def start(self):
+        if self.ansi:
+            self._stdout = sys.stdout
+            sys.stdout = _StdoutProxy(self, self.stream)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.clear()
+        if self._stdout is not None:
+            sys.stdout = self._stdout
+
+    async def _run(self):
+        interval = DASHBOARD_REFRESH_SEC if self.ansi else DASHBOARD_LOG_INTERVAL_SEC
+        next_tick = time.perf_counter()
+        while True:
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+            self.render()
+
+    def clear(self):
+        if self.drawn:
+            self.stream.write(f"\x1b[{self.drawn}F\x1b[J")
+            self.drawn = 0
+
+    def render(self):
+        lines = self.lines()
+        if not self.ansi:
+            self.stream.write(" || ".join(line.strip() for line in lines) + "\n")
+            self.stream.flush()
+            return
+        self.clear()
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+        self.drawn = len(lines)
+
+    def lines(self) -> list[str]:
+        now = time.perf_counter()
+        minutes, seconds = divmod(int(now - self.origin), 60)
+        header = f"── live {minutes // 60:02d}:{minutes % 60:02d}:{seconds:02d}"
+        telemetry = get_telemetry()
+        samples = telemetry.window(time.monotonic() - DASHBOARD_WINDOW_SEC, time.monotonic()) if telemetry else []
+        if samples:
+            _, used, total, util = samples[-1]
+            header += f" | GPU {used:,.0f}/{total:,.0f} MB, util {util:.0f}%"
+        lines = [header]
+        for framework, stats in self.lanes.items():
+            lines.extend(self._lane_lines(framework or "-", stats, now))
+        return lines
+
+    def _lane_lines(self, name: str, stats: LiveStats, now: float) -> list[str]:
+        history = self._history.setdefault(name, deque([(self.origin, 0, 0)]))
+        history.append((now, stats.tokens(), stats.completed))
+        while len(history) > 2 and history[1][0] <= now - DASHBOARD_WINDOW_SEC:
+            history.popleft()
+        t0, tokens0, done0 = history[0]
+        span = now - t0
+        tok_rate = (history[-1][1] - tokens0) / span if span > 0 else 0.0
+        req_rate = (history[-1][2] - done0) / span if span > 0 else 0.0
+
+        recent = [r for r in list(stats.recent) if r[0] >= now - DASHBOARD_WINDOW_SEC]
+        ttfts = [r[1] for r in recent]
+        gaps = [np.diff(np.frombuffer(r[2], dtype=np.float64)) for r in recent[-DASHBOARD_ITL_REQUESTS:]]
+        itls = np.concatenate(gaps) if gaps else []
+
+        point = ""
+        if stats.point is not None:
+            desc, total, base = stats.point
+            point = f"{desc} {stats.completed - base}/{total if total is not None else '?'} | "
+        return [
+            f"{name:<8} {point}in-flight {len(stats.active)} | done {stats.completed:,} | errors {stats.errors:,}",
+            f"{'':<8} {tok_rate:,.0f} tok/s | {req_rate:.1f} req/s | TTFT p50/p99 {_percentiles(ttfts)} ms "
+            f"| ITL p50/p99 {_percentiles(itls)} ms (last {DASHBOARD_WINDOW_SEC:.0f}s)",
+        ]
+
+
+def set_dashboard(dashboard: Dashboard | None):
+    global _dashboard
+    _dashboard = dashboard
+
+
+def live_stats() -> LiveStats | None:
+    """현재 프레임워크 태스크의 실시간 카운터 (대시보드가 꺼져 있으면 None)."""
+    if _dashboard is None:
+        return None
+    return _dashboard.lane(current_lane() or "")
+
+
+def progress(iterable=None, total: int | None = None, desc: str = "", **kwargs):
+    """포인트 진행률 막대. 대시보드가 켜져 있으면 tqdm을 끄고 대시보드에 현재 포인트로 표시."""
+    stats = live_stats()
+    if stats is not None:
+        if total is None and iterable is not None:
+            total = len(iterable)
+        stats.point = (desc, total, stats.completed)
+    return tqdm(iterable, total=total, desc=desc, ncols=80, disable=stats is not None, **kwargs)
@@ -0,0 +1,287 @@
+"""멀티 프로세스 부하 생성기.
+
+요청 목록을 N개 워커 프로세스에 나눠 각자의 이벤트 루프와 aiohttp 커넥터로 전송한다.
+워커는 완료된 RequestResult를 파이프로 즉시 코디네이터에 보내고, 모든 시각은
+코디네이터가 정한 공통 monotonic 기준 시각(origin)에 맞춰 기록되므로 병합 후에도
+start_offset_ms, total_time_sec, 백분위가 단일 프로세스 실행과 같은 의미를 가진다.
+
+aggregator(bench.sketch.StreamingAggregator)를 넘기면 코디네이터가 받은 결과를 이벤트 루프에서
+바로 집계하고 원시 기록만 남긴 채 버린다 (목록으로 보관하지 않음). duration_sec를 주면 요청 수
+대신 시간 기준으로, 워커마다 마감 시각까지 동시성 슬롯을 계속 채운다 (soak 시나리오).
+"""
+
+import asyncio
+import itertools
+import multiprocessing as mp
+import time
+from functools import partial
+from multiprocessing.connection import wait
+
+from .backends import build_payload, get_backend
+from .client import RequestResult, max_tokens_at, send_request
+from .config import FRAMEWORK_CONFIG, RUN_OPTIONS
+from .dashboard import live_stats, progress
+from .multirun import point_turn
+from .rawlog import begin_point, record_result
+from .sketch import StreamingAggregator
+from .tokenizer import get_tokenizer
+from .transport import open_session
+from .workloads import cache_salter
+
+_START_DELAY_SEC = 0.1  # origin 전달 후 실제 시작까지 여유
+_STOP_POLL_SEC = 0.1  # 시간 기준 실행에서 워커가 중단 신호를 확인하는 간격
+
+
+def _split(total: int, parts: int) -> list[int]:
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def _shards(total: int, weights: list[int]) -> list[list[int]]:
+    """요청 순번 0..total-1을 워커별 가중치(동시성 슬롯 수)에 비례해 번갈아 배분 (smooth weighted round-robin).
+
+    슬롯이 적은 워커가 같은 수의 요청을 받아 혼자 늦게 끝나면 꼬리 구간의 동시성이 목표보다 낮아진다.
+    """
+    shards = [[] for _ in weights]
+    current = [0] * len(weights)
+    step = sum(weights)
+    for i in range(total):
+        for w, weight in enumerate(weights):
+            current[w] += weight
+        w = max(range(len(weights)), key=current.__getitem__)
+        current[w] -= step
+        shards[w].append(i)
+    return shards
+
+
+async def _worker_run(conn, framework, shard, concurrency, offsets, fixed_length, duration, stop_flag):
+    """워커 이벤트 루프: 할당된 요청을 보내고 결과를 하나씩 파이프로 전송.
+
+    duration이 (duration_sec, 워커 번호, 워커 수)면 shard를 메시지 템플릿으로 순환하며 마감 시각까지
+    concurrency개 요청을 계속 유지한다. 요청 index는 워커 번호부터 워커 수 간격으로 매기고 캐시 모드는
+    요청마다 적용한다. stop_flag가 설정되면 새 요청을 멈추고 진행 중인 요청을 취소한다.
+    """
+    config = FRAMEWORK_CONFIG[framework]
+    backend = get_backend(config)
+    url = backend.url(config)
+    tokenizer = get_tokenizer(framework)
+    semaphore = asyncio.Semaphore(concurrency) if offsets is None else None
+
+    conn.send("ready")
+    origin_monotonic = conn.recv()
+    # 공통 monotonic 기준 시각을 이 프로세스의 perf_counter 축으로 변환
+    origin = time.perf_counter() + (origin_monotonic - time.monotonic())
+
+    async def one(session, index, messages, max_tokens, offset):
+        if offset is not None:
+            delay = origin + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            payload = build_payload(config, messages, max_tokens, fixed_length)
+            sent = time.perf_counter()
+            result = await send_request(session, url, payload, tokenizer, backend=backend)
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+        result.index = index
+        result.max_tokens = max_tokens
+        result.start_offset_ms = round((sent - origin) * 1000, 2)
+        if offset is not None:
+            result.scheduled_ms = round(offset * 1000, 2)
+            result.send_lag_ms = round(result.start_offset_ms - result.scheduled_ms, 2)
+        conn.send(result)
+
+    async def timed(session):
+        duration_sec, worker, num_workers = duration
+        deadline = origin + duration_sec
+        counter = itertools.count(worker, num_workers)
+        salt = cache_salter(RUN_OPTIONS["cache_mode"], seed=worker)
+
+        async def lane():
+            while not stop_flag.is_set() and time.perf_counter() < deadline:
+                index = next(counter)
+                _, messages, max_tokens = shard[index % len(shard)]
+                await one(session, index, salt(messages, index), max_tokens, None)
+
+        lanes = asyncio.gather(*[lane() for _ in range(concurrency)])
+        while not lanes.done() and not stop_flag.is_set():
+            await asyncio.wait([lanes], timeout=_STOP_POLL_SEC)
+        lanes.cancel()
+        await asyncio.gather(lanes, return_exceptions=True)
+
+    # 워커 프로세스는 공유 세션이 없으므로 shared 모드에서도 포인트마다 새 세션
+    limit = concurrency + 10 if offsets is None else 0
+    async with open_session(limit, config["base_url"], warm=concurrency or len(shard)) as session:
+        delay = origin - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if duration is not None:
+            await timed(session)
+            return
+        await asyncio.gather(*[
+            one(session, index, messages, max_tokens, None if offsets is None else offsets[k])
+            for k, (index, messages, max_tokens) in enumerate(shard)
+        ])
+
+
+def _worker_main(conn, framework, config, run_options, shard, concurrency, offsets, fixed_length, duration, stop_flag):
+    """워커 프로세스 엔트리포인트 (spawn이므로 부모의 설정 변경을 다시 적용)."""
+    FRAMEWORK_CONFIG[framework] = config
+    RUN_OPTIONS.update(run_options)
+    try:
+        asyncio.run(_worker_run(conn, framework, shard, concurrency, offsets, fixed_length, duration, stop_flag))
+    finally:
+        conn.send(None)
+        conn.close()
+
+
+def _is_ready(conn) -> bool:
+    try:
+        return conn.recv() == "ready"
+    except EOFError:
+        return False
+
+
+def _collect(procs, conns, total, desc, stop_condition, labels, aggregator, live, loop, on_start) -> list[RequestResult]:
+    """워커 준비 대기 -> 공통 origin 전달 -> 결과 수신 (코디네이터, 별도 스레드에서 실행).
+
+    원시 기록, aggregator 집계, live(대시보드 카운터) 반영은 모두 이벤트 루프(loop)에 넘겨 그 스레드에서만
+    상태를 바꾼다. aggregator가 있으면 결과를 보관하지 않는다. 진행 중 요청 수는 워커 안에만 있다.
+    on_start가 있으면 origin이 정해진 직후 이벤트 루프에서 on_start(origin)을 호출한다.
+    """
+    ready = [conn for conn in conns if _is_ready(conn)]
+    origin = time.monotonic() + _START_DELAY_SEC
+    if on_start is not None:
+        loop.call_soon_threadsafe(on_start, origin)
+    for conn in ready:
+        conn.send(origin)
+
+    results = []
+    remaining = ready
+    with progress(total=total, desc=desc) as pbar:
+        while remaining:
+            for conn in wait(remaining):
+                try:
+                    item = conn.recv()
+                except EOFError:
+                    item = None
+                if item is None:
+                    remaining.remove(conn)
+                    continue
+                if aggregator is None:
+                    results.append(item)
+                else:
+                    loop.call_soon_threadsafe(aggregator.add, item)
+                loop.call_soon_threadsafe(partial(record_result, item, **labels))
+                if live is not None:
+                    loop.call_soon_threadsafe(live.add_result, item)
+                pbar.update(1)
+                if stop_condition is not None and stop_condition(results):
+                    for proc in procs:
+                        proc.terminate()
+                    return results
+    return results
+
+
+async def run_distributed_requests(
+    framework: str,
+    messages_list: list[list[dict]],
+    max_tokens: int | list[int],
+    num_workers: int,
+    concurrency: int = 0,
+    schedule=None,
+    stop_condition=None,
+    fixed_length: bool | None = None,
+    aggregator: StreamingAggregator | None = None,
+    duration_sec: float | None = None,
+    stopped: asyncio.Event | None = None,
+    on_start=None,
+) -> tuple[list[RequestResult], float]:
+    """요청을 num_workers개 프로세스에 나눠 실행하고 병합된 결과와 총 소요 시간을 반환.
+
+    schedule이 없으면 closed-loop으로 concurrency를 워커에 나눠 배정하고,
+    있으면 각 요청을 예정 시각에 전송하는 오픈 루프로 동작한다.
+    요청은 워커별 동시성에 비례해(오픈 루프는 균등하게) 번갈아 분배되며 index는 원래 messages_list 순번을 유지한다.
+    aggregator가 있으면 결과를 여기에 집계하고 결과 목록은 빈 리스트를 반환한다
+    (stop_condition과 함께 쓸 수 없다).
+
+    duration_sec가 있으면 (closed-loop 전용) messages_list를 템플릿으로 순환하며 duration_sec 동안
+    부하를 유지하고, stopped가 설정되면 워커가 진행 중인 요청을 취소하고 멈춘다. on_start(origin)은
+    공통 기준 시각(monotonic)이 정해질 때 호출된다 (구간 감시 등을 같은 시간축에 맞추는 용도).
+    """
+    if schedule is None:
+        num_workers = max(1, min(num_workers, concurrency))
+        worker_concurrency = _split(concurrency, num_workers)
+    else:
+        worker_concurrency = [0] * num_workers
+
+    async with point_turn():
+        return await _run_workers(framework, messages_list, max_tokens, num_workers, worker_concurrency,
+                                  concurrency, schedule, stop_condition, fixed_length, aggregator,
+                                  duration_sec, stopped, on_start)
+
+
+async def _run_workers(framework, messages_list, max_tokens, num_workers, worker_concurrency,
+                       concurrency, schedule, stop_condition, fixed_length, aggregator,
+                       duration_sec, stopped, on_start):
+    ctx = mp.get_context("spawn")
+    stop_flag = ctx.Event()
+    shards = _shards(len(messages_list), worker_concurrency if schedule is None else [1] * num_workers)
+    procs, conns = [], []
+    for w in range(num_workers):
+        if duration_sec is None:
+            indices = shards[w]
+            duration = None
+        else:
+            indices = range(len(messages_list))
+            duration = (duration_sec, w, num_workers)
+        shard = [(i, messages_list[i], max_tokens_at(max_tokens, i)) for i in indices]
+        offsets = None if schedule is None else [float(schedule[i]) for i in indices]
+        parent_conn, child_conn = ctx.Pipe()
+        proc = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, framework, FRAMEWORK_CONFIG[framework], dict(RUN_OPTIONS),
+                  shard, worker_concurrency[w], offsets, fixed_length, duration, stop_flag),
+            daemon=True,
+        )
+        proc.start()
+        child_conn.close()
+        procs.append(proc)
+        conns.append(parent_conn)
+
+    mode = f"c={concurrency}" if schedule is None else "open-loop"
+    if duration_sec is not None:
+        mode = f"soak c={concurrency}"
+    desc = f"{framework} ({mode}, {num_workers} procs)"
+    labels = {"framework": framework, "point": begin_point(),
+              "mode": "open" if schedule is not None else "soak" if duration_sec is not None else "closed",
+              "concurrency": concurrency if schedule is None else 0}
+    total = len(messages_list) if duration_sec is None else None
+    relay = None
+    if stopped is not None:
+        async def relay_stop():
+            await stopped.wait()
+            stop_flag.set()
+        relay = asyncio.ensure_future(relay_stop())
+    try:
+        results = await asyncio.to_thread(
+            _collect, procs, conns, total, desc, stop_condition, labels, aggregator, live_stats(),
+            asyncio.get_running_loop(), on_start,
+        )
+    finally:
+        if relay is not None:
+            relay.cancel()
+        for proc in procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in conns:
+            conn.close()
+
+    # 공통 origin 기준이므로 마지막 완료 시각이 곧 전체 소요 시간
+    if aggregator is not None:
+        return results, aggregator.last_end_ms / 1000
+    elapsed = max((r.start_offset_ms + r.total_latency_ms for r in results), default=0.0) / 1000
+    return results, elapsed
@@ -0,0 +1,384 @@
+"""GPU 없이 하네스를 검증하기 위한 OpenAI 호환 스트리밍 모의 서버.
+
+SGLang/vLLM/Ollama와 같은 /v1/chat/completions(SSE), Ollama 네이티브 /api/chat(NDJSON),
+/health, /v1/models, /api/tags, /metrics(vLLM 형식 Prometheus)를
+제공하고, 지연 시간은 교체 가능한 LatencyModel로 흉내 낸다:
+프롬프트 길이에 비례하는 prefill, 동시 디코드 수에 따라 느려지는 토큰 생성,
+블록 단위 prefix cache, 주입 가능한 에러/타임아웃.
+
+    python -m bench mock-server --port 8090 --latency gpu
+    python -m bench --framework mock --scenario concurrent
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields, replace
+
+from aiohttp import web
+
+from .config import FRAMEWORK_CONFIG
+
+_CHARS_PER_TOKEN = 4
+_TOKEN_WORDS = [" The", " model", " generates", " tokens", " one", " at", " a", " time", "."]
+
+
+@dataclass
+class LatencyModel:
+    """모의 서버 지연 모델. 모든 시간 단위는 ms."""
+    prefill_base_ms: float = 10.0
+    prefill_ms_per_token: float = 0.05   # 캐시되지 않은 입력 토큰당
+    decode_ms_per_token: float = 10.0    # 배치 크기 1 기준
+    batch_slowdown: float = 0.02         # 동시 디코드 요청 1개 추가당 decode 시간 증가율
+    max_batch: int = 0                   # 동시에 처리하는 최대 요청 수 (0 = 무제한, 1 = 순차 처리)
+    prefill_blocks_decode: bool = True   # prefill 중에는 다른 요청의 decode가 멈춤
+    prefix_cache: bool = True
+    cache_block_tokens: int = 16
+    cache_capacity_blocks: int = 65536
+    error_rate: float = 0.0              # HTTP 500 응답 비율
+    timeout_rate: float = 0.0            # 응답 없이 멈추는 요청 비율
+    early_stop_rate: float = 0.0         # 토큰마다 EOS로 조기 종료할 확률 (ignore_eos면 무시)
+    reasoning_tokens: int = 0            # 처음 N개 토큰을 delta.reasoning_content로 전송 (추론 모델 흉내)
+
+    def prefill_ms(self, uncached_tokens: int) -> float:
+        return self.prefill_base_ms + self.prefill_ms_per_token * uncached_tokens
+
+    def decode_ms(self, batch_size: int) -> float:
+        return self.decode_ms_per_token * (1 + self.batch_slowdown * max(0, batch_size - 1))
+
+
+LATENCY_PRESETS = {
+    # 클라이언트 오버헤드 측정용: 서버 지연 0
+    "zero": LatencyModel(
+        prefill_base_ms=0, prefill_ms_per_token=0, decode_ms_per_token=0,
+        batch_slowdown=0, prefill_blocks_decode=False, prefix_cache=False,
+    ),
+    # 연속 배칭 GPU 서버 (SGLang/vLLM 유사)
+    "gpu": LatencyModel(),
+    # 순차 처리 서버 (Ollama 기본 설정 유사)
+    "sequential": LatencyModel(decode_ms_per_token=15.0, max_batch=1, prefix_cache=False),
+}
+
+
+class PrefixCache:
+    """블록 해시 체인 기반 LRU prefix cache."""
+
+    def __init__(self, block_chars: int, capacity_blocks: int):
+        self.block_chars = block_chars
+        self.capacity = capacity_blocks
+        self.blocks: OrderedDict[bytes, None] = OrderedDict()
+
+    def match_and_insert(self, text: str) -> int:
+        """text 앞부분 중 캐시에 있던 문자 수를 반환하고, 전체 블록을 캐시에 넣는다."""
+        h = hashlib.blake2b(digest_size=16)
+        cached_chars = 0
+        hit = True
+        for i in range(0, len(text) - self.block_chars + 1, self.block_chars):
+            h.update(text[i:i + self.block_chars].encode())
+            key = h.digest()
+            if hit and key in self.blocks:
+                self.blocks.move_to_end(key)
+                cached_chars = i + self.block_chars
+                continue
+            hit = False
+            self.blocks[key] = None
+            if len(self.blocks) > self.capacity:
+                self.blocks.popitem(last=False)
+        return cached_chars
+
+
+class MockServerState:
+    def __init__(self, model: LatencyModel, served_model: str):
+        self.model = model
+        self.served_model = served_model
+        self.cache = PrefixCache(model.cache_block_tokens * _CHARS_PER_TOKEN, model.cache_capacity_blocks)
+        self.batch = asyncio.Semaphore(model.max_batch) if model.max_batch > 0 else None
+        self.running = 0
+        self.waiting = 0
+        self.prefill_idle = asyncio.Event()
+        self.prefill_idle.set()
+        self.prefill_lock = asyncio.Lock()
+        self.total_prompt_tokens = 0
+        self.total_cached_tokens = 0
+        self.total_generation_tokens = 0
+
+
+STATE_KEY = web.AppKey("state", MockServerState)
+
+
+def _prompt_text(messages: list[dict]) -> str:
+    return "".join(f"<|{m.get('role', '')}|>{m.get('content') or ''}" for m in messages)
+
+
+def _sse(obj: dict) -> bytes:
+    return b"data: " + json.dumps(obj, separators=(",", ":")).encode() + b"\n\n"
+
+
+def _ndjson(obj: dict) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+async def _sleep_ms(ms: float):
+    # 0이어도 이벤트 루프에 양보해 다른 스트림이 굶지 않게 한다
+    await asyncio.sleep(ms / 1000 if ms > 0 else 0)
+
+
+def _injected_failure(model: LatencyModel) -> bool:
+    return bool(model.error_rate) and random.random() < model.error_rate
+
+
+@asynccontextmanager
+async def _serve(state: MockServerState, text: str):
+    """대기 -> (캐시되지 않은 부분) prefill까지 처리하고, 블록 안에서는 running으로 집계.
+
+    (prompt_tokens, cached_tokens, prefill_sec)를 넘긴다.
+    """
+    model = state.model
+    prompt_tokens = max(1, len(text) // _CHARS_PER_TOKEN)
+    state.waiting += 1
+    admitted = acquired = False
+    try:
+        if state.batch is not None:
+            await state.batch.acquire()
+            acquired = True
+        # prefill: 캐시되지 않은 부분만 비용 발생, 한 번에 하나씩 처리
+        async with state.prefill_lock:
+            state.waiting -= 1
+            state.running += 1
+            admitted = True
+            cached_tokens = 0
+            if model.prefix_cache:
+                cached_tokens = state.cache.match_and_insert(text) // _CHARS_PER_TOKEN
+            state.total_prompt_tokens += prompt_tokens
+            state.total_cached_tokens += cached_tokens
+            if model.prefill_blocks_decode:
+                state.prefill_idle.clear()
+            prefill_start = time.perf_counter()
+            try:
+                await _sleep_ms(model.prefill_ms(prompt_tokens - cached_tokens))
+            finally:
+                state.prefill_idle.set()
+            prefill_sec = time.perf_counter() - prefill_start
+        yield prompt_tokens, cached_tokens, prefill_sec
+    finally:
+        if admitted:
+            state.running -= 1
+        else:
+            state.waiting -= 1
+        if acquired:
+            state.batch.release()
+
+
+async def _decode(state: MockServerState, max_tokens: int, ignore_eos: bool, min_tokens: int):
+    """토큰을 하나씩 생성하며 (순번, 단어, reasoning 여부)를 넘긴다. EOS 조기 종료는 early_stop_rate."""
+    model = state.model
+    for i in range(max_tokens):
+        await state.prefill_idle.wait()
+        await _sleep_ms(model.decode_ms(state.running))
+        state.total_generation_tokens += 1
+        yield i, _TOKEN_WORDS[i % len(_TOKEN_WORDS)], i < model.reasoning_tokens
+        if (model.early_stop_rate and not ignore_eos and i + 1 >= min_tokens
+                and random.random() < model.early_stop_rate):
+            return
+
+
+async def handle_chat(request: web.Request) -> web.StreamResponse:
+    state: MockServerState = request.app[STATE_KEY]
+    model = state.model
+    body = await request.json()
+
+    if _injected_failure(model):
+        return web.json_response(
+            {"error": {"message": "Injected mock error", "type": "server_error"}}, status=500
+        )
+    if model.timeout_rate and random.random() < model.timeout_rate:
+        await asyncio.sleep(3600)
+
+    text = _prompt_text(body.get("messages", []))
+    max_tokens = int(body.get("max_tokens") or 256)
+    ignore_eos = bool(body.get("ignore_eos"))
+    min_tokens = int(body.get("min_tokens") or 0)
+    include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+    async with _serve(state, text) as (prompt_tokens, cached_tokens, _):
+        if not body.get("stream"):
+            completion_tokens = max_tokens
+            await _sleep_ms(model.decode_ms(state.running) * completion_tokens)
+            state.total_generation_tokens += completion_tokens
+            content = "".join(_TOKEN_WORDS[i % len(_TOKEN_WORDS)] for i in range(completion_tokens))
+            return web.json_response({
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": state.served_model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "length"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            })
+
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await resp.prepare(request)
+
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        head = {"id": chunk_id, "object": "chat.completion.chunk", "created": created, "model": state.served_model}
+        await resp.write(_sse({**head, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}))
+
+        completion_tokens = 0
+        async for _, word, reasoning in _decode(state, max_tokens, ignore_eos, min_tokens):
+            delta = {"reasoning_content": word} if reasoning else {"content": word}
+            await resp.write(_sse({**head, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}))
+            completion_tokens += 1
+        finish_reason = "length" if completion_tokens == max_tokens else "stop"
+
+        await resp.write(_sse({**head, "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}]}))
+        if include_usage:
+            await resp.write(_sse({**head, "choices": [], "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+                "completion_tokens_details": {"reasoning_tokens": min(completion_tokens, model.reasoning_tokens)},
+            }}))
+        await resp.write(b"data: [DONE]\n\n")
+        await resp.write_eof()
+        return resp
+
+
+async def handle_ollama_chat(request: web.Request) -> web.StreamResponse:
+    """Ollama 네이티브 /api/chat (NDJSON). 마지막 줄에 서버 측 duration(ns)을 보고한다."""
+    state: MockServerState = request.app[STATE_KEY]
+    model = state.model
+    body = await request.json()
+
+    if _injected_failure(model):
+        return web.json_response({"error": "Injected mock error"}, status=500)
+    if model.timeout_rate and random.random() < model.timeout_rate:
+        await asyncio.sleep(3600)
+
+    text = _prompt_text(body.get("messages", []))
+    max_tokens = int((body.get("options") or {}).get("num_predict") or 256)
+    request_start = time.perf_counter()
+
+    async with _serve(state, text) as (prompt_tokens, cached_tokens, prefill_sec):
+        resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await resp.prepare(request)
+        head = {"model": state.served_model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+
+        eval_count = 0
+        decode_start = time.perf_counter()
+        async for _, word, reasoning in _decode(state, max_tokens, False, 0):
+            message = {"role": "assistant", "content": "", "thinking": word} if reasoning else \
+                {"role": "assistant", "content": word}
+            await resp.write(_ndjson({**head, "message": message, "done": False}))
+            eval_count += 1
+        done_at = time.perf_counter()
+
+        await resp.write(_ndjson({
+            **head,
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "done_reason": "length" if eval_count == max_tokens else "stop",
+            "total_duration": int((done_at - request_start) * 1e9),
+            "load_duration": 0,
+            "prompt_eval_count": prompt_tokens - cached_tokens,
+            "prompt_eval_duration": int(prefill_sec * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int((done_at - decode_start) * 1e9),
+        }))
+        await resp.write_eof()
+        return resp
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"})
+
+
+async def handle_models(request: web.Request) -> web.Response:
+    state: MockServerState = request.app[STATE_KEY]
+    return web.json_response({"object": "list", "data": [{"id": state.served_model, "object": "model", "owned_by": "mock"}]})
+
+
+async def handle_tags(request: web.Request) -> web.Response:
+    state: MockServerState = request.app[STATE_KEY]
+    return web.json_response({"models": [{"name": state.served_model, "model": state.served_model}]})
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """vLLM 형식 Prometheus 메트릭 (server_metrics 수집 검증용)."""
+    state: MockServerState = request.app[STATE_KEY]
+    labels = f'{{model_name="{state.served_model}"}}'
+    kv_usage = len(state.cache.blocks) / state.cache.capacity if state.cache.capacity else 0.0
+    metrics = [
+        ("vllm:num_requests_running", "gauge", state.running),
+        ("vllm:num_requests_waiting", "gauge", state.waiting),
+        ("vllm:kv_cache_usage_perc", "gauge", kv_usage),
+        ("vllm:prompt_tokens_total", "counter", state.total_prompt_tokens),
+        ("vllm:generation_tokens_total", "counter", state.total_generation_tokens),
+        ("vllm:prefix_cache_queries_total", "counter", state.total_prompt_tokens),
+        ("vllm:prefix_cache_hits_total", "counter", state.total_cached_tokens),
+    ]
+    lines = []
+    for name, kind, value in metrics:
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name}{labels} {float(value)}")
+    return web.Response(text="\n".join(lines) + "\n", content_type="text/plain")
+
+
+def create_app(model: LatencyModel, served_model: str = "mock-model") -> web.Application:
+    app = web.Application()
+    app[STATE_KEY] = MockServerState(model, served_model)
+    app.add_routes([
+        web.post("/v1/chat/completions", handle_chat),
+        web.post("/api/chat", handle_ollama_chat),
+        web.get("/health", handle_health),
+        web.get("/v1/models", handle_models),
+        web.get("/api/tags", handle_tags),
+        web.get("/metrics", handle_metrics),
+    ])
+    return app
+
+
+async def start_mock_server(
+    model: LatencyModel, host: str = "127.0.0.1", port: int = 0, served_model: str = "mock-model"
+) -> tuple[web.AppRunner, str]:
+    """같은 프로세스 안에서 모의 서버 시작. (runner, base_url)을 반환하며 port=0이면 빈 포트 사용."""
+    runner = web.AppRunner(create_app(model, served_model), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def main(argv: list[str] | None = None):
+    default_port = int(FRAMEWORK_CONFIG["mock"]["base_url"].rsplit(":", 1)[1])
+    parser = argparse.ArgumentParser(prog="python -m bench mock-server", description="Mock OpenAI-compatible streaming server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=default_port)
+    parser.add_argument("--unix-socket", default=None, help="Listen on this Unix domain socket instead of TCP")
+    parser.add_argument("--served-model", default=FRAMEWORK_CONFIG["mock"]["model"], help="Model id reported by the server")
+    parser.add_argument("--latency", default="gpu", choices=list(LATENCY_PRESETS), help="Latency model preset (default: gpu)")
+    for f in fields(LatencyModel):
+        flag = "--" + f.name.replace("_", "-")
+        if f.type in ("bool", bool):
+            parser.add_argument(flag, type=lambda v: v.lower() in ("1", "true", "yes"), default=None,
+                                help=f"Override {f.name} (true/false)")
+        else:
+            parser.add_argument(flag, type=float if f.type in ("float", float) else int, default=None,
+                                help=f"Override {f.name}")
+    args = parser.parse_args(argv)
+
+    overrides = {f.name: getattr(args, f.name) for f in fields(LatencyModel) if getattr(args, f.name) is not None}
+    model = replace(LATENCY_PRESETS[args.latency], **overrides)
+    where = f"unix:{args.unix_socket}" if args.unix_socket else f"http://{args.host}:{args.port}"
+    print(f"Mock server on {where} (latency: {args.latency})")
+    print(f"  {model}")
+    listen = {"path": args.unix_socket} if args.unix_socket else {"host": args.host, "port": args.port}
+    web.run_app(create_app(model, args.served_model), access_log=None, print=None, **listen)
@@ -0,0 +1,158 @@
+"""여러 프레임워크를 한 번의 실행으로 비교 (--framework sglang,vllm,...).
+
+프레임워크마다 별도 asyncio 태스크에서 같은 시나리오를 실행한다. 원시 결과 writer,
+매니페스트, 서버 메트릭 수집기는 컨텍스트 변수라 태스크마다 따로 설정되고, 워크로드는
+seed와 salt 순번이 같아 모든 프레임워크가 바이트 단위로 같은 프롬프트를 받는다.
+
+    interleave  파라미터 포인트 단위로 A/B/A/B 번갈아 실행 (한 번에 한 프레임워크만
+                서버에 부하를 주고, 시간에 따른 발열·호스트 상태 변화가 양쪽에 고르게 섞임)
+    parallel    모든 프레임워크를 동시에 실행 (서버가 서로 다른 GPU에 있을 때)
+
+포인트 경계는 러너의 세션(open_session)과 분산 실행 구간이다. 그 안에서 보낸 요청만
+차례를 기다리며, 프롬프트 생성 같은 준비 작업은 차례 밖에서 진행된다.
+"""
+
+import asyncio
+import contextvars
+import time
+from contextlib import asynccontextmanager
+
+from .stats import compare_samples, metric_samples, trial_throughputs
+
+MULTI_MODES = ["interleave", "parallel"]
+
+# 프레임워크 태스크가 설정하는 현재 프레임워크 이름과, 이미 차례를 잡고 있는지 여부
+_lane: contextvars.ContextVar = contextvars.ContextVar("lane", default=None)
+_holding: contextvars.ContextVar = contextvars.ContextVar("holding", default=False)
+
+_gate = None
+
+
+class PointGate:
+    """interleave 모드의 포인트 차례 (등록 순서 round-robin, 끝난 프레임워크는 건너뜀)."""
+
+    def __init__(self, frameworks: list[str]):
+        self.order = list(frameworks)
+        self.active = set(frameworks)
+        self.turn = 0
+        self.cond = asyncio.Condition()
+        self.origin = time.perf_counter()
+        self.schedule: list[dict] = []  # 실제 실행 순서 (포인트마다 프레임워크, 시작/끝 시각)
+
+    def _advance(self):
+        for step in range(1, len(self.order) + 1):
+            idx = (self.turn + step) % len(self.order)
+            if self.order[idx] in self.active:
+                self.turn = idx
+                return
+
+    async def acquire(self, framework: str):
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.order[self.turn] == framework)
+        self.schedule.append({"framework": framework, "start_sec": round(time.perf_counter() - self.origin, 3)})
+
+    async def release(self, framework: str):
+        self.schedule[-1]["end_sec"] = round(time.perf_counter() - self.origin, 3)
+        async with self.cond:
+            self._advance()
+            self.cond.notify_all()
+
+    async def finish(self, framework: str):
+        """프레임워크의 모든 시나리오가 끝남 (예외 포함) -> 순서에서 제외."""
+        async with self.cond:
+            self.active.discard(framework)
+            if self.order[self.turn] == framework:
+                self._advance()
+            self.cond.notify_all()
+
+
+def set_gate(gate: PointGate | None):
+    global _gate
+    _gate = gate
+
+
+def set_lane(framework: str | None):
+    """현재 태스크가 실행하는 프레임워크 (태스크 안에서 호출)."""
+    _lane.set(framework)
+
+
+def current_lane() -> str | None:
+    return _lane.get()
+
+
+@asynccontextmanager
+async def point_turn():
+    """interleave 실행이면 현재 프레임워크 차례가 올 때까지 기다렸다가 블록을 실행.
+
+    중첩 호출(포인트 안에서 다시 세션을 여는 경우)은 바로 통과한다.
+    """
+    framework = _lane.get()
+    if _gate is None or framework is None or _holding.get():
+        yield
+        return
+    await _gate.acquire(framework)
+    token = _holding.set(True)
+    try:
+        yield
+    finally:
+        _holding.reset(token)
+        await _gate.release(framework)
+
+
+_POINT_FIELDS = ("scenario", "concurrency", "input_tokens", "output_tokens", "offered_rate_rps", "cache_mode")
+_COMPARE_METRICS = ("avg_ttft_ms", "p99_ttft_ms", "p99_itl_ms", "total_token_throughput", "p99_latency_ms",
+                    "success_rate", "goodput_rps")
+# 프레임워크 간 유의성 검정 지표: 이름 -> (RequestResult 속성, 통계량). throughput은 시행별 처리량
+_TESTED_METRICS = {
+    "ttft_mean": ("ttft_ms", "mean"),
+    "ttft_p99": ("ttft_ms", "p99"),
+    "latency_mean": ("total_latency_ms", "mean"),
+}
+
+
+def _significance(base, other) -> dict:
+    """base 대비 other의 지표별 부트스트랩 차이 검정 (요청별 결과가 없는 재개 포인트는 빈 dict)."""
+    a = [r for r in base.results if r.success]
+    b = [r for r in other.results if r.success]
+    tests = {}
+    for name, (attr, statistic) in _TESTED_METRICS.items():
+        if statistic == "p99" and not (base.confidence.get("p99_supported") and other.confidence.get("p99_supported")):
+            continue
+        test = compare_samples(metric_samples(a, attr), metric_samples(b, attr), statistic)
+        if test is not None:
+            tests[name] = test
+    test = compare_samples(trial_throughputs(a), trial_throughputs(b))
+    if test is not None:
+        tests["throughput"] = test
+    return tests
+
+
+def compare_results(runs: dict[str, list]) -> list[dict]:
+    """프레임워크별 ScenarioResult 목록에서 같은 포인트끼리 주요 지표를 나란히 모은다 (첫 프레임워크 포인트 순서).
+
+    첫 프레임워크를 기준으로 나머지와 부트스트랩 검정을 하고, CI가 0을 포함하는 지표는
+    no_significant_difference에 모은다. 한 프레임워크에만 있는 포인트(goodput 탐색 probe 등)는 제외한다.
+    """
+    points: dict[tuple, dict] = {}
+    for framework, results in runs.items():
+        for sr in results:
+            key = tuple(getattr(sr, f) for f in _POINT_FIELDS)
+            row = points.setdefault(key, {**dict(zip(_POINT_FIELDS, key)), "frameworks": {}, "_sr": {}})
+            row["frameworks"][framework] = {m: getattr(sr, m) for m in _COMPARE_METRICS}
+            row["_sr"][framework] = sr
+
+    rows = []
+    for row in points.values():
+        by_framework = row.pop("_sr")
+        if len(by_framework) < 2:
+            continue
+        base_name, *others = by_framework
+        row["significance"] = {}
+        row["no_significant_difference"] = {}
+        for name in others:
+            pair = f"{base_name}_vs_{name}"
+            tests = _significance(by_framework[base_name], by_framework[name])
+            row["significance"][pair] = tests
+            row["no_significant_difference"][pair] = [m for m, t in tests.items() if not t["significant"]]
+        rows.append(row)
+    return rows
@@ -48,11 +48,48 @@ ENGLISH_CONTRAST_PROMPTS = {
 }
 
 
-def generate_prompt(approx_tokens: int, lang: str = "en") -> str:
-    """지정된 토큰 수에 근사하는 프롬프트 생성.
+# (토크나이저 이름, 언어) -> (필러 텍스트, 토큰 i의 끝 문자 위치 목록)
+_PREFIX_INDEX: dict[tuple[str, str], tuple[str, list[int]]] = {}
+
+
+def _prefix_index(tokenizer, lang: str, min_tokens: int) -> tuple[str, list[int]]:
+    """필러 텍스트의 토큰 경계 인덱스 (fast 토크나이저). 토크나이저·언어별로 캐시하고 부족하면 2배로 확장."""
+    key = (getattr(tokenizer, "name_or_path", str(id(tokenizer))), lang)
+    cached = _PREFIX_INDEX.get(key)
+    if cached and len(cached[1]) >= min_tokens:
+        return cached
+
+    unit = KOREAN_FILLER_TEXT if lang == "ko" else FILLER_TEXT
+    repeats = max(1, len(cached[0]) // len(unit)) if cached else 1
+    while True:
+        text = unit * repeats
+        enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        ends = [end for _, end in enc["offset_mapping"]]
+        if len(ends) >= min_tokens:
+            break
+        repeats *= 2
+    _PREFIX_INDEX[key] = (text, ends)
+    return text, ends
+
+
+def generate_prompt(approx_tokens: int, lang: str = "en", tokenizer=None) -> str:
+    """지정된 토큰 수의 프롬프트 생성.
+
+    tokenizer가 있으면 캐시된 토큰 경계 인덱스로 정확히 approx_tokens 토큰에서 자른다.
+    없으면 문자 수로 근사한다:
     영어: 대략 1 토큰 ~= 4 문자
     한국어: 대략 1 토큰 ~= 1.5 문자 (한국어는 토큰당 문자 수가 적음)
     """
+    if tokenizer is not None and approx_tokens > 0:
+        if getattr(tokenizer, "is_fast", False):
+            text, ends = _prefix_index(tokenizer, lang, approx_tokens)
+            return text[:ends[approx_tokens - 1]]
+        # slow 토크나이저는 offset 매핑이 없어 토큰 id를 잘라 디코딩
+        unit = KOREAN_FILLER_TEXT if lang == "ko" else FILLER_TEXT
+        ids = tokenizer.encode(unit, add_special_tokens=False)
+        ids = ids * (approx_tokens // len(ids) + 1)
+        return tokenizer.decode(ids[:approx_tokens])
+
     if lang == "ko":
         target_chars = int(approx_tokens * 1.5)
         text = KOREAN_FILLER_TEXT
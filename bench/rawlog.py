@@ -0,0 +1,90 @@
+"""요청별 원시 결과를 실행 중에 JSONL로 스트리밍 저장.
+
+ScenarioResult.to_dict는 집계값만 남기므로, 백분위 재계산·CDF·이상치 분석을 위해
+모든 RequestResult를 완료되는 즉시 append-only JSONL에 기록한다. 쓰기 버퍼 크기가
+제한되어 있어 긴 실행에서도 메모리가 일정하고, 중간에 죽어도 flush된 기록은 남는다.
+"""
+
+import contextvars
+import json
+import os
+from dataclasses import asdict, replace
+
+# run_benchmark가 시나리오 단위로 설정하는 라벨 (scenario 등)
+RAW_LABELS: contextvars.ContextVar[dict] = contextvars.ContextVar("raw_labels", default={})
+
+# 다중 프레임워크 실행에서는 프레임워크 태스크마다 따로 설정된다
+_writer: contextvars.ContextVar = contextvars.ContextVar("raw_writer", default=None)
+
+
+def request_record(result, **labels) -> dict:
+    """RequestResult -> JSON 직렬화 가능한 dict. 청크 도착 시각은 0.01ms 단위로 반올림하고 응답 텍스트는 제외."""
+    record = asdict(replace(result, token_times_ms=[], output_text=""))
+    record.pop("output_text", None)
+    record["token_times_ms"] = [round(t, 2) for t in result.token_times_ms]
+    return {**labels, **record}
+
+
+class RawResultWriter:
+    """요청별 결과 JSONL writer. buffer_size개가 쌓이면 파일에 flush한다."""
+
+    def __init__(self, path: str, buffer_size: int = 256, run_id: str = ""):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.buffer_size = buffer_size
+        self.run_id = run_id
+        self.points = 0
+        self.records = 0
+        self._buffer: list[str] = []
+        self._file = open(path, "a", encoding="utf-8")
+
+    def begin_point(self) -> int:
+        """파라미터 포인트(러너 호출 1회) 번호 발급."""
+        self.points += 1
+        return self.points
+
+    def write(self, result, **labels):
+        record = request_record(result, run_id=self.run_id, **RAW_LABELS.get(), **labels)
+        self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self.records += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def set_raw_writer(writer: RawResultWriter | None):
+    _writer.set(writer)
+
+
+def get_raw_writer() -> RawResultWriter | None:
+    return _writer.get()
+
+
+def begin_point() -> int:
+    writer = _writer.get()
+    return writer.begin_point() if writer is not None else 0
+
+
+def record_result(result, **labels):
+    """활성 writer가 있으면 결과 1건 기록 (없으면 무시)."""
+    writer = _writer.get()
+    if writer is not None:
+        writer.write(result, **labels)
+
+
+def iter_raw_records(path: str):
+    """JSONL 원시 결과를 한 줄씩 읽는 제너레이터 (사후 분석용)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
@@ -8,7 +8,10 @@
 #   bash bench/run_all.sh sglang                       # SGLang만 실행
 #   bash bench/run_all.sh vllm concurrent              # vLLM의 concurrent 시나리오만 실행
 #   bash bench/run_all.sh ollama single                # Ollama의 single 시나리오만 실행
+#   bash bench/run_all.sh vllm soak                    # vLLM 장시간 soak (all에는 포함되지 않음, 기본 1시간)
 #   bash bench/run_all.sh sglang all llama3.1-8b       # SGLang + Llama 3.1 8B 모델
+#   bash bench/run_all.sh sglang,vllm concurrent       # 두 서버를 한 번에 비교 (포인트 단위 번갈아 실행)
+#   MULTI_MODE=parallel bash bench/run_all.sh sglang,vllm   # 서로 다른 GPU의 서버를 동시에 실행
 #
 # 주의: 각 프레임워크 서버를 별도로 시작해야 합니다.
 #       이 스크립트는 이미 실행 중인 서버에 대해 벤치마크를 수행합니다.
@@ -75,6 +78,21 @@ wait_for_server() {
     return 1
 }
 
+# ---- 프레임워크 서버 health 체크 ----
+wait_for_framework() {
+    case $1 in
+        sglang)
+            wait_for_server "http://localhost:30000/health" "SGLang" || return 1
+            ;;
+        vllm)
+            wait_for_server "http://localhost:8000/health" "vLLM" || return 1
+            ;;
+        ollama)
+            wait_for_server "http://localhost:11434/api/tags" "Ollama" || return 1
+            ;;
+    esac
+}
+
 # ---- 프레임워크별 벤치마크 실행 ----
 run_benchmark() {
     local framework=$1
@@ -86,17 +104,7 @@ run_benchmark() {
     log_info "============================================"
 
     # 서버 health 체크
-    case $framework in
-        sglang)
-            wait_for_server "http://localhost:30000/health" "SGLang" || return 1
-            ;;
-        vllm)
-            wait_for_server "http://localhost:8000/health" "vLLM" || return 1
-            ;;
-        ollama)
-            wait_for_server "http://localhost:11434/api/tags" "Ollama" || return 1
-            ;;
-    esac
+    wait_for_framework "$framework" || return 1
 
     # 벤치마크 실행
     source "$BENCH_ENV/bin/activate"
@@ -111,6 +119,35 @@ run_benchmark() {
     echo ""
 }
 
+# ---- 여러 프레임워크 동시 비교 (같은 워크로드, 결과 한 파일) ----
+run_comparison() {
+    local frameworks=$1
+    local scenario=${2:-all}
+    local model=${3:-gpt-oss-20b}
+    local mode=${MULTI_MODE:-interleave}
+
+    log_info "============================================"
+    log_info "Running comparison: $frameworks ($mode, model: $model, scenario: $scenario)"
+    log_info "============================================"
+
+    local fw
+    for fw in ${frameworks//,/ }; do
+        wait_for_framework "$fw" || return 1
+    done
+
+    source "$BENCH_ENV/bin/activate"
+    python3 -m bench \
+        --framework "$frameworks" \
+        --multi-mode "$mode" \
+        --model "$model" \
+        --scenario "$scenario" \
+        --output-dir "$PROJECT_DIR/results/${frameworks//,/_vs_}"
+    deactivate
+
+    log_info "$frameworks comparison complete."
+    echo ""
+}
+
 # ---- 결과 요약 생성 ----
 generate_summary() {
     log_info "Generating summary..."
@@ -202,6 +239,8 @@ main() {
         done
 
         generate_summary
+    elif [[ "$target_framework" == *,* ]]; then
+        run_comparison "$target_framework" "$target_scenario" "$target_model"
     else
         run_benchmark "$target_framework" "$target_scenario" "$target_model"
     fi
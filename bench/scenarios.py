@@ -1,24 +1,70 @@
-"""5개 시나리오 함수."""
+"""벤치마크 시나리오 함수."""
 
 import statistics
 import time
+from dataclasses import replace
 
-import aiohttp
-from tqdm import tqdm
+import numpy as np
 
+from .arrival import build_schedule
+from .backends import build_payload, get_backend, supports_fixed_length
+from .checkpoint import checkpoint_point, completed_point
 from .client import (
     ScenarioResult,
-    get_gpu_stats,
+    meets_slo,
     run_concurrent_requests,
+    run_interference_requests,
+    run_open_loop_requests,
+    run_session_requests,
     send_request,
 )
-from .config import FRAMEWORK_CONFIG
+from .config import (
+    FRAMEWORK_CONFIG,
+    RATE_SWEEP_DURATION_SEC,
+    RATE_SWEEP_MIN_REQUESTS,
+    RATE_SWEEP_RATES,
+    RUN_OPTIONS,
+    SLO_ATTAINMENT_PCT,
+    SLO_ITL_MS,
+    SLO_MIN_SUCCESS_RATE,
+    SLO_P99_TTFT_MS,
+    SOAK_ERROR_BURST_PCT,
+)
+from .dashboard import progress
 from .prompts import (
     ENGLISH_CONTRAST_PROMPTS,
     KOREAN_PROMPTS,
     SYSTEM_PROMPT_LONG,
     generate_prompt,
 )
+from .rawlog import begin_point, record_result
+from .server_metrics import attach_server_metrics
+from .sketch import StreamingAggregator
+from .soak import analyze_windows, run_soak_requests
+from .telemetry import attach_gpu_stats
+from .transport import open_session
+from .workloads import (
+    PrefixTreeConfig,
+    Workload,
+    apply_cache_mode,
+    generate_prefix_tree_workload,
+    generate_session_workload,
+    generate_synthetic_workload,
+    parse_length_distribution,
+    sample_dataset_workload,
+    ttft_by_cache,
+    ttft_by_turn,
+    workload_stats,
+)
+from .tokenizer import get_tokenizer
+
+# 동시 요청 부하 테스트의 동시성 레벨 (calibrate도 같은 레벨로 측정)
+CONCURRENT_LOAD_LEVELS = [1, 8, 16, 32, 64]
+
+
+def repeat_prompt(messages: list[dict], n: int) -> list[list[dict]]:
+    """같은 프롬프트 n개에 --cache-mode(cold/warm/ratio) 적용."""
+    return apply_cache_mode([messages] * n, RUN_OPTIONS["cache_mode"])
 
 
 async def scenario_single_request(framework: str, warmup: int = 3) -> list[ScenarioResult]:
@@ -34,11 +80,15 @@ async def scenario_single_request(framework: str, warmup: int = 3) -> list[Scena
 
     for input_len in input_lengths:
         print(f"\n--- Input: {input_len} tokens, Output: {output_tokens} tokens ---")
-        prompt = generate_prompt(input_len)
+        done = completed_point("single_request", input_tokens=input_len, cache_mode=RUN_OPTIONS["cache_mode"])
+        if done:
+            all_results.append(done)
+            continue
+        prompt = generate_prompt(input_len, tokenizer=get_tokenizer(framework))
         messages = [
             {"role": "user", "content": prompt + f"\nPlease write a detailed response about AI technology trends."}
         ]
-        messages_list = [messages] * (warmup + num_requests)
+        messages_list = repeat_prompt(messages, warmup + num_requests)
 
         results, elapsed = await run_concurrent_requests(
             framework, messages_list, output_tokens, concurrency=1
@@ -56,13 +106,14 @@ async def scenario_single_request(framework: str, warmup: int = 3) -> list[Scena
             num_requests=num_requests,
             results=results,
             total_time_sec=round(elapsed, 2),
+            cache_mode=RUN_OPTIONS["cache_mode"],
         )
 
-        gpu = get_gpu_stats()
-        sr.gpu_memory_mb = gpu["memory_used_mb"]
-        sr.gpu_utilization_pct = gpu["gpu_utilization_pct"]
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
         sr.compute_aggregates()
         all_results.append(sr)
+        checkpoint_point(sr, input_tokens=input_len, cache_mode=sr.cache_mode)
 
         print(f"  TTFT (avg): {sr.avg_ttft_ms} ms")
         print(f"  Throughput: {sr.total_token_throughput} tok/s")
@@ -78,20 +129,25 @@ async def scenario_concurrent_load(framework: str) -> list[ScenarioResult]:
     print(f"[Scenario 2] Concurrent Load Test - {framework}")
     print(f"{'='*60}")
 
-    concurrency_levels = [1, 8, 16, 32, 64]
+    concurrency_levels = CONCURRENT_LOAD_LEVELS
     input_tokens = 512
     output_tokens = 256
     total_requests = 100
     all_results = []
 
-    prompt = generate_prompt(input_tokens)
+    prompt = generate_prompt(input_tokens, tokenizer=get_tokenizer(framework))
     messages = [
         {"role": "user", "content": prompt + "\nSummarize the key points about modern AI systems."}
     ]
 
     for conc in concurrency_levels:
         print(f"\n--- Concurrency: {conc}, Total Requests: {total_requests} ---")
-        messages_list = [messages] * total_requests
+        done = completed_point("concurrent_load", concurrency=conc, input_tokens=input_tokens,
+                               cache_mode=RUN_OPTIONS["cache_mode"])
+        if done:
+            all_results.append(done)
+            continue
+        messages_list = repeat_prompt(messages, total_requests)
 
         results, elapsed = await run_concurrent_requests(
             framework, messages_list, output_tokens, concurrency=conc
@@ -106,17 +162,19 @@ async def scenario_concurrent_load(framework: str) -> list[ScenarioResult]:
             num_requests=total_requests,
             results=results,
             total_time_sec=round(elapsed, 2),
+            cache_mode=RUN_OPTIONS["cache_mode"],
         )
 
-        gpu = get_gpu_stats()
-        sr.gpu_memory_mb = gpu["memory_used_mb"]
-        sr.gpu_utilization_pct = gpu["gpu_utilization_pct"]
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
         sr.compute_aggregates()
         all_results.append(sr)
+        checkpoint_point(sr, concurrency=conc, input_tokens=input_tokens, cache_mode=sr.cache_mode)
 
         print(f"  Request throughput: {sr.request_throughput} req/s")
         print(f"  Token throughput: {sr.total_token_throughput} tok/s")
         print(f"  TTFT p50/p95: {sr.p50_ttft_ms}/{sr.p95_ttft_ms} ms")
+        print(f"  ITL p50/p99/max: {sr.p50_itl_ms}/{sr.p99_itl_ms}/{sr.max_itl_ms} ms (stalls: {sr.itl_stall_count})")
         print(f"  Latency p50/p95/p99: {sr.p50_latency_ms}/{sr.p95_latency_ms}/{sr.p99_latency_ms} ms")
         print(f"  Success rate: {sr.success_rate}%")
 
@@ -136,14 +194,19 @@ async def scenario_long_context(framework: str) -> list[ScenarioResult]:
     all_results = []
 
     for input_len in input_lengths:
-        prompt = generate_prompt(input_len)
+        prompt = generate_prompt(input_len, tokenizer=get_tokenizer(framework))
         messages = [
             {"role": "user", "content": prompt + "\nProvide a comprehensive analysis of the above content."}
         ]
 
         for conc in concurrency_levels:
             print(f"\n--- Input: {input_len} tokens, Concurrency: {conc} ---")
-            messages_list = [messages] * num_requests
+            done = completed_point("long_context", concurrency=conc, input_tokens=input_len,
+                                   cache_mode=RUN_OPTIONS["cache_mode"])
+            if done:
+                all_results.append(done)
+                continue
+            messages_list = repeat_prompt(messages, num_requests)
 
             results, elapsed = await run_concurrent_requests(
                 framework, messages_list, output_tokens, concurrency=conc
@@ -158,13 +221,14 @@ async def scenario_long_context(framework: str) -> list[ScenarioResult]:
                 num_requests=num_requests,
                 results=results,
                 total_time_sec=round(elapsed, 2),
+                cache_mode=RUN_OPTIONS["cache_mode"],
             )
 
-            gpu = get_gpu_stats()
-            sr.gpu_memory_mb = gpu["memory_used_mb"]
-            sr.gpu_utilization_pct = gpu["gpu_utilization_pct"]
+            attach_gpu_stats(sr)
+            await attach_server_metrics(sr)
             sr.compute_aggregates()
             all_results.append(sr)
+            checkpoint_point(sr, concurrency=conc, input_tokens=input_len, cache_mode=sr.cache_mode)
 
             print(f"  TTFT (avg): {sr.avg_ttft_ms} ms")
             print(f"  Throughput: {sr.total_token_throughput} tok/s")
@@ -174,6 +238,256 @@ async def scenario_long_context(framework: str) -> list[ScenarioResult]:
     return all_results
 
 
+def _steady_decode_throughput(results) -> float:
+    """배치 전체가 디코드 중인 구간(마지막 첫 토큰 ~ 최초 마지막 토큰)의 출력 tok/s.
+
+    청크당 토큰 수는 요청별 tokens_generated / 청크 수로 환산한다.
+    """
+    streams = [r for r in results if r.success and len(r.token_times_ms) >= 2]
+    if not streams:
+        return 0.0
+    times = [r.start_offset_ms + np.frombuffer(r.token_times_ms, dtype=np.float64) for r in streams]
+    lo = max(t[0] for t in times)
+    hi = min(t[-1] for t in times)
+    if hi <= lo:
+        return 0.0
+    tokens = sum(
+        int(((t > lo) & (t <= hi)).sum()) * r.tokens_generated / len(t)
+        for r, t in zip(streams, times)
+    )
+    return round(tokens / (hi - lo) * 1000, 2)
+
+
+def _itl_interference(decode_results, prefill_results) -> dict:
+    """decode 청크 간격을 prefill 진행 구간과 겹치는지로 나눠 ITL 비교.
+
+    prefill 구간은 각 prefill 요청의 전송 ~ 완료 시각이다 (max_tokens=1이므로 대기 + prefill).
+    """
+    windows = [
+        (r.start_offset_ms, r.start_offset_ms + r.total_latency_ms)
+        for r in prefill_results if r.success
+    ]
+    during, baseline = [], []
+    for r in decode_results:
+        if not r.success or len(r.token_times_ms) < 2:
+            continue
+        t = r.start_offset_ms + np.frombuffer(r.token_times_ms, dtype=np.float64)
+        gaps = np.diff(t)
+        overlap = np.zeros(gaps.size, dtype=bool)
+        for start, end in windows:
+            overlap |= (t[1:] > start) & (t[:-1] < end)
+        during.append(gaps[overlap])
+        baseline.append(gaps[~overlap])
+
+    def dist(parts):
+        values = np.concatenate(parts) if parts else np.array([])
+        if not values.size:
+            return {"count": 0}
+        p50, p99 = np.percentile(values, [50, 99])
+        return {"count": int(values.size), "p50_itl_ms": round(float(p50), 2),
+                "p99_itl_ms": round(float(p99), 2), "max_itl_ms": round(float(values.max()), 2)}
+
+    summary = {
+        "num_prefills": len(windows),
+        "avg_prefill_latency_ms": round(statistics.mean(e - s for s, e in windows), 2) if windows else 0.0,
+        "baseline": dist(baseline),
+        "during_prefill": dist(during),
+    }
+    base, spike = summary["baseline"], summary["during_prefill"]
+    if base["count"] and spike["count"] and base["p50_itl_ms"] > 0:
+        summary["p99_spike_ratio"] = round(spike["p99_itl_ms"] / base["p50_itl_ms"], 2)
+        summary["max_spike_ratio"] = round(spike["max_itl_ms"] / base["p50_itl_ms"], 2)
+    return summary
+
+
+async def scenario_prefill_heavy(framework: str) -> list[ScenarioResult]:
+    """시나리오 3b: prefill 위주 부하 (긴 입력, max_tokens=1).
+
+    출력이 1토큰이므로 처리 시간은 거의 prefill이고, 처리한 입력 tok/s를 직접 보고한다.
+    prefix cache가 prefill을 건너뛰지 않도록 --cache-mode와 상관없이 항상 cold로 보낸다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 3b] Prefill-heavy Test - {framework}")
+    print(f"{'='*60}")
+
+    input_lengths = [2048, 8192]
+    concurrency_levels = [1, 8, 32]
+    output_tokens = 1
+    all_results = []
+
+    for input_len in input_lengths:
+        prompt = generate_prompt(input_len, tokenizer=get_tokenizer(framework))
+        messages = [{"role": "user", "content": prompt + "\nSummarize the above content."}]
+
+        for conc in concurrency_levels:
+            num_requests = max(8, 2 * conc)
+            print(f"\n--- Input: {input_len} tokens, Concurrency: {conc}, Requests: {num_requests} ---")
+            done = completed_point("prefill_heavy", concurrency=conc, input_tokens=input_len)
+            if done:
+                all_results.append(done)
+                continue
+            messages_list = apply_cache_mode([messages] * num_requests, "cold")
+
+            results, elapsed = await run_concurrent_requests(
+                framework, messages_list, output_tokens, concurrency=conc
+            )
+
+            sr = ScenarioResult(
+                scenario="prefill_heavy",
+                framework=framework,
+                concurrency=conc,
+                input_tokens=input_len,
+                output_tokens=output_tokens,
+                num_requests=num_requests,
+                results=results,
+                total_time_sec=round(elapsed, 2),
+                cache_mode="cold",
+            )
+
+            attach_gpu_stats(sr)
+            await attach_server_metrics(sr)
+            sr.compute_aggregates()
+            # usage가 없으면 목표 입력 길이로 환산
+            processed = sum(r.prompt_tokens or input_len for r in results if r.success)
+            if elapsed > 0:
+                sr.prefill_throughput = round(processed / elapsed, 2)
+            all_results.append(sr)
+            checkpoint_point(sr, concurrency=conc, input_tokens=input_len)
+
+            print(f"  Prefill throughput: {sr.prefill_throughput} input tok/s")
+            print(f"  Latency (prefill + 1 token) p50/p99: {sr.p50_latency_ms}/{sr.p99_latency_ms} ms")
+            print(f"  Success rate: {sr.success_rate}%")
+
+    return all_results
+
+
+async def scenario_decode_heavy(framework: str) -> list[ScenarioResult]:
+    """시나리오 3c: decode 위주 부하 (짧은 입력, 고정 길이 긴 출력).
+
+    배치 크기만큼의 요청을 한꺼번에 보내고, 모든 요청이 디코드 중인 구간의
+    출력 tok/s를 배치 크기별 정상 상태 decode 처리량으로 보고한다.
+    ignore_eos를 지원하지 않는 프레임워크는 EOS에서 일찍 끝날 수 있다 (fixed_length=False).
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 3c] Decode-heavy Test - {framework}")
+    print(f"{'='*60}")
+
+    batch_sizes = [1, 8, 32, 64]
+    output_tokens = 1024
+    fixed = supports_fixed_length(FRAMEWORK_CONFIG[framework])
+    messages = [{"role": "user", "content": "Write a long, detailed story about a journey across the sea."}]
+    all_results = []
+
+    if not fixed:
+        print(f"  NOTE: {framework} does not support ignore_eos; output length may vary")
+
+    for batch in batch_sizes:
+        print(f"\n--- Batch size: {batch}, Output: {output_tokens} tokens ---")
+        done = completed_point("decode_heavy", concurrency=batch, output_tokens=output_tokens,
+                               cache_mode=RUN_OPTIONS["cache_mode"])
+        if done:
+            all_results.append(done)
+            continue
+
+        results, elapsed = await run_concurrent_requests(
+            framework, repeat_prompt(messages, batch), output_tokens, concurrency=batch, fixed_length=True
+        )
+
+        sr = ScenarioResult(
+            scenario="decode_heavy",
+            framework=framework,
+            concurrency=batch,
+            input_tokens=0,
+            output_tokens=output_tokens,
+            num_requests=batch,
+            results=results,
+            total_time_sec=round(elapsed, 2),
+            cache_mode=RUN_OPTIONS["cache_mode"],
+            fixed_length=fixed,
+            decode_throughput=_steady_decode_throughput(results),
+        )
+
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
+        sr.compute_aggregates()
+        sr.input_tokens = round(sr.avg_prompt_tokens)
+        all_results.append(sr)
+        checkpoint_point(sr, concurrency=batch, output_tokens=output_tokens, cache_mode=sr.cache_mode)
+
+        print(f"  Steady-state decode throughput: {sr.decode_throughput} tok/s "
+              f"({round(sr.decode_throughput / batch, 2)} tok/s per sequence)")
+        print(f"  TPOT p50/p99: {sr.p50_tpot_ms}/{sr.p99_tpot_ms} ms")
+        print(f"  Success rate: {sr.success_rate}%")
+
+    return all_results
+
+
+async def scenario_interference(framework: str) -> list[ScenarioResult]:
+    """시나리오 3d: decode 스트림에 긴 prefill을 주입하는 간섭 테스트 (H4).
+
+    고정 길이로 디코드 중인 배치에 1초 간격으로 긴 입력 요청을 끼워 넣고, prefill이
+    진행되는 동안의 decode ITL을 그 밖의 구간과 비교한다. chunked prefill 등 스케줄러가
+    prefill과 decode를 어떻게 섞는지에 따라 ITL 스파이크 크기가 달라진다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 3d] Prefill/Decode Interference Test - {framework}")
+    print(f"{'='*60}")
+
+    decode_batch = 8
+    decode_tokens = 1024
+    prefill_lengths = [2048, 8192]
+    prefill_offsets = [1.0, 2.0, 3.0, 4.0]
+    decode_messages = [{"role": "user", "content": "Write a long, detailed story about a journey across the sea."}]
+    all_results = []
+
+    for prefill_len in prefill_lengths:
+        print(f"\n--- Decode batch: {decode_batch} x {decode_tokens} tokens, "
+              f"Prefill injections: {len(prefill_offsets)} x {prefill_len} tokens ---")
+        done = completed_point("interference", concurrency=decode_batch, input_tokens=prefill_len)
+        if done:
+            all_results.append(done)
+            continue
+
+        prompt = generate_prompt(prefill_len, tokenizer=get_tokenizer(framework))
+        prefill_messages = [{"role": "user", "content": prompt + "\nSummarize the above content."}]
+        decode_results, prefill_results, elapsed = await run_interference_requests(
+            framework,
+            apply_cache_mode([decode_messages] * decode_batch, "cold"),
+            decode_tokens,
+            apply_cache_mode([prefill_messages] * len(prefill_offsets), "cold"),
+            prefill_offsets,
+        )
+
+        sr = ScenarioResult(
+            scenario="interference",
+            framework=framework,
+            concurrency=decode_batch,
+            input_tokens=prefill_len,
+            output_tokens=decode_tokens,
+            num_requests=decode_batch,
+            results=decode_results,
+            total_time_sec=round(elapsed, 2),
+            cache_mode="cold",
+            fixed_length=supports_fixed_length(FRAMEWORK_CONFIG[framework]),
+            interference=_itl_interference(decode_results, prefill_results),
+        )
+
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
+        sr.compute_aggregates()
+        all_results.append(sr)
+        checkpoint_point(sr, concurrency=decode_batch, input_tokens=prefill_len)
+
+        base, spike = sr.interference["baseline"], sr.interference["during_prefill"]
+        print(f"  Decode ITL baseline p50/p99: {base.get('p50_itl_ms')}/{base.get('p99_itl_ms')} ms")
+        print(f"  Decode ITL during prefill p50/p99/max: "
+              f"{spike.get('p50_itl_ms')}/{spike.get('p99_itl_ms')}/{spike.get('max_itl_ms')} ms")
+        print(f"  Spike ratio (p99 during / p50 baseline): {sr.interference.get('p99_spike_ratio')}")
+        print(f"  Prefill latency (avg): {sr.interference['avg_prefill_latency_ms']} ms")
+
+    return all_results
+
+
 async def scenario_prefix_cache(framework: str) -> list[ScenarioResult]:
     """시나리오 4: 접두사 캐시 효율성 테스트."""
     print(f"\n{'='*60}")
@@ -217,26 +531,28 @@ async def scenario_prefix_cache(framework: str) -> list[ScenarioResult]:
 
     print(f"\n--- Shared System Prompt (~2048 tokens) + {num_requests} different questions ---")
     print(f"--- Concurrency: 1 (sequential, to measure cache effect) ---")
+    done = completed_point("prefix_cache", num_requests=num_requests)
+    if done:
+        return [done]
 
     # 순차 실행으로 캐시 효과 측정
     config = FRAMEWORK_CONFIG[framework]
-    url = f"{config['base_url']}{config['chat_endpoint']}"
+    backend = get_backend(config)
+    url = backend.url(config)
 
+    tokenizer = get_tokenizer(framework)
     all_request_results = []
+    labels = {"framework": framework, "point": begin_point(), "mode": "closed", "concurrency": 1}
     start = time.perf_counter()
 
-    connector = aiohttp.TCPConnector(limit=5)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        for i, messages in enumerate(tqdm(messages_list, desc=f"{framework} prefix-cache", ncols=80)):
-            payload = {
-                "model": config["model"],
-                "messages": messages,
-                "max_tokens": output_tokens,
-                "temperature": 0,
-                "stream": True,
-            }
-            result = await send_request(session, url, payload)
+    async with open_session(5, config["base_url"], warm=1) as session:
+        for i, messages in enumerate(progress(messages_list, desc=f"{framework} prefix-cache")):
+            payload = build_payload(config, messages, output_tokens)
+            result = await send_request(session, url, payload, tokenizer, backend=backend)
+            result.index = i
+            result.max_tokens = output_tokens
             all_request_results.append(result)
+            record_result(result, **labels)
 
     elapsed = time.perf_counter() - start
 
@@ -249,12 +565,13 @@ async def scenario_prefix_cache(framework: str) -> list[ScenarioResult]:
         num_requests=num_requests,
         results=all_request_results,
         total_time_sec=round(elapsed, 2),
+        cache_mode="warm",  # 공유 접두사 재사용을 의도적으로 측정
     )
 
-    gpu = get_gpu_stats()
-    sr.gpu_memory_mb = gpu["memory_used_mb"]
-    sr.gpu_utilization_pct = gpu["gpu_utilization_pct"]
+    attach_gpu_stats(sr)
+    await attach_server_metrics(sr)
     sr.compute_aggregates()
+    checkpoint_point(sr, num_requests=num_requests)
 
     # 첫 5개 vs 나머지 TTFT 비교
     first_ttfts = [r.ttft_ms for r in all_request_results[:5] if r.success and r.ttft_ms > 0]
@@ -268,12 +585,219 @@ async def scenario_prefix_cache(framework: str) -> list[ScenarioResult]:
     if first_ttfts and later_ttfts:
         speedup = statistics.mean(first_ttfts) / statistics.mean(later_ttfts)
         print(f"  Cache speedup (first/later TTFT): {round(speedup, 2)}x")
+    hit_rate = sr.server_metrics.get("prefix_cache_hit_rate")
+    if hit_rate is not None:
+        print(f"  Server prefix cache hit rate: {round(hit_rate * 100, 1)}%")
     print(f"  Token throughput: {sr.total_token_throughput} tok/s")
     print(f"  Success rate: {sr.success_rate}%")
 
     return [sr]
 
 
+async def scenario_prefix_tree(framework: str) -> list[ScenarioResult]:
+    """시나리오 4b: 멀티 테넌트 접두사 트리 워크로드.
+
+    시스템 프롬프트 여러 개, 길어지는 멀티턴 대화, few-shot 템플릿을 Zipf 인기도로 섞어
+    동시에 보내고, TTFT를 캐시 적중 예상/콜드 요청으로 나눠 비교한다 (H1, 경합과 eviction 포함).
+    앞 레벨에서 데워진 캐시를 재사용하지 않도록 동시성 레벨마다 seed가 다른 워크로드를 쓴다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 4b] Prefix Tree Workload - {framework}")
+    print(f"{'='*60}")
+
+    concurrency_levels = [8, 32]
+    output_tokens = 128
+    num_requests = 200
+    tree = PrefixTreeConfig()
+    all_results = []
+
+    print(f"--- {tree.num_tenants} tenants, sharing {tree.sharing_ratio}, zipf s={tree.zipf_s}, max turns {tree.max_turns} ---")
+
+    for level, conc in enumerate(concurrency_levels):
+        seed = tree.seed + level
+        print(f"\n--- Concurrency: {conc}, Requests: {num_requests}, Workload seed: {seed} ---")
+        done = completed_point("prefix_tree", concurrency=conc, seed=seed)
+        if done:
+            all_results.append(done)
+            continue
+
+        workload = generate_prefix_tree_workload(num_requests, replace(tree, seed=seed), tokenizer=get_tokenizer(framework))
+        stats = workload_stats(workload)
+        print(f"  {stats['unique_prefixes']} prefixes, expected hit ratio {stats['expected_hit_ratio']}")
+
+        results, elapsed = await run_concurrent_requests(
+            framework, [w.messages for w in workload], output_tokens, concurrency=conc
+        )
+
+        sr = ScenarioResult(
+            scenario="prefix_tree",
+            framework=framework,
+            concurrency=conc,
+            input_tokens=0,
+            output_tokens=output_tokens,
+            num_requests=num_requests,
+            results=results,
+            total_time_sec=round(elapsed, 2),
+            workload={"type": "prefix_tree", "seed": seed, **stats},
+            ttft_by_cache=ttft_by_cache(results, workload),
+        )
+
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
+        sr.compute_aggregates()
+        sr.input_tokens = round(sr.avg_prompt_tokens)
+        all_results.append(sr)
+        checkpoint_point(sr, concurrency=conc, seed=seed)
+
+        hit, cold = sr.ttft_by_cache["hit_expected"], sr.ttft_by_cache["cold"]
+        print(f"  TTFT hit-expected avg/p99: {hit.get('avg_ttft_ms')}/{hit.get('p99_ttft_ms')} ms ({hit['count']} reqs)")
+        print(f"  TTFT cold avg/p99: {cold.get('avg_ttft_ms')}/{cold.get('p99_ttft_ms')} ms ({cold['count']} reqs)")
+        hit_rate = sr.server_metrics.get("prefix_cache_hit_rate")
+        if hit_rate is not None:
+            print(f"  Server prefix cache hit rate: {round(hit_rate * 100, 1)}%")
+        print(f"  Token throughput: {sr.total_token_throughput} tok/s")
+        print(f"  Success rate: {sr.success_rate}%")
+
+    return all_results
+
+
+async def scenario_multi_turn(framework: str) -> list[ScenarioResult]:
+    """시나리오 4c: 멀티턴 대화 세션 재생.
+
+    시뮬레이션 사용자들이 각자 K턴 대화를 think time을 두고 진행하며, 매 턴에 실제
+    스트리밍 응답을 대화 기록에 붙여 다음 요청에 보낸다. 턴(기록 길이)과 동시 사용자 수에
+    따라 TTFT가 어떻게 늘어나는지 본다. 레벨마다 시스템 프롬프트가 달라 캐시를 공유하지 않는다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 4c] Multi-turn Session Replay - {framework}")
+    print(f"{'='*60}")
+
+    user_levels = [4, 16]
+    num_turns = 6
+    output_tokens = 128
+    system_tokens = 512
+    think_time_sec = 1.0
+    all_results = []
+
+    for level, users in enumerate(user_levels):
+        print(f"\n--- Users: {users}, Turns: {num_turns}, Think time: {think_time_sec}s (mean) ---")
+        done = completed_point("multi_turn", users=users, turns=num_turns)
+        if done:
+            all_results.append(done)
+            continue
+
+        sessions = generate_session_workload(
+            users, num_turns, system_tokens, seed=level, tokenizer=get_tokenizer(framework)
+        )
+        results, elapsed = await run_session_requests(
+            framework, sessions, output_tokens, think_time_sec=think_time_sec, seed=level
+        )
+
+        sr = ScenarioResult(
+            scenario="multi_turn",
+            framework=framework,
+            concurrency=users,
+            input_tokens=0,
+            output_tokens=output_tokens,
+            num_requests=users * num_turns,
+            results=results,
+            total_time_sec=round(elapsed, 2),
+            workload={"type": "sessions", "users": users, "turns": num_turns,
+                      "system_tokens": system_tokens, "think_time_sec": think_time_sec},
+            ttft_by_turn=ttft_by_turn(results, num_turns),
+        )
+
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
+        sr.compute_aggregates()
+        sr.input_tokens = round(sr.avg_prompt_tokens)
+        all_results.append(sr)
+        checkpoint_point(sr, users=users, turns=num_turns)
+
+        for t in sr.ttft_by_turn["turns"]:
+            print(f"  Turn {t['turn']}: prompt ~{t['avg_prompt_tokens']} tok | TTFT avg/p99: {t['avg_ttft_ms']}/{t['p99_ttft_ms']} ms")
+        print(f"  TTFT growth: {sr.ttft_by_turn['ttft_ms_per_1k_prompt_tokens']} ms per 1k prompt tokens")
+        print(f"  Success rate: {sr.success_rate}%")
+
+    return all_results
+
+
+def build_option_workload(framework: str, num_requests: int) -> Workload:
+    """CLI 옵션의 워크로드: --dataset이 있으면 데이터셋 샘플, 없으면 길이 분포 기반 합성."""
+    tokenizer = get_tokenizer(framework)
+    if RUN_OPTIONS["dataset_path"]:
+        return sample_dataset_workload(RUN_OPTIONS["dataset_path"], num_requests, tokenizer=tokenizer)
+    return generate_synthetic_workload(
+        num_requests,
+        parse_length_distribution(RUN_OPTIONS["input_len_dist"]),
+        parse_length_distribution(RUN_OPTIONS["output_len_dist"]),
+        tokenizer=tokenizer,
+    )
+
+
+async def scenario_workload(framework: str, workload: Workload | None = None) -> list[ScenarioResult]:
+    """시나리오 4d: 데이터셋/길이 분포 워크로드.
+
+    요청마다 내용과 입력/출력 길이가 다른 워크로드를 동시성 레벨별로 실행한다.
+    workload를 주지 않으면 --dataset 또는 --input-len-dist/--output-len-dist로 만든다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 4d] Dataset / Length-distribution Workload - {framework}")
+    print(f"{'='*60}")
+
+    concurrency_levels = [8, 32]
+    num_requests = 200
+    default_output_tokens = 256
+    all_results = []
+
+    workload = workload or build_option_workload(framework, num_requests)
+    stats = workload.stats()
+    print(f"--- Workload: {workload.name}, {len(workload.requests)} requests ---")
+    for key in ("input_tokens", "max_tokens"):
+        if key in stats:
+            print(f"  {key}: mean {stats[key]['mean']}, p50 {stats[key]['p50']}, p90 {stats[key]['p90']}, max {stats[key]['max']}")
+    max_tokens = workload.max_tokens_list(default_output_tokens)
+    point_id = {"workload": workload.name, "seed": workload.description.get("seed", 0)}
+
+    for conc in concurrency_levels:
+        print(f"\n--- Concurrency: {conc}, Requests: {len(workload.requests)} ---")
+        done = completed_point("workload", concurrency=conc, **point_id)
+        if done:
+            all_results.append(done)
+            continue
+
+        results, elapsed = await run_concurrent_requests(
+            framework, workload.messages_list, max_tokens, concurrency=conc
+        )
+
+        sr = ScenarioResult(
+            scenario="workload",
+            framework=framework,
+            concurrency=conc,
+            input_tokens=0,
+            output_tokens=round(sum(max_tokens) / len(max_tokens)),
+            num_requests=len(workload.requests),
+            results=results,
+            total_time_sec=round(elapsed, 2),
+            workload=stats,
+        )
+
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
+        sr.compute_aggregates()
+        sr.input_tokens = round(sr.avg_prompt_tokens)
+        all_results.append(sr)
+        checkpoint_point(sr, concurrency=conc, **point_id)
+
+        print(f"  Request throughput: {sr.request_throughput} req/s")
+        print(f"  Token throughput: {sr.total_token_throughput} tok/s")
+        print(f"  TTFT p50/p99: {sr.p50_ttft_ms}/{sr.p99_ttft_ms} ms")
+        print(f"  TPOT p50/p99: {sr.p50_tpot_ms}/{sr.p99_tpot_ms} ms")
+        print(f"  Success rate: {sr.success_rate}%")
+
+    return all_results
+
+
 async def scenario_korean(framework: str, warmup: int = 3) -> list[ScenarioResult]:
     """시나리오 5: 한국어 성능 테스트.
 
@@ -286,14 +810,15 @@ async def scenario_korean(framework: str, warmup: int = 3) -> list[ScenarioResul
     output_tokens = 256
     num_requests = 10
     concurrency_levels = [1, 8]
+    tokenizer = get_tokenizer(framework)
     all_results = []
 
     prompt_pairs = [
         ("short_question", KOREAN_PROMPTS["short_question"], ENGLISH_CONTRAST_PROMPTS["short_question"]),
         ("essay", KOREAN_PROMPTS["essay"], ENGLISH_CONTRAST_PROMPTS["essay"]),
         ("technical", KOREAN_PROMPTS["technical"], ENGLISH_CONTRAST_PROMPTS["technical"]),
-        ("long_summarize_ko", KOREAN_PROMPTS["summarize_prefix"] + generate_prompt(512, lang="ko"), None),
-        ("long_summarize_en", ENGLISH_CONTRAST_PROMPTS["summarize_prefix"] + generate_prompt(512, lang="en"), None),
+        ("long_summarize_ko", KOREAN_PROMPTS["summarize_prefix"] + generate_prompt(512, lang="ko", tokenizer=tokenizer), None),
+        ("long_summarize_en", ENGLISH_CONTRAST_PROMPTS["summarize_prefix"] + generate_prompt(512, lang="en", tokenizer=tokenizer), None),
     ]
 
     for conc in concurrency_levels:
@@ -303,47 +828,56 @@ async def scenario_korean(framework: str, warmup: int = 3) -> list[ScenarioResul
             if prompt_text:
                 label = f"korean_{prompt_name}" if lang == "ko" else f"english_{prompt_name}"
                 print(f"\n--- {label}, Concurrency: {conc} ---")
-
-                messages = [{"role": "user", "content": prompt_text}]
-                messages_list = [messages] * (warmup + num_requests) if conc == 1 else [messages] * num_requests
-
-                results, elapsed = await run_concurrent_requests(
-                    framework, messages_list, output_tokens, concurrency=conc
-                )
-
-                if conc == 1:
-                    results = results[warmup:]
-
-                sr = ScenarioResult(
-                    scenario=f"korean_{label}",
-                    framework=framework,
-                    concurrency=conc,
-                    input_tokens=0,  # 실제 토큰 수는 모델마다 다름
-                    output_tokens=output_tokens,
-                    num_requests=num_requests,
-                    results=results,
-                    total_time_sec=round(elapsed, 2),
-                )
-
-                gpu = get_gpu_stats()
-                sr.gpu_memory_mb = gpu["memory_used_mb"]
-                sr.gpu_utilization_pct = gpu["gpu_utilization_pct"]
-                sr.compute_aggregates()
-                all_results.append(sr)
-
-                print(f"  TTFT (avg): {sr.avg_ttft_ms} ms")
-                print(f"  Throughput: {sr.total_token_throughput} tok/s")
-                print(f"  Latency p50/p95/p99: {sr.p50_latency_ms}/{sr.p95_latency_ms}/{sr.p99_latency_ms} ms")
-                print(f"  Avg tokens generated: {sum(r.tokens_generated for r in results if r.success) / max(len([r for r in results if r.success]), 1):.0f}")
-                print(f"  Success rate: {sr.success_rate}%")
+                done = completed_point(f"korean_{label}", concurrency=conc, cache_mode=RUN_OPTIONS["cache_mode"])
+                if done:
+                    all_results.append(done)
+                else:
+                    messages = [{"role": "user", "content": prompt_text}]
+                    messages_list = repeat_prompt(messages, warmup + num_requests if conc == 1 else num_requests)
+
+                    results, elapsed = await run_concurrent_requests(
+                        framework, messages_list, output_tokens, concurrency=conc
+                    )
+
+                    if conc == 1:
+                        results = results[warmup:]
+
+                    sr = ScenarioResult(
+                        scenario=f"korean_{label}",
+                        framework=framework,
+                        concurrency=conc,
+                        input_tokens=0,  # 실제 토큰 수는 모델마다 다름 -> 집계 후 실측값으로 채움
+                        output_tokens=output_tokens,
+                        num_requests=num_requests,
+                        results=results,
+                        total_time_sec=round(elapsed, 2),
+                        cache_mode=RUN_OPTIONS["cache_mode"],
+                    )
+
+                    attach_gpu_stats(sr)
+                    await attach_server_metrics(sr)
+                    sr.compute_aggregates()
+                    sr.input_tokens = round(sr.avg_prompt_tokens)
+                    all_results.append(sr)
+                    checkpoint_point(sr, concurrency=conc, cache_mode=sr.cache_mode)
+
+                    print(f"  TTFT (avg): {sr.avg_ttft_ms} ms")
+                    print(f"  Throughput: {sr.total_token_throughput} tok/s")
+                    print(f"  Latency p50/p95/p99: {sr.p50_latency_ms}/{sr.p95_latency_ms}/{sr.p99_latency_ms} ms")
+                    print(f"  Avg tokens generated: {sum(r.tokens_generated for r in results if r.success) / max(len([r for r in results if r.success]), 1):.0f}")
+                    print(f"  Success rate: {sr.success_rate}%")
 
             # 영어 대조 프롬프트 테스트 (contrast_text가 있을 때만)
             if contrast_text and conc == 1:
                 label_en = f"english_contrast_{prompt_name}"
                 print(f"\n--- {label_en}, Concurrency: {conc} ---")
+                done = completed_point(f"korean_{label_en}", concurrency=1, cache_mode=RUN_OPTIONS["cache_mode"])
+                if done:
+                    all_results.append(done)
+                    continue
 
                 messages_en = [{"role": "user", "content": contrast_text}]
-                messages_list_en = [messages_en] * (warmup + num_requests)
+                messages_list_en = repeat_prompt(messages_en, warmup + num_requests)
 
                 results_en, elapsed_en = await run_concurrent_requests(
                     framework, messages_list_en, output_tokens, concurrency=1
@@ -359,13 +893,15 @@ async def scenario_korean(framework: str, warmup: int = 3) -> list[ScenarioResul
                     num_requests=num_requests,
                     results=results_en,
                     total_time_sec=round(elapsed_en, 2),
+                    cache_mode=RUN_OPTIONS["cache_mode"],
                 )
 
-                gpu_en = get_gpu_stats()
-                sr_en.gpu_memory_mb = gpu_en["memory_used_mb"]
-                sr_en.gpu_utilization_pct = gpu_en["gpu_utilization_pct"]
+                attach_gpu_stats(sr_en)
+                await attach_server_metrics(sr_en)
                 sr_en.compute_aggregates()
+                sr_en.input_tokens = round(sr_en.avg_prompt_tokens)
                 all_results.append(sr_en)
+                checkpoint_point(sr_en, concurrency=1, cache_mode=sr_en.cache_mode)
 
                 print(f"  TTFT (avg): {sr_en.avg_ttft_ms} ms")
                 print(f"  Throughput: {sr_en.total_token_throughput} tok/s")
@@ -377,7 +913,7 @@ async def scenario_korean(framework: str, warmup: int = 3) -> list[ScenarioResul
     print(f"{'='*60}")
     for sr in all_results:
         print(
-            f"  [{sr.scenario}] conc={sr.concurrency} "
+            f"  [{sr.scenario}] conc={sr.concurrency} in={sr.input_tokens} "
             f"| TTFT={sr.avg_ttft_ms}ms | throughput={sr.total_token_throughput}tok/s "
             f"| p99={sr.p99_latency_ms}ms | success={sr.success_rate}%"
         )
@@ -385,10 +921,332 @@ async def scenario_korean(framework: str, warmup: int = 3) -> list[ScenarioResul
     return all_results
 
 
+async def scenario_rate_sweep(framework: str) -> list[ScenarioResult]:
+    """시나리오 6: 오픈 루프 요청률 스윕.
+
+    목표 도착률(req/s)을 단계적으로 올리며 요청을 응답과 무관하게 전송하고,
+    p99 TTFT 또는 성공률 SLO가 깨지는 지점에서 중단한다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 6] Open-loop Rate Sweep - {framework}")
+    print(f"{'='*60}")
+
+    input_tokens = 512
+    output_tokens = 256
+    pattern = RUN_OPTIONS["arrival"]
+    all_results = []
+
+    prompt = generate_prompt(input_tokens, tokenizer=get_tokenizer(framework))
+    messages = [
+        {"role": "user", "content": prompt + "\nSummarize the key points about modern AI systems."}
+    ]
+
+    print(f"--- Arrival: {pattern}, SLO: p99 TTFT <= {SLO_P99_TTFT_MS} ms, success >= {SLO_MIN_SUCCESS_RATE}% ---")
+
+    max_sustained_rate = 0
+    for rate in RATE_SWEEP_RATES:
+        num_requests = max(RATE_SWEEP_MIN_REQUESTS, int(rate * RATE_SWEEP_DURATION_SEC))
+        print(f"\n--- Offered rate: {rate} req/s, Requests: {num_requests} ---")
+        sr = completed_point("rate_sweep", arrival=pattern, rate=rate, cache_mode=RUN_OPTIONS["cache_mode"])
+        if sr:
+            all_results.append(sr)
+            if not sr.slo_met:
+                break
+            max_sustained_rate = rate
+            continue
+        schedule = build_schedule(pattern, rate, num_requests, trace_path=RUN_OPTIONS["trace_path"])
+        messages_list = repeat_prompt(messages, len(schedule))
+
+        results, elapsed = await run_open_loop_requests(
+            framework, messages_list, output_tokens, schedule
+        )
+
+        sr = ScenarioResult(
+            scenario="rate_sweep",
+            framework=framework,
+            concurrency=0,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            num_requests=len(schedule),
+            results=results,
+            total_time_sec=round(elapsed, 2),
+            cache_mode=RUN_OPTIONS["cache_mode"],
+            arrival_pattern=pattern,
+            offered_rate_rps=rate,
+        )
+
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
+        sr.compute_aggregates()
+        sr.slo_met = bool(
+            sr.success_rate >= SLO_MIN_SUCCESS_RATE
+            and 0 < sr.p99_ttft_ms <= SLO_P99_TTFT_MS
+        )
+        all_results.append(sr)
+        checkpoint_point(sr, arrival=pattern, rate=rate, cache_mode=sr.cache_mode)
+
+        print(f"  Achieved: {sr.request_throughput} req/s, {sr.total_token_throughput} tok/s")
+        print(f"  TTFT p50/p99: {sr.p50_ttft_ms}/{sr.p99_ttft_ms} ms")
+        print(f"  Send lag avg/p99: {sr.avg_send_lag_ms}/{sr.p99_send_lag_ms} ms")
+        print(f"  Success rate: {sr.success_rate}% | SLO met: {sr.slo_met}")
+
+        if not sr.slo_met:
+            break
+        max_sustained_rate = rate
+
+    print(f"\n  Max sustained rate within SLO: {max_sustained_rate} req/s")
+
+    return all_results
+
+
+def _slo_violation_stop(num_requests: int):
+    """남은 요청이 모두 SLO를 만족해도 목표 충족률에 도달할 수 없으면 True를 반환하는 조건."""
+    allowed = int(num_requests * (1 - SLO_ATTAINMENT_PCT / 100))
+    state = {"checked": 0, "violations": 0}
+
+    def stop(results):
+        for r in results[state["checked"]:]:
+            if not meets_slo(r):
+                state["violations"] += 1
+        state["checked"] = len(results)
+        return state["violations"] > allowed
+
+    return stop
+
+
+async def scenario_goodput(framework: str) -> list[ScenarioResult]:
+    """시나리오 7: SLO 기반 최대 goodput 탐색.
+
+    동시성(또는 요청률)을 2배씩 올려 SLO 충족률이 목표 아래로 떨어지는 구간을 찾은 뒤
+    이진 탐색으로 좁힌다. 명백히 실패한 probe는 조기 중단하며, 전체 탐색 경로를
+    결과 JSON에 남겨 용량 산정 수치를 재현할 수 있게 한다.
+    """
+    mode = RUN_OPTIONS["goodput_search"]
+    print(f"\n{'='*60}")
+    print(f"[Scenario 7] Goodput Search ({mode}) - {framework} ({FRAMEWORK_CONFIG[framework]['model']})")
+    print(f"{'='*60}")
+
+    input_tokens = 512
+    output_tokens = 256
+    max_level = 256 if mode == "concurrency" else 64
+    min_requests = 32
+    requests_per_slot = 4  # concurrency 모드: 동시성 1당 요청 수
+    duration_sec = 20      # rate 모드: probe당 분량
+    pattern = RUN_OPTIONS["arrival"]
+
+    prompt = generate_prompt(input_tokens, tokenizer=get_tokenizer(framework))
+    messages = [
+        {"role": "user", "content": prompt + "\nSummarize the key points about modern AI systems."}
+    ]
+
+    print(
+        f"--- SLO: TTFT <= {SLO_P99_TTFT_MS} ms, ITL <= {SLO_ITL_MS} ms, "
+        f"attainment >= {SLO_ATTAINMENT_PCT}% ---"
+    )
+    # 탐색 경로는 이전 probe 결과에 의존하므로 탐색 전체를 하나의 포인트로 체크포인트
+    point = {"mode": mode, "arrival": pattern if mode == "rate" else "", "cache_mode": RUN_OPTIONS["cache_mode"]}
+    done = completed_point("goodput", **point)
+    if done:
+        return [done]
+
+    trajectory = []
+
+    async def probe(level):
+        if mode == "rate":
+            num_requests = max(min_requests, int(level * duration_sec))
+            schedule = build_schedule(pattern, level, num_requests, trace_path=RUN_OPTIONS["trace_path"])
+            num_requests = len(schedule)
+            print(f"\n--- Probe: {level} req/s, Requests: {num_requests} ---")
+            results, elapsed = await run_open_loop_requests(
+                framework, repeat_prompt(messages, num_requests), output_tokens, schedule,
+                stop_condition=_slo_violation_stop(num_requests),
+            )
+        else:
+            num_requests = max(min_requests, level * requests_per_slot)
+            print(f"\n--- Probe: concurrency {level}, Requests: {num_requests} ---")
+            results, elapsed = await run_concurrent_requests(
+                framework, repeat_prompt(messages, num_requests), output_tokens, concurrency=level,
+                stop_condition=_slo_violation_stop(num_requests),
+            )
+
+        sr = ScenarioResult(
+            scenario="goodput",
+            framework=framework,
+            concurrency=level if mode == "concurrency" else 0,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            num_requests=num_requests,
+            results=results,
+            total_time_sec=round(elapsed, 2),
+            cache_mode=RUN_OPTIONS["cache_mode"],
+            arrival_pattern=pattern if mode == "rate" else "",
+            offered_rate_rps=level if mode == "rate" else 0.0,
+        )
+        attach_gpu_stats(sr)
+        await attach_server_metrics(sr)
+        sr.compute_aggregates()
+        aborted = len(results) < num_requests
+        sr.slo_met = bool(not aborted and sr.slo_attainment_pct >= SLO_ATTAINMENT_PCT)
+        trajectory.append({
+            "level": level,
+            "num_requests": num_requests,
+            "completed": len(results),
+            "aborted": aborted,
+            "slo_attainment_pct": sr.slo_attainment_pct,
+            "goodput_rps": sr.goodput_rps,
+            "request_throughput": sr.request_throughput,
+            "p99_ttft_ms": sr.p99_ttft_ms,
+            "passed": sr.slo_met,
+        })
+        print(
+            f"  Attainment: {sr.slo_attainment_pct}% | Goodput: {sr.goodput_rps} req/s "
+            f"| {'PASS' if sr.slo_met else 'FAIL'}{' (aborted early)' if aborted else ''}"
+        )
+        return sr
+
+    def converged(lo, hi):
+        if mode == "rate":
+            return hi - lo <= max(0.5, lo * 0.1)
+        return hi - lo <= max(1, lo // 8)
+
+    # 1단계: 2배씩 증가시키며 실패 구간 탐색
+    best, lo, hi = None, 0, None
+    level = 1
+    while level <= max_level:
+        sr = await probe(level)
+        if not sr.slo_met:
+            hi = level
+            break
+        if best is None or sr.goodput_rps >= best.goodput_rps:
+            best = sr
+        lo = level
+        level *= 2
+
+    # 2단계: 마지막 통과(lo)와 첫 실패(hi) 사이 이진 탐색
+    while best is not None and hi is not None and not converged(lo, hi):
+        mid = (lo + hi) / 2 if mode == "rate" else (lo + hi) // 2
+        sr = await probe(mid)
+        if sr.slo_met:
+            lo = mid
+            if sr.goodput_rps >= best.goodput_rps:
+                best = sr
+        else:
+            hi = mid
+
+    result = best or sr
+    result.goodput_search = {
+        "mode": mode,
+        "slo": {
+            "ttft_ms": SLO_P99_TTFT_MS,
+            "itl_ms": SLO_ITL_MS,
+            "attainment_pct": SLO_ATTAINMENT_PCT,
+        },
+        "max_passing_level": lo,
+        "first_failing_level": hi,
+        "max_goodput_rps": best.goodput_rps if best else 0.0,
+        "trajectory": trajectory,
+    }
+
+    checkpoint_point(result, **point)
+
+    unit = "req/s" if mode == "rate" else "concurrent"
+    print(f"\n  Max level within SLO: {lo} {unit}")
+    print(f"  Max goodput: {result.goodput_search['max_goodput_rps']} req/s")
+
+    return [result]
+
+
+async def scenario_soak(framework: str) -> list[ScenarioResult]:
+    """시나리오 8: 장시간 soak 테스트.
+
+    요청 수가 아니라 시간(--soak-duration) 동안 고정 동시성 부하를 유지하며 구간별
+    처리량/TTFT/오류율/GPU 메모리를 기록하고, 추세 검정으로 단조적인 성능 저하를 찾는다.
+    결과는 스트리밍 집계로만 남기므로 몇 시간을 돌려도 클라이언트 메모리가 일정하다.
+    """
+    print(f"\n{'='*60}")
+    print(f"[Scenario 8] Soak Test - {framework}")
+    print(f"{'='*60}")
+
+    input_tokens = 512
+    output_tokens = 256
+    duration_sec = RUN_OPTIONS["soak_duration_sec"]
+    concurrency = RUN_OPTIONS["soak_concurrency"]
+    window_sec = RUN_OPTIONS["soak_window_sec"]
+    stop_error_pct = RUN_OPTIONS["soak_stop_error_pct"]
+
+    point = {"duration_sec": duration_sec, "concurrency": concurrency, "cache_mode": RUN_OPTIONS["cache_mode"]}
+    done = completed_point("soak", **point)
+    if done:
+        return [done]
+
+    prompt = generate_prompt(input_tokens, tokenizer=get_tokenizer(framework))
+    messages = [
+        {"role": "user", "content": prompt + "\nSummarize the key points about modern AI systems."}
+    ]
+
+    print(f"--- Duration: {duration_sec:.0f}s, Concurrency: {concurrency}, Window: {window_sec:.0f}s"
+          + (f", stop at window error rate >= {stop_error_pct}%" if stop_error_pct > 0 else "") + " ---")
+
+    aggregator = StreamingAggregator(window_sec=window_sec, slo=meets_slo)
+    elapsed, stop_reason = await run_soak_requests(
+        framework, messages, output_tokens, concurrency, duration_sec, aggregator, stop_error_pct,
+        num_workers=RUN_OPTIONS["workers"],
+    )
+
+    sr = ScenarioResult(
+        scenario="soak",
+        framework=framework,
+        concurrency=concurrency,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        num_requests=aggregator.requests,
+        total_time_sec=round(elapsed, 2),
+        cache_mode=RUN_OPTIONS["cache_mode"],
+    )
+    attach_gpu_stats(sr)
+    await attach_server_metrics(sr)
+    sr.compute_from_aggregator(aggregator)
+    sr.soak = {
+        "duration_sec": duration_sec,
+        "window_sec": aggregator.window_sec,
+        "stopped_early": bool(stop_reason),
+        "stop_reason": stop_reason,
+        **analyze_windows(sr.windows, elapsed),
+    }
+    checkpoint_point(sr, **point)
+
+    print(f"  Requests: {sr.num_requests} in {sr.total_time_sec}s | success={sr.success_rate:.2f}%")
+    print(f"  Token throughput: {sr.total_token_throughput} tok/s | TTFT p50/p99: {sr.p50_ttft_ms}/{sr.p99_ttft_ms} ms")
+    if stop_reason:
+        print(f"  STOPPED EARLY: {stop_reason}")
+    if sr.soak["windows_analyzed"] < sr.soak["min_windows"]:
+        print(f"  Trend test skipped: {sr.soak['windows_analyzed']} complete windows (need {sr.soak['min_windows']})")
+    for metric, test in sr.soak["trends"].items():
+        if test["trend"] != "none":
+            print(f"  Trend {metric}: {test['trend']} ({test['sen_slope_per_hour']}/h, p={test['p_value']})"
+                  + (" DEGRADED" if test["degraded"] else ""))
+    if sr.soak["error_bursts"]:
+        print(f"  Error bursts: {len(sr.soak['error_bursts'])} window(s) above {SOAK_ERROR_BURST_PCT}%")
+
+    return [sr]
+
+
+# all에 포함하지 않는 시나리오 (--scenario로 직접 지정해야 실행)
+OPT_IN_SCENARIOS = {"soak"}
+
 SCENARIOS = {
     "single": scenario_single_request,
     "concurrent": scenario_concurrent_load,
     "long_context": scenario_long_context,
+    "prefill_heavy": scenario_prefill_heavy,
+    "decode_heavy": scenario_decode_heavy,
+    "interference": scenario_interference,
     "prefix_cache": scenario_prefix_cache,
+    "prefix_tree": scenario_prefix_tree,
+    "multi_turn": scenario_multi_turn,
+    "workload": scenario_workload,
     "korean": scenario_korean,
+    "rate_sweep": scenario_rate_sweep,
+    "goodput": scenario_goodput,
+    "soak": scenario_soak,
 }
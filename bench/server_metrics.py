@@ -0,0 +1,201 @@
+"""실행 중 서버 Prometheus 메트릭(/metrics) 수집과 포인트별 상관 분석.
+
+vLLM/SGLang이 노출하는 큐 깊이, running/waiting 요청 수, KV 캐시 사용률,
+prefix cache 적중 카운터를 일정 간격으로 가져와 링 버퍼에 쌓고, 파라미터 포인트가
+끝나면 그 구간의 gauge 시계열과 counter 증가량을 ScenarioResult.server_metrics에 붙인다.
+응답은 줄 단위로 읽으면서 관심 있는 메트릭 이름만 파싱하므로 히스토그램 버킷
+수백 줄은 디코딩하지 않고 건너뛴다.
+"""
+
+import asyncio
+import contextvars
+import math
+import time
+from collections import deque
+
+import aiohttp
+
+from .config import METRICS_SCRAPE_INTERVAL_SEC, SERIES_MAX_POINTS
+from .transport import make_connector
+
+# 공통 이름 -> 프레임워크별 Prometheus 메트릭 이름 (버전마다 이름이 바뀐 것 포함)
+GAUGES = {
+    "running": [b"vllm:num_requests_running", b"sglang:num_running_reqs"],
+    "waiting": [b"vllm:num_requests_waiting", b"sglang:num_queue_reqs"],
+    "kv_cache_usage": [b"vllm:kv_cache_usage_perc", b"vllm:gpu_cache_usage_perc", b"sglang:token_usage"],
+    "cache_hit_rate": [b"sglang:cache_hit_rate", b"vllm:gpu_prefix_cache_hit_rate"],
+}
+COUNTERS = {
+    "prompt_tokens": [b"vllm:prompt_tokens_total", b"sglang:prompt_tokens_total"],
+    "generation_tokens": [b"vllm:generation_tokens_total", b"sglang:generation_tokens_total"],
+    "prefix_cache_queries": [b"vllm:prefix_cache_queries_total", b"vllm:gpu_prefix_cache_queries_total"],
+    "prefix_cache_hits": [b"vllm:prefix_cache_hits_total", b"vllm:gpu_prefix_cache_hits_total"],
+    "cached_tokens": [b"sglang:cached_tokens_total"],
+}
+# 비율 gauge는 레이블(엔진)별 값을 합산하지 않고 최댓값 사용
+_RATIO_GAUGES = {"kv_cache_usage", "cache_hit_rate"}
+
+_LOOKUP = {name: key for table in (GAUGES, COUNTERS) for key, names in table.items() for name in names}
+
+_CAPACITY = 7200  # 1초 간격 기준 2시간
+
+# 다중 프레임워크 실행에서는 프레임워크 태스크마다 따로 설정된다
+_scraper: contextvars.ContextVar = contextvars.ContextVar("scraper", default=None)
+
+
+def parse_metric_line(line: bytes, lookup: dict = _LOOKUP) -> tuple[str, float] | None:
+    """Prometheus 텍스트 한 줄 -> (공통 이름, 값). 관심 없는 메트릭/주석이면 None."""
+    if not line or line[:1] == b"#":
+        return None
+    brace = line.find(b"{")
+    space = line.find(b" ")
+    if brace < 0 or 0 <= space < brace:
+        name, rest = line[:space], line[space + 1:]
+    else:
+        name, rest = line[:brace], line[line.rfind(b"}") + 1:]
+    key = lookup.get(name)
+    if key is None:
+        return None
+    try:
+        return key, float(rest.split()[0])
+    except (IndexError, ValueError):
+        return None
+
+
+class MetricsScraper:
+    """interval마다 /metrics를 가져와 (monotonic 시각, {공통 이름: 값})을 링 버퍼에 저장."""
+
+    def __init__(self, url: str, interval: float = METRICS_SCRAPE_INTERVAL_SEC, capacity: int = _CAPACITY):
+        self.url = url
+        self.interval = interval
+        self.samples: deque[tuple[float, dict]] = deque(maxlen=capacity)
+        self.errors = 0
+        self._session = None
+        self._task = None
+
+    async def scrape(self) -> dict | None:
+        """한 번 수집해 버퍼에 추가. 실패하면 None."""
+        values = {}
+        try:
+            async with self._session.get(self.url) as resp:
+                if resp.status != 200:
+                    self.errors += 1
+                    return None
+                async for line in resp.content:
+                    parsed = parse_metric_line(line.rstrip())
+                    if parsed is None:
+                        continue
+                    key, value = parsed
+                    if key in _RATIO_GAUGES:
+                        values[key] = max(values.get(key, value), value)
+                    else:
+                        values[key] = values.get(key, 0.0) + value
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.errors += 1
+            return None
+        self.samples.append((time.monotonic(), values))
+        return values
+
+    async def start(self) -> bool:
+        """첫 수집이 성공하면 백그라운드 수집을 시작하고 True."""
+        self._session = aiohttp.ClientSession(
+            connector=make_connector(limit=1), timeout=aiohttp.ClientTimeout(total=max(self.interval, 5))
+        )
+        first = await self.scrape()
+        if not first:
+            await self._session.close()
+            return False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def _run(self):
+        next_tick = time.monotonic()
+        while True:
+            next_tick += self.interval
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            await self.scrape()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._session is not None:
+            await self._session.close()
+
+    def summarize(self, start: float, end: float, max_points: int = SERIES_MAX_POINTS) -> dict | None:
+        """[start, end] 구간의 gauge 평균/최대/시계열과 counter 증가량.
+
+        counter 증가량은 구간 시작 직전 샘플을 기준으로 계산한다.
+        """
+        samples = list(self.samples)
+        window = [s for s in samples if start <= s[0] <= end]
+        if not window:
+            return None
+        before = [s for s in samples if s[0] < start]
+        baseline = before[-1][1] if before else window[0][1]
+        last = window[-1][1]
+
+        summary = {"num_samples": len(window), "gauges": {}, "counters": {}}
+        for key in GAUGES:
+            values = [s[1][key] for s in window if key in s[1]]
+            if values:
+                summary["gauges"][key] = {
+                    "mean": round(sum(values) / len(values), 4),
+                    "max": round(max(values), 4),
+                }
+        for key in COUNTERS:
+            if key in last and key in baseline and last[key] >= baseline[key]:
+                summary["counters"][key] = round(last[key] - baseline[key], 2)
+
+        counters = summary["counters"]
+        hit_rate = None
+        if counters.get("prefix_cache_queries"):
+            hit_rate = counters.get("prefix_cache_hits", 0.0) / counters["prefix_cache_queries"]
+        elif counters.get("prompt_tokens") and "cached_tokens" in counters:
+            hit_rate = counters["cached_tokens"] / counters["prompt_tokens"]
+        elif "cache_hit_rate" in summary["gauges"]:
+            hit_rate = summary["gauges"]["cache_hit_rate"]["mean"]
+        summary["prefix_cache_hit_rate"] = round(hit_rate, 4) if hit_rate is not None else None
+
+        step = max(1, math.ceil(len(window) / max_points))
+        series = window[::step]
+        summary["series"] = {"t_sec": [round(s[0] - start, 3) for s in series]}
+        for key in GAUGES:
+            if key in summary["gauges"]:
+                summary["series"][key] = [s[1].get(key) for s in series]
+        return summary
+
+
+async def start_scraper(config: dict) -> MetricsScraper | None:
+    """프레임워크 설정의 metrics_path로 수집 시작. 엔드포인트가 없거나 응답이 없으면 None."""
+    path = config.get("metrics_path")
+    if not path:
+        return None
+    scraper = MetricsScraper(f"{config['base_url']}{path}")
+    return scraper if await scraper.start() else None
+
+
+def set_scraper(scraper: MetricsScraper | None):
+    _scraper.set(scraper)
+
+
+def get_scraper() -> MetricsScraper | None:
+    return _scraper.get()
+
+
+async def attach_server_metrics(sr):
+    """포인트 실행 구간(끝 시각 기준 total_time_sec 동안)의 서버 메트릭을 sr에 기록.
+
+    포인트 종료 직후 한 번 더 수집해 counter 증가량이 구간 끝까지 반영되게 한다.
+    """
+    scraper = _scraper.get()
+    if scraper is None:
+        return
+    end = time.monotonic()
+    await scraper.scrape()
+    summary = scraper.summarize(end - sr.total_time_sec, time.monotonic())
+    if summary is not None:
+        sr.server_metrics = summary
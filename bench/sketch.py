@@ -0,0 +1,352 @@
+"""병합 가능한 분위수 스케치와 스트리밍 집계.
+
+compute_aggregates는 모든 RequestResult를 리스트로 들고 지표마다 np.percentile을 다시
+계산하므로 수백만 요청의 장시간 실행에는 맞지 않는다. 여기서는 결과가 도착하는 즉시
+DDSketch(상대 오차 보장 로그 버킷 히스토그램)를 갱신하고 요청 객체는 버린다.
+
+- DDSketch: 값 v를 ceil(log_gamma(v)) 버킷에 세며, 모든 분위수를 상대 오차 alpha 이내로
+  돌려준다. 버킷 수가 max_bins를 넘으면 가장 낮은 버킷끼리 합쳐 메모리 상한을 지킨다
+  (꼬리 분위수 정확도는 유지). 같은 alpha의 스케치는 버킷 카운트를 더해 병합한다.
+- StreamingAggregator: ScenarioResult와 같은 TTFT/레이턴시/TPOT/ITL 분위수, 처리량,
+  성공률, goodput 필드를 채우고, 완료 시각 기준 window_sec 구간별 분위수도 유지한다.
+  구간 수가 max_windows를 넘으면 인접 구간을 둘씩 합치고 구간 길이를 두 배로 늘린다.
+  observe()로 구간마다 GPU 메모리 같은 자원 지표의 최댓값도 함께 기록할 수 있다.
+  따로 모은 집계(다른 프로세스, 다른 실행)는 merge()로 합친다 (pickle 가능).
+"""
+
+import math
+
+import numpy as np
+
+from .config import (
+    ITL_STALL_THRESHOLD_MS,
+    SKETCH_MAX_BINS,
+    SKETCH_MAX_WINDOWS,
+    SKETCH_RELATIVE_ACCURACY,
+    SKETCH_WINDOW_SEC,
+)
+
+_MIN_VALUE = 1e-6  # 이보다 작은 값(0 포함)은 zero 버킷
+
+
+class DDSketch:
+    """상대 오차 relative_accuracy의 분위수 스케치 (양수 값, ms 단위 지연 등)."""
+
+    __slots__ = ("relative_accuracy", "max_bins", "_log_gamma", "bins", "zeros", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY, max_bins: int = SKETCH_MAX_BINS):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(gamma)
+        self.bins: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < _MIN_VALUE:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def add_many(self, values: np.ndarray):
+        """값 배열을 한 번에 추가 (버킷 인덱스를 벡터로 계산)."""
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        positive = values[values >= _MIN_VALUE]
+        self.zeros += int(values.size - positive.size)
+        if positive.size:
+            keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True)
+            bins = self.bins
+            for key, n in zip(keys.tolist(), counts.tolist()):
+                bins[key] = bins.get(key, 0) + n
+            if len(bins) > self.max_bins:
+                self._collapse()
+
+    def _collapse(self):
+        """가장 낮은 버킷들을 하나로 합쳐 버킷 수를 max_bins로 맞춘다."""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        self.bins[target] += sum(self.bins.pop(k) for k in keys[:excess])
+
+    def merge(self, other: "DDSketch"):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """q(0~1) 분위수. 빈 스케치면 0."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: list[float]) -> list[float]:
+        """여러 분위수를 버킷 한 번 순회로 계산."""
+        if not self.count:
+            return [0.0] * len(qs)
+        gamma = math.exp(self._log_gamma)
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        out = [self.max] * len(qs)
+        k = 0
+        seen = self.zeros
+        while k < len(order) and qs[order[k]] * (self.count - 1) < seen:
+            out[order[k]] = min(max(0.0, self.min), self.max)
+            k += 1
+        for key in sorted(self.bins):
+            if k == len(order):
+                break
+            seen += self.bins[key]
+            # 버킷 (gamma^(k-1), gamma^k]의 대표값, 실제 관측 범위로 자름
+            value = min(max(2 * gamma ** key / (gamma + 1), self.min), self.max)
+            while k < len(order) and qs[order[k]] * (self.count - 1) < seen:
+                out[order[k]] = value
+                k += 1
+        return out
+
+
+class _Window:
+    """한 시간 구간의 스케치와 카운터, 구간 중 관측한 자원 지표 최댓값(peaks)."""
+
+    __slots__ = ("ttft", "latency", "itl", "requests", "successes", "tokens", "peaks")
+
+    def __init__(self):
+        self.ttft = DDSketch()
+        self.latency = DDSketch()
+        self.itl = DDSketch()
+        self.requests = 0
+        self.successes = 0
+        self.tokens = 0
+        self.peaks: dict[str, float] = {}
+
+    def merge(self, other: "_Window"):
+        self.ttft.merge(other.ttft)
+        self.latency.merge(other.latency)
+        self.itl.merge(other.itl)
+        self.requests += other.requests
+        self.successes += other.successes
+        self.tokens += other.tokens
+        for name, value in other.peaks.items():
+            self.peaks[name] = max(self.peaks.get(name, value), value)
+
+
+def _round(v: float) -> float:
+    return round(float(v), 2)
+
+
+class StreamingAggregator:
+    """RequestResult 스트림의 상수 메모리 집계.
+
+    결과의 start_offset_ms는 같은 실행 기준 시각이어야 한다 (러너와 분산 워커가 그렇게 기록).
+    slo는 요청이 SLO를 만족했는지 판단하는 함수 (goodput/slo_attainment_pct용, 없으면 생략).
+    """
+
+    def __init__(self, window_sec: float = SKETCH_WINDOW_SEC, max_windows: int = SKETCH_MAX_WINDOWS, slo=None):
+        self.window_sec = window_sec
+        self.max_windows = max_windows
+        self.slo = slo
+        self.ttft = DDSketch()
+        self.latency = DDSketch()
+        self.tpot = DDSketch()
+        self.itl = DDSketch()
+        self.requests = 0
+        self.successes = 0
+        self.good = 0
+        self.tokens = 0
+        self.prompt_tokens = 0
+        self.prompt_counted = 0
+        self.itl_stalls = 0
+        self.stalled_requests = 0
+        self.sources: set[str] = set()
+        self.errors: dict[str, int] = {}
+        self.first_start_ms = math.inf
+        self.last_end_ms = 0.0
+        self.windows: dict[int, _Window] = {}
+
+    def _window(self, end_ms: float) -> _Window:
+        idx = int(end_ms / 1000 // self.window_sec)
+        window = self.windows.get(idx)
+        if window is None:
+            window = self.windows[idx] = _Window()
+            if len(self.windows) > self.max_windows:
+                self._coarsen()
+                return self._window(end_ms)
+        return window
+
+    def _coarsen(self):
+        """구간 길이를 두 배로 늘리고 인접 구간을 합친다."""
+        self.window_sec *= 2
+        merged: dict[int, _Window] = {}
+        for idx, window in self.windows.items():
+            target = merged.get(idx // 2)
+            if target is None:
+                merged[idx // 2] = window
+            else:
+                target.merge(window)
+        self.windows = merged
+
+    def add(self, r):
+        self.requests += 1
+        end_ms = r.start_offset_ms + r.total_latency_ms
+        self.first_start_ms = min(self.first_start_ms, r.start_offset_ms)
+        self.last_end_ms = max(self.last_end_ms, end_ms)
+        window = self._window(end_ms)
+        window.requests += 1
+        if not r.success:
+            key = r.error.split(":")[0][:60] or "unknown"
+            self.errors[key] = self.errors.get(key, 0) + 1
+            return
+        self.successes += 1
+        window.successes += 1
+        self.tokens += r.tokens_generated
+        window.tokens += r.tokens_generated
+        self.sources.add(r.token_count_source)
+        if r.prompt_tokens > 0:
+            self.prompt_tokens += r.prompt_tokens
+            self.prompt_counted += 1
+        if r.ttft_ms > 0:
+            self.ttft.add(r.ttft_ms)
+            window.ttft.add(r.ttft_ms)
+        self.latency.add(r.total_latency_ms)
+        window.latency.add(r.total_latency_ms)
+        if r.tokens_generated >= 2:
+            self.tpot.add(r.mean_itl_ms)
+        gaps = r.inter_token_latencies()
+        if gaps.size:
+            self.itl.add_many(gaps)
+            window.itl.add_many(gaps)
+            stalls = int((gaps > ITL_STALL_THRESHOLD_MS).sum())
+            self.itl_stalls += stalls
+            self.stalled_requests += stalls > 0
+        if self.slo is not None and self.slo(r):
+            self.good += 1
+
+    def observe(self, name: str, value: float, at_ms: float):
+        """at_ms(기준 시각 기준) 시점에 관측한 자원 지표(GPU 메모리 등)를 그 구간의 최댓값으로 기록."""
+        peaks = self._window(at_ms).peaks
+        peaks[name] = max(peaks.get(name, value), value)
+
+    def merge(self, other: "StreamingAggregator"):
+        """다른 워커/구간의 집계를 합친다 (같은 기준 시각이어야 구간이 맞음)."""
+        for name in ("ttft", "latency", "tpot", "itl"):
+            getattr(self, name).merge(getattr(other, name))
+        for name in ("requests", "successes", "good", "tokens", "prompt_tokens", "prompt_counted",
+                     "itl_stalls", "stalled_requests"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.sources |= other.sources
+        for key, n in other.errors.items():
+            self.errors[key] = self.errors.get(key, 0) + n
+        self.first_start_ms = min(self.first_start_ms, other.first_start_ms)
+        self.last_end_ms = max(self.last_end_ms, other.last_end_ms)
+        while other.window_sec > self.window_sec:
+            self._coarsen()
+        # 구간 시작 시각 기준으로 이쪽 구간에 넣는다 (구간 길이가 2의 거듭제곱 배면 정확히 맞음)
+        for idx, window in other.windows.items():
+            target_idx = int(idx * other.window_sec // self.window_sec)
+            target = self.windows.get(target_idx)
+            if target is None:
+                self.windows[target_idx] = window
+            else:
+                target.merge(window)
+        while len(self.windows) > self.max_windows:
+            self._coarsen()
+
+    @property
+    def elapsed_sec(self) -> float:
+        return max(0.0, self.last_end_ms - self.first_start_ms) / 1000 if self.requests else 0.0
+
+    def fill(self, sr):
+        """ScenarioResult의 집계 필드를 스케치 값으로 채운다 (compute_aggregates 대체).
+
+        sr.total_time_sec가 0이면 첫 전송부터 마지막 완료까지를 쓴다.
+        """
+        if not self.requests:
+            return
+        if not sr.total_time_sec:
+            sr.total_time_sec = round(self.elapsed_sec, 2)
+        sr.success_rate = self.successes / self.requests * 100
+        if not self.successes:
+            return
+        if self.ttft.count:
+            sr.avg_ttft_ms = _round(self.ttft.mean)
+            sr.p50_ttft_ms, sr.p95_ttft_ms, sr.p99_ttft_ms = map(_round, self.ttft.quantiles([0.5, 0.95, 0.99]))
+        sr.avg_latency_ms = _round(self.latency.mean)
+        sr.p50_latency_ms, sr.p95_latency_ms, sr.p99_latency_ms = map(_round, self.latency.quantiles([0.5, 0.95, 0.99]))
+        if self.tpot.count:
+            sr.avg_tpot_ms = _round(self.tpot.mean)
+            sr.p50_tpot_ms, sr.p95_tpot_ms, sr.p99_tpot_ms = map(_round, self.tpot.quantiles([0.5, 0.95, 0.99]))
+            sr.max_tpot_ms = _round(self.tpot.max)
+        if self.itl.count:
+            sr.avg_itl_ms = _round(self.itl.mean)
+            sr.p50_itl_ms, sr.p95_itl_ms, sr.p99_itl_ms = map(_round, self.itl.quantiles([0.5, 0.95, 0.99]))
+            sr.max_itl_ms = _round(self.itl.max)
+        sr.itl_stall_count = self.itl_stalls
+        sr.stalled_requests = self.stalled_requests
+        if self.prompt_counted:
+            sr.avg_prompt_tokens = _round(self.prompt_tokens / self.prompt_counted)
+        sr.token_count_source = next(iter(self.sources)) if len(self.sources) == 1 else "mixed"
+        if sr.total_time_sec > 0:
+            sr.total_token_throughput = _round(self.tokens / sr.total_time_sec)
+            sr.request_throughput = _round(self.successes / sr.total_time_sec)
+        if self.slo is not None:
+            sr.slo_attainment_pct = _round(self.good / self.requests * 100)
+            if sr.total_time_sec > 0:
+                sr.goodput_rps = _round(self.good / sr.total_time_sec)
+        sr.windows = self.window_summaries()
+
+    def window_summaries(self) -> list[dict]:
+        """구간별 요약 (시작 시각 순). 처리량은 구간 길이 기준 tok/s."""
+        out = []
+        for idx in sorted(self.windows):
+            w = self.windows[idx]
+            ttft_p50, ttft_p99 = w.ttft.quantiles([0.5, 0.99])
+            lat_p50, lat_p99 = w.latency.quantiles([0.5, 0.99])
+            out.append({
+                "start_sec": round(idx * self.window_sec, 3),
+                "window_sec": self.window_sec,
+                "requests": w.requests,
+                "errors": w.requests - w.successes,
+                "ttft_p50_ms": _round(ttft_p50),
+                "ttft_p99_ms": _round(ttft_p99),
+                "latency_p50_ms": _round(lat_p50),
+                "latency_p99_ms": _round(lat_p99),
+                "itl_p99_ms": _round(w.itl.quantile(0.99)),
+                "token_throughput": _round(w.tokens / self.window_sec),
+                **{name: _round(value) for name, value in w.peaks.items()},
+            })
+        return out
+
+
+def window_summaries(results, window_sec: float = SKETCH_WINDOW_SEC) -> list[dict]:
+    """요청별 결과 목록의 구간별 분위수 (포인트 안의 지연 변화 확인용)."""
+    aggregator = StreamingAggregator(window_sec=window_sec)
+    for r in results:
+        aggregator.add(r)
+    return aggregator.window_summaries()
@@ -0,0 +1,232 @@
+"""장시간 soak 실행: 정해진 시간 동안 부하를 유지하며 구간별 지표와 성능 저하를 추적.
+
+요청 목록을 미리 만들지 않고 동시성 슬롯마다 다음 요청을 그때그때 만들어 보내며,
+완료된 결과는 원시 기록(JSONL)과 StreamingAggregator(bench.sketch)에만 반영하고 버리므로
+몇 시간을 돌려도 클라이언트 메모리는 구간 수 상한(SKETCH_MAX_WINDOWS) 이상 늘지 않는다.
+--workers > 1이면 워커 프로세스들이 부하를 만들고 코디네이터가 받은 결과를 같은 방식으로 집계한다.
+
+구간이 닫힐 때마다 GPU 메모리 peak와 서버 KV 캐시 사용률/대기 요청 수 최댓값을 그 구간에
+기록하고, 구간 오류율이 stop_error_pct 이상이면 조기 중단한다. 실행이 끝나면 구간 시계열에
+Mann-Kendall 추세 검정을 적용해 단조적인 성능 저하(처리량 감소, TTFT·메모리 증가 등)와
+오류 burst 구간을 찾는다.
+"""
+
+import asyncio
+import itertools
+import time
+
+import numpy as np
+from tqdm import tqdm
+
+from .backends import build_payload, get_backend
+from .client import send_request
+from .config import (
+    FRAMEWORK_CONFIG,
+    RUN_OPTIONS,
+    SOAK_ERROR_BURST_PCT,
+    SOAK_MIN_TREND_CHANGE_PCT,
+    SOAK_MIN_TREND_WINDOWS,
+    SOAK_MIN_WINDOW_REQUESTS,
+    SOAK_TREND_ALPHA,
+    SOAK_WARMUP_WINDOWS,
+)
+from .dashboard import progress
+from .distributed import run_distributed_requests
+from .rawlog import begin_point, record_result
+from .server_metrics import get_scraper
+from .sketch import StreamingAggregator
+from .stats import mann_kendall
+from .telemetry import get_telemetry
+from .tokenizer import get_tokenizer
+from .transport import open_session
+from .workloads import cache_salter
+
+# 추세 검정 대상 구간 지표 -> 성능 저하 방향
+TREND_METRICS = {
+    "token_throughput": "decreasing",
+    "ttft_p99_ms": "increasing",
+    "latency_p50_ms": "increasing",
+    "error_rate_pct": "increasing",
+    "gpu_memory_mb": "increasing",
+    "kv_cache_usage": "increasing",
+    "waiting": "increasing",
+}
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(spec: str) -> float:
+    """'3600', '90s', '30m', '4h' -> 초."""
+    spec = spec.strip().lower()
+    scale = _DURATION_UNITS.get(spec[-1:], None)
+    try:
+        value = float(spec[:-1] if scale else spec) * (scale or 1)
+    except ValueError:
+        value = -1.0
+    if value <= 0:
+        raise ValueError(f"Invalid duration '{spec}' (e.g. 3600, 90s, 30m, 4h)")
+    return value
+
+
+def _observe_resources(aggregator: StreamingAggregator, origin_mono: float, lo: float, hi: float):
+    """[lo, hi)초 구간의 GPU 메모리 peak와 서버 gauge 최댓값을 그 구간에 기록."""
+    at_ms = (lo + hi) / 2 * 1000
+    telemetry = get_telemetry()
+    if telemetry is not None:
+        summary = telemetry.summarize(origin_mono + lo, origin_mono + hi)
+        if summary is not None:
+            aggregator.observe("gpu_memory_mb", summary["memory_peak_mb"], at_ms)
+    scraper = get_scraper()
+    if scraper is not None:
+        summary = scraper.summarize(origin_mono + lo, origin_mono + hi)
+        for key in ("kv_cache_usage", "waiting"):
+            if summary is not None and key in summary["gauges"]:
+                aggregator.observe(key, summary["gauges"][key]["max"], at_ms)
+
+
+def _window_line(w: dict) -> str:
+    error_pct = w["errors"] / w["requests"] * 100 if w["requests"] else 0.0
+    minutes, seconds = divmod(int(w["start_sec"]), 60)
+    return (f"  [{minutes:>4d}:{seconds:02d}] {w['token_throughput']} tok/s | TTFT p99={w['ttft_p99_ms']}ms "
+            f"| latency p50={w['latency_p50_ms']}ms | errors={error_pct:.1f}%"
+            + (f" | GPU={w['gpu_memory_mb']}MB" if "gpu_memory_mb" in w else ""))
+
+
+async def run_soak_requests(
+    framework: str,
+    messages: list[dict],
+    max_tokens: int,
+    concurrency: int,
+    duration_sec: float,
+    aggregator: StreamingAggregator,
+    stop_error_pct: float = 0.0,
+    num_workers: int = 1,
+) -> tuple[float, str]:
+    """duration_sec 동안 concurrency개 요청을 계속 유지하며 결과를 aggregator에 집계.
+
+    요청마다 messages에 --cache-mode를 적용해(workloads.cache_salter) 보낸다. 마감 시각 이후에는
+    새 요청을 보내지 않고 진행 중인 요청만 기다린다. 닫힌 구간의 오류율이 stop_error_pct(%) 이상이면
+    진행 중인 요청을 취소하고 멈춘다 (0이면 끔). num_workers > 1이면 부하는 분산 워커가 만들고
+    (bench.distributed) 구간 감시는 코디네이터가 한다. (총 소요 시간, 조기 중단 사유 또는 "")를 반환.
+    """
+    config = FRAMEWORK_CONFIG[framework]
+    stopped = asyncio.Event()
+    state = {"reason": "", "closed": -1, "origin_mono": None}
+
+    def close_window(lo: float, hi: float):
+        _observe_resources(aggregator, state["origin_mono"], lo, hi)
+        window = aggregator.windows.get(int(lo // aggregator.window_sec))
+        if window is None:
+            return
+        summary = next(w for w in aggregator.window_summaries() if w["start_sec"] <= lo < w["start_sec"] + w["window_sec"])
+        tqdm.write(_window_line(summary))
+        error_pct = (window.requests - window.successes) / window.requests * 100 if window.requests else 0.0
+        if stop_error_pct > 0 and window.requests >= SOAK_MIN_WINDOW_REQUESTS and error_pct >= stop_error_pct:
+            state["reason"] = f"error rate {error_pct:.1f}% >= {stop_error_pct}% in window at {lo:.0f}s"
+            stopped.set()
+
+    async def monitor(start: float):
+        while not stopped.is_set():
+            window_sec = aggregator.window_sec
+            idx = max(0, int((time.perf_counter() - start) // window_sec))
+            await asyncio.sleep(max(0.0, start + (idx + 1) * window_sec - time.perf_counter()))
+            close_window(idx * window_sec, (idx + 1) * window_sec)
+            state["closed"] = (idx + 1) * window_sec
+
+    if num_workers > 1:
+        watchers = []
+
+        def on_start(origin_mono: float):
+            state["origin_mono"] = origin_mono
+            watchers.append(asyncio.ensure_future(monitor(time.perf_counter() + (origin_mono - time.monotonic()))))
+
+        _, elapsed = await run_distributed_requests(
+            framework, [messages], max_tokens, num_workers, concurrency,
+            aggregator=aggregator, duration_sec=duration_sec, stopped=stopped, on_start=on_start,
+        )
+        for watcher in watchers:
+            watcher.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+    else:
+        backend = get_backend(config)
+        url = backend.url(config)
+        tokenizer = get_tokenizer(framework)
+        labels = {"framework": framework, "point": begin_point(), "mode": "soak", "concurrency": concurrency}
+        counter = itertools.count()
+        salt = cache_salter(RUN_OPTIONS["cache_mode"])
+
+        async def lane(session):
+            while not stopped.is_set() and time.perf_counter() < deadline:
+                index = next(counter)
+                payload = build_payload(config, salt(messages, index), max_tokens)
+                sent = time.perf_counter()
+                result = await send_request(session, url, payload, tokenizer, backend=backend)
+                result.index = index
+                result.max_tokens = max_tokens
+                result.start_offset_ms = round((sent - start) * 1000, 2)
+                aggregator.add(result)
+                record_result(result, **labels)
+                pbar.update(1)
+
+        async with open_session(concurrency + 10, config["base_url"], warm=concurrency) as session:
+            start = time.perf_counter()
+            state["origin_mono"] = time.monotonic()
+            deadline = start + duration_sec
+            with progress(desc=f"{framework} (soak c={concurrency})", unit="req") as pbar:
+                lanes = [asyncio.ensure_future(lane(session)) for _ in range(concurrency)]
+                all_lanes = asyncio.gather(*lanes)
+                watcher = asyncio.ensure_future(monitor(start))
+                stop_waiter = asyncio.ensure_future(stopped.wait())
+                await asyncio.wait([all_lanes, stop_waiter], return_when=asyncio.FIRST_COMPLETED)
+                elapsed = time.perf_counter() - start
+                for task in (*lanes, watcher, stop_waiter):
+                    task.cancel()
+                await asyncio.gather(all_lanes, watcher, stop_waiter, return_exceptions=True)
+
+    # 마지막 (닫히지 않은) 구간의 자원 지표
+    if state["origin_mono"] is not None and elapsed > state["closed"]:
+        _observe_resources(aggregator, state["origin_mono"], max(0.0, state["closed"]), elapsed)
+
+    return elapsed, state["reason"]
+
+
+def analyze_windows(windows: list[dict], elapsed_sec: float) -> dict:
+    """구간 시계열의 추세 검정과 오류 burst.
+
+    끝나지 않은 마지막 구간과 앞쪽 SOAK_WARMUP_WINDOWS개 구간은 추세 검정에서 뺀다.
+    TREND_METRICS 방향의 유의한 추세 중 실행 전체 변화량(Sen 기울기 × 구간 수)이 중앙값의
+    SOAK_MIN_TREND_CHANGE_PCT% 이상인 지표를 degraded에 모은다 (중앙값이 0이면 추세만으로 판단).
+    """
+    for w in windows:
+        w["error_rate_pct"] = round(w["errors"] / w["requests"] * 100, 2) if w["requests"] else 0.0
+    complete = [w for w in windows if w["start_sec"] + w["window_sec"] <= elapsed_sec][SOAK_WARMUP_WINDOWS:]
+    window_sec = windows[0]["window_sec"] if windows else 0.0
+
+    trends, degraded = {}, []
+    for metric, bad in TREND_METRICS.items():
+        values = [w[metric] for w in complete if metric in w]
+        if len(values) < SOAK_MIN_TREND_WINDOWS:
+            continue
+        test = mann_kendall(values, SOAK_TREND_ALPHA)
+        baseline = float(np.median(values))
+        change = test["sen_slope"] * (len(values) - 1)
+        test["sen_slope_per_hour"] = round(test.pop("sen_slope") / window_sec * 3600, 4)
+        test["change_pct"] = round(change / baseline * 100, 2) if baseline > 0 else None
+        test["degraded"] = test["trend"] == bad and (
+            test["change_pct"] is None or abs(test["change_pct"]) >= SOAK_MIN_TREND_CHANGE_PCT
+        )
+        trends[metric] = test
+        if test["degraded"]:
+            degraded.append(metric)
+
+    bursts = [
+        {"start_sec": w["start_sec"], "requests": w["requests"], "error_rate_pct": w["error_rate_pct"]}
+        for w in windows if w["error_rate_pct"] > SOAK_ERROR_BURST_PCT
+    ]
+    return {
+        "windows_analyzed": len(complete),
+        "min_windows": SOAK_MIN_TREND_WINDOWS,
+        "trends": trends,
+        "degraded": degraded,
+        "error_bursts": bursts,
+    }
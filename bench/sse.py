@@ -0,0 +1,253 @@
+"""바이트 청크 단위 증분 SSE 파서와 파서 오버헤드 마이크로벤치마크.
+
+send_request의 핫 루프는 토큰 청크마다 호출되므로, 콘텐츠가 있는 이벤트인지는
+바이트 패턴 검사로만 판단하고 JSON 전체 파싱은 꼭 필요한 이벤트(첫 콘텐츠 이벤트
+검증, usage, error)에서만 수행한다. 응답 텍스트가 필요하면 원본 바이트만 보관했다가
+요청이 끝난 뒤 파싱한다.
+
+    python -m bench.sse            # 마이크로벤치마크 실행
+"""
+
+import json
+import time
+
+_DATA = b"data:"
+_DONE = b"[DONE]"
+_CONTENT_KEY = b'"content":'
+_REASONING_KEYS = (b'"reasoning_content":', b'"reasoning":')  # vLLM/SGLang, Ollama/최신 vLLM
+_USAGE_KEY = b'"usage":'
+_ERROR_KEY = b'"error":'
+_KEY_BOUNDARY = b"{, \t"
+
+
+def has_string(payload: bytes, key: bytes) -> bool:
+    """payload에 key의 비어 있지 않은 문자열 값이 있는지 바이트 수준에서 판단.
+
+    "reasoning_content" 안의 "content"처럼 다른 키에 포함된 경우는 앞 글자로 구분한다.
+    """
+    idx = payload.find(key)
+    while idx > 0:
+        if payload[idx - 1] in _KEY_BOUNDARY:
+            j = idx + len(key)
+            while payload[j:j + 1] == b" ":
+                j += 1
+            return payload[j:j + 1] == b'"' and payload[j + 1:j + 2] != b'"'
+        idx = payload.find(key, idx + 1)
+    return False
+
+
+def _has_content(payload: bytes) -> bool:
+    return has_string(payload, _CONTENT_KEY)
+
+
+def _has_reasoning(payload: bytes) -> bool:
+    return any(has_string(payload, key) for key in _REASONING_KEYS)
+
+
+def _has_value(payload: bytes, key: bytes) -> bool:
+    """key가 있고 값이 null이 아닌지."""
+    idx = payload.find(key)
+    if idx < 0:
+        return False
+    return not payload[idx + len(key):].lstrip().startswith(b"null")
+
+
+def _delta(data: dict) -> dict:
+    choices = data.get("choices") or []
+    if not choices:
+        return {}
+    return choices[0].get("delta") or {}
+
+
+def _delta_content(data: dict) -> str:
+    return _delta(data).get("content") or ""
+
+
+class SSEStreamParser:
+    """OpenAI 호환 스트리밍 응답용 증분 파서.
+
+    feed()에 resp.content.iter_any()의 바이트 청크를 그대로 넘기면 그 청크에서
+    완성된 토큰 이벤트(콘텐츠 + reasoning) 수를 반환한다. reasoning 이벤트
+    (delta.reasoning_content / delta.reasoning)는 reasoning_events로 따로 센다.
+    capture_text=True면 콘텐츠 이벤트의 원본 바이트를 보관했다가 text 접근 시에만
+    파싱한다 (토크나이저로 다시 셀 때 필요).
+    """
+
+    __slots__ = ("_buf", "_fast", "capture_text", "content_events", "reasoning_events", "usage", "error", "done",
+                 "pieces", "server_timing")
+
+    def __init__(self, capture_text: bool = False):
+        self._buf = b""
+        self._fast = True
+        self.capture_text = capture_text
+        self.content_events = 0
+        self.reasoning_events = 0
+        self.usage = None
+        self.error = ""
+        self.done = False
+        self.pieces = []
+        self.server_timing = None  # OpenAI 호환 스트림에는 서버 측 단계별 시간이 없음
+
+    @property
+    def text(self) -> str:
+        """응답 텍스트 (capture_text=True일 때만). 보관한 원본 이벤트는 여기서 파싱한다."""
+        return "".join(
+            p if isinstance(p, str) else _delta_content(json.loads(p))
+            for p in self.pieces
+        )
+
+    def feed(self, chunk: bytes) -> int:
+        """바이트 청크를 처리하고 새로 완성된 토큰 이벤트 수를 반환."""
+        if self._buf:
+            chunk = self._buf + chunk
+        lines = chunk.split(b"\n")
+        self._buf = lines.pop()
+        count = 0
+        for line in lines:
+            if not line.startswith(_DATA):
+                continue
+            payload = line[5:].strip()
+            if payload == _DONE:
+                self.done = True
+                break
+            if self._fast:
+                if _has_content(payload):
+                    if self.content_events == 0 and not self._validate(payload):
+                        count += self._parse(payload)
+                        continue
+                    count += 1
+                    self.content_events += 1
+                    if self.capture_text:
+                        self.pieces.append(payload)
+                elif _has_reasoning(payload):
+                    count += 1
+                    self.reasoning_events += 1
+                elif _has_value(payload, _USAGE_KEY) or _has_value(payload, _ERROR_KEY):
+                    self._parse(payload)
+                    continue
+                # 마지막 델타와 같은 이벤트에 usage를 싣는 서버도 있다
+                if _has_value(payload, _USAGE_KEY):
+                    self._read_usage(payload)
+            else:
+                count += self._parse(payload)
+        return count
+
+    def _validate(self, payload: bytes) -> bool:
+        """첫 콘텐츠 이벤트는 전체 파싱으로 바이트 판정과 일치하는지 확인.
+
+        일치하지 않는 형식이면 이후 모든 이벤트를 전체 파싱하는 모드로 전환한다.
+        """
+        try:
+            if _delta_content(json.loads(payload)):
+                return True
+        except json.JSONDecodeError:
+            pass
+        self._fast = False
+        return False
+
+    def _read_usage(self, payload: bytes):
+        """토큰 이벤트에 함께 실린 usage만 읽는다 (토큰 수는 이미 셌음)."""
+        try:
+            usage = json.loads(payload).get("usage")
+        except json.JSONDecodeError:
+            return
+        if usage:
+            self.usage = usage
+
+    def _parse(self, payload: bytes) -> int:
+        """이벤트 전체 파싱. 콘텐츠/reasoning 이벤트면 1을 반환."""
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError:
+            return 0
+        if data.get("usage"):
+            self.usage = data["usage"]
+        if data.get("error"):
+            err = data["error"]
+            self.error = err.get("message", str(err)) if isinstance(err, dict) else str(err)
+        delta = _delta(data)
+        content = delta.get("content")
+        if not content:
+            if delta.get("reasoning_content") or delta.get("reasoning"):
+                self.reasoning_events += 1
+                return 1
+            return 0
+        self.content_events += 1
+        if self.capture_text:
+            self.pieces.append(content)
+        return 1
+
+
+def _legacy_parse(lines: list[bytes]) -> int:
+    """기존 send_request 방식 (줄마다 decode + json.loads)."""
+    tokens = 0
+    for line in lines:
+        decoded = line.decode("utf-8").strip()
+        if not decoded or not decoded.startswith("data:"):
+            continue
+        data_str = decoded[5:].strip()
+        if data_str == "[DONE]":
+            break
+        try:
+            data = json.loads(data_str)
+            choices = data.get("choices", [])
+            if choices:
+                content = choices[0].get("delta", {}).get("content", "")
+                if content:
+                    tokens += 1
+        except json.JSONDecodeError:
+            continue
+    return tokens
+
+
+def synthetic_stream(num_events: int, events_per_chunk: int = 1) -> list[bytes]:
+    """vLLM/SGLang 형식을 흉내 낸 SSE 바이트 청크 목록."""
+    events = []
+    for i in range(num_events):
+        event = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "openai/gpt-oss-20b",
+            "choices": [{"index": 0, "delta": {"content": f" token{i}"}, "logprobs": None, "finish_reason": None}],
+        }
+        events.append(b"data: " + json.dumps(event, separators=(",", ":")).encode() + b"\n\n")
+    usage = {"choices": [], "usage": {"prompt_tokens": 512, "completion_tokens": num_events}}
+    events.append(b"data: " + json.dumps(usage, separators=(",", ":")).encode() + b"\n\n")
+    events.append(b"data: [DONE]\n\n")
+    return [b"".join(events[i:i + events_per_chunk]) for i in range(0, len(events), events_per_chunk)]
+
+
+def benchmark_parser(num_events: int = 20000, repeats: int = 5) -> dict:
+    """청크당 파서 오버헤드 (ns) 측정: 기존 방식 vs 증분 파서 (fast / capture_text)."""
+    chunks = synthetic_stream(num_events)
+    lines = b"".join(chunks).splitlines(keepends=True)
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            fn()
+            best = min(best, time.perf_counter_ns() - start)
+        return round(best / num_events, 1)
+
+    def run_parser(capture_text):
+        parser = SSEStreamParser(capture_text=capture_text)
+        for chunk in chunks:
+            parser.feed(chunk)
+        assert parser.content_events == num_events and parser.usage
+
+    return {
+        "events": num_events,
+        "legacy_ns_per_chunk": best_of(lambda: _legacy_parse(lines)),
+        "fast_ns_per_chunk": best_of(lambda: run_parser(False)),
+        "capture_text_ns_per_chunk": best_of(lambda: run_parser(True)),
+    }
+
+
+if __name__ == "__main__":
+    stats = benchmark_parser()
+    print(f"SSE parser overhead per content chunk ({stats['events']} events, best of 5):")
+    print(f"  legacy (decode + json.loads): {stats['legacy_ns_per_chunk']} ns")
+    print(f"  incremental (fast path):      {stats['fast_ns_per_chunk']} ns")
+    print(f"  incremental (capture_text):   {stats['capture_text_ns_per_chunk']} ns")
@@ -0,0 +1,241 @@
+"""통계 분석: 부트스트랩 신뢰구간, 프레임워크 간 유의성 검정, 반복 시행.
+
+포인트당 요청 5~10개로 만든 점 추정치(특히 p99)는 실행마다 크게 흔들리므로, 각 포인트에
+대해 평균/백분위 TTFT·레이턴시·처리량의 부트스트랩 신뢰구간을 함께 기록한다.
+리샘플링은 (리샘플 수 × 표본 수) 인덱스 행렬 하나로 NumPy에서 한 번에 계산한다
+(행렬이 크면 리샘플을 나눠 메모리를 제한).
+
+반복 시행(RUN_OPTIONS["trials"])은 같은 요청 목록을 여러 번 실행해 표본을 합친다.
+ci_target이 있으면 최소 시행 수 이후에도 TTFT/레이턴시 평균 CI의 상대 폭이 목표보다
+넓으면 max_trials까지 시행을 늘리고, 좁아지면 바로 멈춘다.
+
+soak 실행의 구간 시계열에는 Mann-Kendall 단조 추세 검정과 Sen 기울기를 쓴다 (분포 가정 없음).
+"""
+
+import math
+
+import numpy as np
+from tqdm import tqdm
+
+from .config import BOOTSTRAP_RESAMPLES, CI_CONVERGENCE_METRICS, CONFIDENCE_LEVEL, RUN_OPTIONS
+
+_MAX_RESAMPLE_CELLS = 4_000_000  # 한 번에 만드는 리샘플 행렬 원소 수 상한 (float64 32MB)
+_MIN_P99_SAMPLES = 100           # 이보다 적으면 p99 CI는 최댓값 근처에 몰려 의미가 약함
+
+
+def _statistic(samples: np.ndarray, statistic: str) -> np.ndarray:
+    """리샘플 행렬(행마다 한 리샘플)의 통계량. statistic은 mean 또는 p50/p99 같은 백분위."""
+    if statistic == "mean":
+        return samples.mean(axis=-1)
+    return np.percentile(samples, float(statistic[1:]), axis=-1)
+
+
+def bootstrap_distributions(
+    values, statistics: tuple[str, ...], n_resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0
+) -> dict[str, np.ndarray]:
+    """values를 복원 추출한 n_resamples개 리샘플의 통계량들 (같은 리샘플 행렬을 공유)."""
+    values = np.asarray(values, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    chunk = max(1, _MAX_RESAMPLE_CELLS // max(1, values.size))
+    percentiles = [float(s[1:]) for s in statistics if s != "mean"]
+    out = {s: np.empty(n_resamples) for s in statistics}
+    for lo in range(0, n_resamples, chunk):
+        hi = min(n_resamples, lo + chunk)
+        samples = values[rng.integers(0, values.size, size=(hi - lo, values.size))]
+        if "mean" in out:
+            out["mean"][lo:hi] = samples.mean(axis=1)
+        if percentiles:
+            # 백분위 여러 개를 한 번의 partition으로
+            for s, row in zip((s for s in statistics if s != "mean"), np.percentile(samples, percentiles, axis=1)):
+                out[s][lo:hi] = row
+    return out
+
+
+def bootstrap_distribution(
+    values, statistic: str = "mean", n_resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0
+) -> np.ndarray:
+    """values를 복원 추출한 n_resamples개 리샘플 각각의 통계량."""
+    return bootstrap_distributions(values, (statistic,), n_resamples, seed)[statistic]
+
+
+def _interval(dist: np.ndarray, confidence: float) -> tuple[float, float]:
+    alpha = (1 - confidence) / 2 * 100
+    lo, hi = np.percentile(dist, [alpha, 100 - alpha])
+    return round(float(lo), 3), round(float(hi), 3)
+
+
+def bootstrap_cis(
+    values, statistics: tuple[str, ...], confidence: float = CONFIDENCE_LEVEL,
+    n_resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0,
+) -> dict[str, tuple[float, float] | None]:
+    """통계량별 백분위 부트스트랩 신뢰구간 (표본이 2개 미만이면 None)."""
+    if len(values) < 2:
+        return {s: None for s in statistics}
+    dists = bootstrap_distributions(values, statistics, n_resamples, seed)
+    return {s: _interval(dist, confidence) for s, dist in dists.items()}
+
+
+def bootstrap_ci(
+    values, statistic: str = "mean", confidence: float = CONFIDENCE_LEVEL,
+    n_resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0,
+) -> tuple[float, float] | None:
+    """백분위 부트스트랩 신뢰구간 (표본이 2개 미만이면 None)."""
+    return bootstrap_cis(values, (statistic,), confidence, n_resamples, seed)[statistic]
+
+
+def relative_width(values, statistic: str = "mean", confidence: float = CONFIDENCE_LEVEL) -> float:
+    """CI 폭 / 점 추정치. 계산할 수 없으면 inf."""
+    ci = bootstrap_ci(values, statistic, confidence)
+    center = float(_statistic(np.asarray(values, dtype=np.float64), statistic)) if len(values) else 0.0
+    if ci is None or center <= 0:
+        return float("inf")
+    return (ci[1] - ci[0]) / center
+
+
+def compare_samples(
+    a, b, statistic: str = "mean", confidence: float = CONFIDENCE_LEVEL,
+    n_resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0,
+) -> dict | None:
+    """두 표본의 통계량 차이(b - a) 부트스트랩 검정.
+
+    두 표본을 독립적으로 리샘플해 차이의 분포를 만들고, CI가 0을 포함하면
+    significant=False ("유의한 차이 없음")로 표시한다. p_value는 양측 부트스트랩 p값.
+    """
+    if len(a) < 2 or len(b) < 2:
+        return None
+    dist_a = bootstrap_distribution(a, statistic, n_resamples, seed)
+    dist_b = bootstrap_distribution(b, statistic, n_resamples, seed + 1)
+    diff = dist_b - dist_a
+    lo, hi = _interval(diff, confidence)
+    point_a = float(_statistic(np.asarray(a, dtype=np.float64), statistic))
+    point_b = float(_statistic(np.asarray(b, dtype=np.float64), statistic))
+    p_value = min(1.0, 2 * min(float((diff <= 0).mean()), float((diff >= 0).mean())))
+    return {
+        "a": round(point_a, 3),
+        "b": round(point_b, 3),
+        "diff": round(point_b - point_a, 3),
+        "rel_diff_pct": round((point_b - point_a) / point_a * 100, 2) if point_a else None,
+        "ci": [lo, hi],
+        "p_value": round(p_value, 4),
+        "significant": bool(lo > 0 or hi < 0),
+    }
+
+
+def mann_kendall(values, alpha: float = 1 - CONFIDENCE_LEVEL) -> dict | None:
+    """Mann-Kendall 단조 추세 검정 (동률 보정, 정규 근사)과 Sen 기울기 (값 순번 1칸당 변화량).
+
+    trend는 p_value < alpha면 increasing/decreasing, 아니면 none. 값이 3개 미만이면 None.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = x.size
+    if n < 3:
+        return None
+    i, j = np.triu_indices(n, k=1)
+    diff = x[j] - x[i]
+    s = int(np.sign(diff).sum())
+    _, ties = np.unique(x, return_counts=True)
+    var = (n * (n - 1) * (2 * n + 5) - float((ties * (ties - 1) * (2 * ties + 5)).sum())) / 18
+    z = (s - np.sign(s)) / math.sqrt(var) if var > 0 else 0.0
+    p_value = math.erfc(abs(z) / math.sqrt(2))
+    return {
+        "n": int(n),
+        "s": s,
+        "z": round(float(z), 3),
+        "p_value": round(p_value, 4),
+        "trend": "none" if p_value >= alpha else ("increasing" if s > 0 else "decreasing"),
+        "sen_slope": float(np.median(diff / (j - i))),
+    }
+
+
+def trial_throughputs(results) -> list[float]:
+    """시행별 총 토큰 처리량 (tok/s). 시행 구간은 그 시행의 첫 전송부터 마지막 완료까지."""
+    by_trial: dict[int, list] = {}
+    for r in results:
+        if r.success:
+            by_trial.setdefault(r.trial, []).append(r)
+    values = []
+    for trial in sorted(by_trial):
+        rs = by_trial[trial]
+        span_ms = max(r.start_offset_ms + r.total_latency_ms for r in rs) - min(r.start_offset_ms for r in rs)
+        if span_ms > 0:
+            values.append(sum(r.tokens_generated for r in rs) / span_ms * 1000)
+    return values
+
+
+# 포인트별로 CI를 기록하는 지표: 이름 -> (RequestResult 속성, 통계량)
+CI_METRICS = {
+    "ttft_mean": ("ttft_ms", "mean"),
+    "ttft_p50": ("ttft_ms", "p50"),
+    "ttft_p99": ("ttft_ms", "p99"),
+    "latency_mean": ("total_latency_ms", "mean"),
+    "latency_p99": ("total_latency_ms", "p99"),
+}
+
+
+def metric_samples(successful, attr: str) -> list[float]:
+    return [getattr(r, attr) for r in successful if attr != "ttft_ms" or r.ttft_ms > 0]
+
+
+def point_confidence(successful, confidence: float = CONFIDENCE_LEVEL) -> dict:
+    """포인트의 지표별 부트스트랩 CI. 처리량 CI는 시행이 2회 이상일 때만 (시행별 처리량 기준)."""
+    summary = {
+        "level": confidence,
+        "samples": len(successful),
+        "trials": len({r.trial for r in successful}),
+        "p99_supported": len(successful) >= _MIN_P99_SAMPLES,
+    }
+    by_attr: dict[str, list[tuple[str, str]]] = {}
+    for name, (attr, statistic) in CI_METRICS.items():
+        by_attr.setdefault(attr, []).append((name, statistic))
+    for attr, metrics in by_attr.items():
+        cis = bootstrap_cis(metric_samples(successful, attr), tuple(s for _, s in metrics), confidence)
+        for name, statistic in metrics:
+            summary[name] = cis[statistic]
+    summary["throughput"] = bootstrap_ci(trial_throughputs(successful), "mean", confidence)
+    return summary
+
+
+def converged(results, target: float) -> bool:
+    """CI_CONVERGENCE_METRICS 지표의 평균 CI 상대 폭이 모두 target 이하인지."""
+    successful = [r for r in results if r.success]
+    return all(
+        relative_width(metric_samples(successful, CI_METRICS[name][0]), CI_METRICS[name][1]) <= target
+        for name in CI_CONVERGENCE_METRICS
+    )
+
+
+def trial_messages(messages_list: list[list[dict]], trial: int) -> list[list[dict]]:
+    """두 번째 시행부터 모든 요청 첫 메시지 앞에 시행 표식을 붙인다.
+
+    앞 시행의 prefix cache 재사용을 막으면서, 시행 안의 요청 간 접두사 공유 구조
+    (warm/ratio 캐시 모드, 접두사 트리)는 그대로 둔다.
+    """
+    if trial == 0:
+        return messages_list
+    return [[{**m[0], "content": f"[trial {trial}] {m[0]['content']}"}, *m[1:]] for m in messages_list]
+
+
+async def run_trials(run_once, messages_list: list[list[dict]], repeat: bool = True):
+    """run_once(messages_list) -> (results, elapsed)를 시행 수만큼 실행하고 결과를 합친다.
+
+    RUN_OPTIONS의 trials(최소), max_trials(최대), ci_target(평균 CI 상대 폭 목표, 0이면 끔)을 따른다.
+    결과마다 시행 번호(trial)를 기록하고, 소요 시간은 시행별 시간의 합이다.
+    repeat=False(조기 중단 조건이 있는 탐색 probe 등)면 한 번만 실행한다.
+    """
+    min_trials = max(1, RUN_OPTIONS["trials"]) if repeat else 1
+    max_trials = max(min_trials, RUN_OPTIONS["max_trials"]) if repeat else 1
+    target = RUN_OPTIONS["ci_target"]
+    results, elapsed = [], 0.0
+    for trial in range(max_trials):
+        batch, seconds = await run_once(trial_messages(messages_list, trial))
+        for r in batch:
+            r.trial = trial
+        results.extend(batch)
+        elapsed += seconds
+        if trial + 1 < min_trials:
+            continue
+        if target <= 0 or converged(results, target):
+            break
+        tqdm.write(f"  CI wider than {target:.0%} after {trial + 1} trial(s)"
+                   + (", extending" if trial + 1 < max_trials else ", giving up (max trials)"))
+    return results, elapsed
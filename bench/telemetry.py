@@ -0,0 +1,250 @@
+"""백그라운드 GPU 텔레메트리 샘플러.
+
+부하가 걸리는 동안 일정 간격으로 GPU 메모리/활용률을 수집해 링 버퍼에 쌓고,
+파라미터 포인트가 끝나면 그 구간의 시계열과 peak/mean 값을 ScenarioResult에 붙인다.
+샘플링은 별도 스레드에서 하므로 이벤트 루프를 막지 않는다.
+
+소스 (RUN_OPTIONS["gpu_telemetry"]):
+    nvml        pynvml (설치되어 있을 때)
+    nvidia-smi  상주 `nvidia-smi --loop-ms` 서브프로세스 출력 파싱
+    fake        GPU 없는 머신에서 파이프라인 검증용 합성 값
+    auto        nvml -> nvidia-smi 순으로 시도, 둘 다 없으면 수집 안 함
+    off         수집 안 함 (포인트 종료 후 get_gpu_stats 1회 조회로 대체)
+
+여러 GPU는 메모리는 합산, 활용률은 평균으로 하나의 샘플로 합친다.
+"""
+
+import math
+import random
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+
+from .config import GPU_SAMPLE_CAPACITY, GPU_SAMPLE_INTERVAL_MS, SERIES_MAX_POINTS
+
+TELEMETRY_SOURCES = ["auto", "nvml", "nvidia-smi", "fake", "off"]
+
+_QUERY = "memory.used,memory.total,utilization.gpu"
+
+_telemetry = None
+
+
+def _combine(rows: list[tuple[float, float, float]]) -> tuple[float, float, float]:
+    """GPU별 (used, total, util) -> 합산 메모리, 평균 활용률."""
+    used = sum(r[0] for r in rows)
+    total = sum(r[1] for r in rows)
+    util = sum(r[2] for r in rows) / len(rows)
+    return used, total, util
+
+
+class NvmlSource:
+    """pynvml로 직접 조회 (호출당 수십 µs)."""
+
+    name = "nvml"
+
+    def __init__(self):
+        import pynvml
+
+        pynvml.nvmlInit()
+        self._nvml = pynvml
+        self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+        if not self._handles:
+            raise RuntimeError("no GPU visible to NVML")
+
+    def read(self) -> tuple[float, float, float] | None:
+        rows = []
+        for h in self._handles:
+            mem = self._nvml.nvmlDeviceGetMemoryInfo(h)
+            util = self._nvml.nvmlDeviceGetUtilizationRates(h)
+            rows.append((mem.used / 2**20, mem.total / 2**20, float(util.gpu)))
+        return _combine(rows)
+
+    def close(self):
+        self._nvml.nvmlShutdown()
+
+
+class NvidiaSmiSource:
+    """상주 nvidia-smi --loop-ms 프로세스의 출력을 한 줄씩 읽는다 (호출마다 프로세스를 띄우지 않음)."""
+
+    name = "nvidia-smi"
+
+    def __init__(self, interval_ms: int):
+        if shutil.which("nvidia-smi") is None:
+            raise RuntimeError("nvidia-smi not found")
+        self._num_gpus = len(subprocess.run(
+            ["nvidia-smi", "--query-gpu=index", "--format=csv,noheader"],
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.split())
+        self._proc = subprocess.Popen(
+            ["nvidia-smi", f"--query-gpu={_QUERY}", "--format=csv,noheader,nounits", f"--loop-ms={interval_ms}"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1,
+        )
+
+    def read(self) -> tuple[float, float, float] | None:
+        """다음 샘플 (GPU 수만큼의 줄)을 읽을 때까지 블록. 프로세스가 끝나면 None."""
+        rows = []
+        while len(rows) < self._num_gpus:
+            line = self._proc.stdout.readline()
+            if not line:
+                return None
+            try:
+                rows.append(tuple(float(v) for v in line.split(",")[:3]))
+            except ValueError:
+                continue
+        return _combine(rows)
+
+    def close(self):
+        self._proc.terminate()
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+
+
+class FakeSource:
+    """합성 GPU 값 (80 GB, 천천히 변하는 메모리와 흔들리는 활용률)."""
+
+    name = "fake"
+
+    def __init__(self, memory_total_mb: float = 81920.0, base_memory_mb: float = 40960.0, seed: int = 0):
+        self.memory_total_mb = memory_total_mb
+        self.memory_mb = base_memory_mb
+        self._rng = random.Random(seed)
+        self._start = time.monotonic()
+
+    def read(self) -> tuple[float, float, float] | None:
+        elapsed = time.monotonic() - self._start
+        self.memory_mb = min(self.memory_total_mb, max(0.0, self.memory_mb + self._rng.gauss(0, 64)))
+        util = 50 + 40 * math.sin(elapsed / 5) + self._rng.gauss(0, 5)
+        return self.memory_mb, self.memory_total_mb, min(100.0, max(0.0, util))
+
+    def close(self):
+        pass
+
+
+def open_source(kind: str, interval_ms: int = GPU_SAMPLE_INTERVAL_MS):
+    """kind에 맞는 샘플 소스 생성. auto에서 사용할 수 있는 소스가 없거나 off면 None."""
+    if kind == "off":
+        return None
+    if kind == "fake":
+        return FakeSource()
+    candidates = ["nvml", "nvidia-smi"] if kind == "auto" else [kind]
+    for name in candidates:
+        try:
+            return NvmlSource() if name == "nvml" else NvidiaSmiSource(interval_ms)
+        except Exception as e:
+            if kind != "auto":
+                raise RuntimeError(f"GPU telemetry source '{name}' unavailable: {e}") from e
+    return None
+
+
+class GpuTelemetry:
+    """소스를 interval_ms마다 읽어 (monotonic 시각, used_mb, total_mb, util_pct)를 링 버퍼에 저장."""
+
+    def __init__(self, source, interval_ms: int = GPU_SAMPLE_INTERVAL_MS, capacity: int = GPU_SAMPLE_CAPACITY):
+        self.source = source
+        self.interval = interval_ms / 1000
+        self.samples: deque[tuple[float, float, float, float]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="gpu-telemetry", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self.source.close()
+
+    def _run(self):
+        # nvidia-smi 소스는 read()가 자체 주기로 블록하므로 추가 대기 없음
+        self_paced = isinstance(self.source, NvidiaSmiSource)
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                value = self.source.read()
+            except Exception:
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.samples.append((time.monotonic(), *value))
+            elif self_paced:
+                return  # nvidia-smi 프로세스 종료
+            if not self_paced:
+                next_tick += self.interval
+                self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+    def window(self, start: float, end: float) -> list[tuple[float, float, float, float]]:
+        """구간 내 샘플. 구간이 샘플 간격보다 짧아 비어 있으면 end 직전 샘플 1개."""
+        with self._lock:
+            samples = [s for s in self.samples if start <= s[0] <= end]
+            if not samples:
+                samples = [s for s in self.samples if s[0] <= end][-1:]
+        return samples
+
+    def summarize(self, start: float, end: float, max_points: int = SERIES_MAX_POINTS) -> dict | None:
+        """[start, end] 구간의 peak/mean 값과 (최대 max_points개로 솎아낸) 시계열."""
+        samples = self.window(start, end)
+        if not samples:
+            return None
+        mem = [s[1] for s in samples]
+        util = [s[3] for s in samples]
+        step = max(1, math.ceil(len(samples) / max_points))
+        series = samples[::step]
+        return {
+            "source": self.source.name,
+            "num_samples": len(samples),
+            "memory_total_mb": samples[-1][2],
+            "memory_peak_mb": round(max(mem), 1),
+            "memory_mean_mb": round(sum(mem) / len(mem), 1),
+            "utilization_peak_pct": round(max(util), 1),
+            "utilization_mean_pct": round(sum(util) / len(util), 1),
+            "series": {
+                "t_sec": [round(s[0] - start, 3) for s in series],
+                "memory_mb": [round(s[1], 1) for s in series],
+                "utilization_pct": [round(s[3], 1) for s in series],
+            },
+        }
+
+
+def start_telemetry(kind: str, interval_ms: int = GPU_SAMPLE_INTERVAL_MS) -> GpuTelemetry | None:
+    source = open_source(kind, interval_ms)
+    if source is None:
+        return None
+    telemetry = GpuTelemetry(source, interval_ms)
+    telemetry.start()
+    return telemetry
+
+
+def set_telemetry(telemetry: GpuTelemetry | None):
+    global _telemetry
+    _telemetry = telemetry
+
+
+def get_telemetry() -> GpuTelemetry | None:
+    return _telemetry
+
+
+def attach_gpu_stats(sr, end: float | None = None):
+    """포인트 실행 구간(끝 시각 기준 total_time_sec 동안)의 GPU 통계를 sr에 기록.
+
+    gpu_memory_mb는 구간 peak, gpu_utilization_pct는 구간 평균이다.
+    텔레메트리가 없거나 구간 샘플이 없으면 get_gpu_stats 1회 조회로 대체한다.
+    """
+    summary = None
+    if _telemetry is not None:
+        end = time.monotonic() if end is None else end
+        summary = _telemetry.summarize(end - sr.total_time_sec, end)
+    if summary is None:
+        from .client import get_gpu_stats
+
+        gpu = get_gpu_stats()
+        sr.gpu_memory_mb = gpu["memory_used_mb"]
+        sr.gpu_utilization_pct = gpu["gpu_utilization_pct"]
+        return
+    sr.gpu_memory_mb = summary["memory_peak_mb"]
+    sr.gpu_utilization_pct = summary["utilization_mean_pct"]
+    sr.gpu_telemetry = summary
@@ -0,0 +1,55 @@
+"""로컬 토크나이저 로드 (선택 의존성 transformers) 및 토큰 수 계산.
+
+서버가 usage 필드를 주지 않을 때의 대체 수단이자, 정확한 입력 길이의
+프롬프트 생성에 사용한다. transformers가 없거나 로드에 실패하면 None을
+반환하고 호출 측은 근사치로 동작한다.
+"""
+
+import functools
+
+from .config import FRAMEWORK_CONFIG, MODEL_PRESETS
+
+
+@functools.lru_cache(maxsize=None)
+def load_tokenizer(model_preset: str):
+    """모델 프리셋의 HuggingFace 토크나이저를 한 번만 로드."""
+    name = MODEL_PRESETS.get(model_preset, {}).get("tokenizer")
+    if not name:
+        return None
+    try:
+        from transformers import AutoTokenizer
+    except ImportError:
+        return None
+    try:
+        return AutoTokenizer.from_pretrained(name)
+    except Exception as e:
+        print(f"WARNING: tokenizer '{name}' unavailable ({e}); falling back to approximate token counts")
+        return None
+
+
+def preset_for(framework: str) -> str | None:
+    """프레임워크에 현재 설정된 모델이 속한 프리셋 이름."""
+    model = FRAMEWORK_CONFIG[framework]["model"]
+    for preset, models in MODEL_PRESETS.items():
+        if models.get(framework) == model:
+            return preset
+    return None
+
+
+def get_tokenizer(framework: str):
+    """프레임워크의 현재 모델에 맞는 토크나이저 (없으면 None)."""
+    preset = preset_for(framework)
+    return load_tokenizer(preset) if preset else None
+
+
+def count_tokens(tokenizer, text: str) -> int:
+    """특수 토큰을 제외한 토큰 수."""
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def count_prompt_tokens(tokenizer, messages: list[dict]) -> int:
+    """채팅 템플릿을 적용한 입력 토큰 수 (템플릿이 없으면 본문 토큰 합)."""
+    try:
+        return len(tokenizer.apply_chat_template(messages, tokenize=True, add_generation_prompt=True))
+    except Exception:
+        return sum(count_tokens(tokenizer, m["content"]) for m in messages)
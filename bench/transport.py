@@ -0,0 +1,145 @@
+"""HTTP 전송 계층: 세션/커넥션 재사용 모드와 요청별 연결 단계 시간.
+
+모든 러너와 health 체크는 open_session()으로 세션을 얻는다 (RUN_OPTIONS["transport"]).
+
+    per-point  파라미터 포인트(러너 호출)마다 새 세션과 커넥션 풀 (기존 동작)
+    shared     실행 전체에서 세션 하나를 공유하고, 포인트 시작 전에 동시성만큼
+               커넥션을 미리 열어 둔다 (TTFT에 TCP 연결 시간이 섞이지 않음)
+    fresh      요청마다 새 커넥션 (keep-alive 없음, 연결 비용이 매 요청 TTFT에 포함)
+
+RUN_OPTIONS["unix_socket"]이 있으면 TCP 대신 Unix 도메인 소켓으로 연결한다 (로컬 서버).
+HTTP/2는 aiohttp가 지원하지 않고, 대상 서버들(uvicorn, Ollama)도 평문 HTTP/2를 제공하지 않아 제외했다.
+
+aiohttp TraceConfig 훅으로 DNS 조회, 커넥션 풀 대기, TCP 연결, 응답 헤더 수신 시각을
+RequestTiming에 기록해 RequestResult로 옮긴다. 청크별 훅은 등록하지 않아 스트림 처리 비용은 늘지 않는다.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from .config import RUN_OPTIONS
+from .multirun import point_turn
+
+TRANSPORT_MODES = ["per-point", "shared", "fresh"]
+
+_PREWARM_PATH = "/v1/models"
+_MAX_PREWARM = 128
+_SHARED_KEEPALIVE_SEC = 300
+
+_shared_session = None
+
+
+class RequestTiming:
+    """요청 하나의 연결 단계 시각 (perf_counter, 초). 없는 단계는 None."""
+
+    __slots__ = ("start", "dns_start", "dns_end", "queue_start", "queue_end",
+                 "connect_start", "connect_end", "headers", "reused")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.dns_start = self.dns_end = None
+        self.queue_start = self.queue_end = None
+        self.connect_start = self.connect_end = None
+        self.headers = None
+        self.reused = False
+
+    @staticmethod
+    def _ms(begin, end) -> float:
+        return round((end - begin) * 1000, 3) if begin is not None and end is not None else 0.0
+
+    def as_fields(self) -> dict:
+        """RequestResult 필드 값 (ms)."""
+        return {
+            "dns_ms": self._ms(self.dns_start, self.dns_end),
+            "pool_wait_ms": self._ms(self.queue_start, self.queue_end),
+            "connect_ms": self._ms(self.connect_start, self.connect_end),
+            "first_byte_ms": self._ms(self.start, self.headers),
+            "conn_reused": self.reused,
+        }
+
+
+def _setter(attr: str):
+    async def hook(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        if timing is not None:
+            setattr(timing, attr, time.perf_counter())
+    return hook
+
+
+async def _on_reuse(session, ctx, params):
+    if ctx.trace_request_ctx is not None:
+        ctx.trace_request_ctx.reused = True
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    trace.on_dns_resolvehost_start.append(_setter("dns_start"))
+    trace.on_dns_resolvehost_end.append(_setter("dns_end"))
+    trace.on_connection_queued_start.append(_setter("queue_start"))
+    trace.on_connection_queued_end.append(_setter("queue_end"))
+    trace.on_connection_create_start.append(_setter("connect_start"))
+    trace.on_connection_create_end.append(_setter("connect_end"))
+    trace.on_connection_reuseconn.append(_on_reuse)
+    trace.on_request_end.append(_setter("headers"))
+    return trace
+
+
+def make_connector(limit: int, force_close: bool = False) -> aiohttp.BaseConnector:
+    """RUN_OPTIONS["unix_socket"]이 있으면 UnixConnector, 아니면 TCPConnector."""
+    keepalive = _SHARED_KEEPALIVE_SEC if RUN_OPTIONS["transport"] == "shared" and not force_close else None
+    kwargs = {"limit": limit, "force_close": force_close}
+    if keepalive is not None:
+        kwargs["keepalive_timeout"] = keepalive
+    if RUN_OPTIONS["unix_socket"]:
+        return aiohttp.UnixConnector(path=RUN_OPTIONS["unix_socket"], **kwargs)
+    return aiohttp.TCPConnector(**kwargs)
+
+
+def new_session(limit: int, force_close: bool = False) -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(connector=make_connector(limit, force_close), trace_configs=[_trace_config()])
+
+
+async def prewarm(session: aiohttp.ClientSession, base_url: str, connections: int):
+    """connections개의 요청을 동시에 보내 커넥션을 미리 열어 풀에 남긴다."""
+    async def touch():
+        try:
+            async with session.get(f"{base_url}{_PREWARM_PATH}", timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                await resp.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+
+    await asyncio.gather(*[touch() for _ in range(min(connections, _MAX_PREWARM))])
+
+
+@asynccontextmanager
+async def open_session(limit: int, base_url: str | None = None, warm: int = 0):
+    """현재 전송 모드의 세션.
+
+    limit은 per-point 모드의 커넥션 풀 크기 (0이면 무제한)다. shared 모드에서는 공유 세션을
+    닫지 않고 돌려주며, base_url이 있으면 warm개 커넥션을 미리 연다.
+    세션 블록이 파라미터 포인트 하나이므로 다중 프레임워크 interleave 실행의 차례도 여기서 잡는다.
+    """
+    mode = RUN_OPTIONS["transport"]
+    async with point_turn():
+        if mode == "shared" and _shared_session is not None:
+            if base_url and warm:
+                await prewarm(_shared_session, base_url, warm)
+            yield _shared_session
+            return
+        async with new_session(limit, force_close=mode == "fresh") as session:
+            yield session
+
+
+def start_shared_session() -> aiohttp.ClientSession | None:
+    """shared 모드면 실행 전체에서 쓸 세션 생성 (풀 크기 무제한)."""
+    if RUN_OPTIONS["transport"] != "shared":
+        return None
+    return new_session(0)
+
+
+def set_shared_session(session: aiohttp.ClientSession | None):
+    global _shared_session
+    _shared_session = session
@@ -0,0 +1,523 @@
+"""벤치마크 워크로드 생성기.
+
+- 접두사 트리: 여러 테넌트의 시스템 프롬프트(길이 제각각), 턴마다 길어지는 멀티턴 대화,
+  few-shot 템플릿으로 이루어진 접두사 공유 구조. 테넌트 인기도는 Zipf 분포로 치우치게 하고,
+  각 요청에 생성 순서상 같은 접두사가 이미 전송되었는지(expected_hit)를 기록한다.
+- 멀티턴 세션: run_session_requests 입력.
+- 데이터셋: 로컬 JSONL(ShareGPT/OpenAI messages 형식)을 한 줄씩 스트리밍하며 reservoir
+  샘플링하므로 수 GB 파일도 메모리에 올리지 않는다. 요청별 max_tokens는 데이터셋 응답 길이.
+- 합성 길이 분포: 입력/출력 길이를 설정한 분포에서 뽑고, 요청마다 내용이 다른 프롬프트 생성.
+"""
+
+import contextvars
+import itertools
+import json
+import random
+import secrets
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .client import RequestResult
+from .prompts import generate_prompt
+
+_QUESTIONS = [
+    "Summarize the main trade-offs in one paragraph.",
+    "What would you change first, and why?",
+    "List three risks and how to mitigate them.",
+    "Explain this to a new engineer on the team.",
+    "Give a concrete example from a production system.",
+    "Which metrics would you monitor for this?",
+]
+
+
+@dataclass
+class PrefixTreeConfig:
+    """접두사 트리 워크로드 파라미터."""
+    num_tenants: int = 8                  # 서로 다른 시스템 프롬프트 수
+    system_tokens: tuple[int, int] = (256, 2048)  # 시스템 프롬프트 길이 범위
+    few_shot_templates: int = 4           # 테넌트별 few-shot 템플릿 수
+    few_shot_examples: int = 6            # 템플릿당 예시 수
+    example_tokens: int = 64              # few-shot 예시/대화 턴 하나의 길이
+    max_turns: int = 4                    # 대화 최대 턴 수 (트리 깊이), 넘으면 새 대화 시작
+    sharing_ratio: float = 0.8            # 기존 접두사를 공유하는 요청 비율 (나머지는 고유 접두사)
+    zipf_s: float = 1.1                   # 테넌트 인기도 Zipf 지수 (0이면 균등)
+    kind_weights: dict = field(default_factory=lambda: {"conversation": 0.5, "few_shot": 0.3, "single": 0.2})
+    seed: int = 0                         # 같은 seed면 같은 요청 목록, 다른 seed끼리는 접두사 공유 없음
+
+
+@dataclass
+class WorkloadRequest:
+    """워크로드 요청 1건."""
+    messages: list[dict]
+    kind: str = "single"      # conversation, few_shot, single, unique, dataset, synthetic
+    prefix_id: str = ""       # 공유 접두사 식별자 (테넌트/템플릿/대화)
+    expected_hit: bool = False  # 생성 순서상 공유 접두사가 이미 전송됨
+    shared_prefix_tokens: int = 0  # 이전 요청과 겹칠 것으로 예상되는 접두사 길이 (근사)
+    max_tokens: int | None = None  # 요청별 출력 길이 (None이면 시나리오 기본값)
+    input_tokens: int = 0          # 생성/샘플링 시 추정한 입력 길이
+
+
+@dataclass
+class Workload:
+    """시나리오에 넘기는 요청 묶음."""
+    name: str
+    requests: list[WorkloadRequest]
+    description: dict = field(default_factory=dict)
+
+    @property
+    def messages_list(self) -> list[list[dict]]:
+        return [r.messages for r in self.requests]
+
+    def max_tokens_list(self, default: int) -> list[int]:
+        return [r.max_tokens or default for r in self.requests]
+
+    def stats(self) -> dict:
+        """워크로드 구성과 입력/출력 길이 분포 요약 (결과 JSON 기록용)."""
+        stats = {"name": self.name, **self.description, **workload_stats(self.requests)}
+        for key, values in (
+            ("input_tokens", [r.input_tokens for r in self.requests if r.input_tokens]),
+            ("max_tokens", [r.max_tokens for r in self.requests if r.max_tokens]),
+        ):
+            if values:
+                arr = np.array(values)
+                stats[key] = {
+                    "mean": round(float(arr.mean()), 1),
+                    "p50": int(np.percentile(arr, 50)),
+                    "p90": int(np.percentile(arr, 90)),
+                    "max": int(arr.max()),
+                }
+        return stats
+
+
+def _zipf_weights(n: int, s: float) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1) ** s
+    return w / w.sum()
+
+
+def generate_prefix_tree_workload(
+    num_requests: int, config: PrefixTreeConfig | None = None, tokenizer=None
+) -> list[WorkloadRequest]:
+    """접두사 트리 워크로드 생성 (같은 config와 seed면 같은 요청 목록)."""
+    config = config or PrefixTreeConfig()
+    rng = np.random.default_rng(config.seed)
+    lo, hi = config.system_tokens
+    tenant_weights = _zipf_weights(config.num_tenants, config.zipf_s)
+    kinds = list(config.kind_weights)
+    kind_p = np.array([config.kind_weights[k] for k in kinds], dtype=float)
+    kind_p /= kind_p.sum()
+
+    # 맨 앞에 고유 헤더(seed 포함)를 둬서 서로 다른 접두사끼리, 그리고 seed가 다른 워크로드끼리
+    # 첫 캐시 블록부터 갈라지게 한다
+    system_lengths = rng.integers(lo, hi + 1, size=config.num_tenants)
+    systems = [
+        f"[Tenant {t} | workload {config.seed}] You are the assistant for tenant {t}.\n"
+        + generate_prompt(int(system_lengths[t]), tokenizer=tokenizer)
+        for t in range(config.num_tenants)
+    ]
+    example = generate_prompt(config.example_tokens, tokenizer=tokenizer)
+    templates = {
+        (t, k): "".join(
+            f"\nExample {k}.{e}: input #{e} for template {k}\n{example}" for e in range(config.few_shot_examples)
+        )
+        for t in range(config.num_tenants) for k in range(config.few_shot_templates)
+    }
+    system_sizes = [int(n) for n in system_lengths]
+    template_size = config.few_shot_examples * config.example_tokens
+
+    seen: set[str] = set()
+    conversations: dict[int, dict] = {}  # 테넌트별 진행 중인 대화
+    next_conv = 0
+    requests = []
+    for i in range(num_requests):
+        question = f"Request {i}: {_QUESTIONS[i % len(_QUESTIONS)]}"
+
+        if rng.random() >= config.sharing_ratio:
+            # 공유하지 않는 콜드 요청: 고유 헤더 + 시스템 프롬프트 길이의 본문
+            length = int(rng.integers(lo, hi + 1))
+            system = f"[Unique {i} | workload {config.seed}] One-off request context.\n" + generate_prompt(length, tokenizer=tokenizer)
+            messages = [{"role": "system", "content": system}, {"role": "user", "content": question}]
+            requests.append(WorkloadRequest(messages, "unique", f"unique/{i}", False, 0))
+            continue
+
+        tenant = int(rng.choice(config.num_tenants, p=tenant_weights))
+        kind = kinds[int(rng.choice(len(kinds), p=kind_p))]
+        system_msg = {"role": "system", "content": systems[tenant]}
+        tenant_id = f"t{tenant}"
+
+        if kind == "few_shot":
+            template = int(rng.integers(config.few_shot_templates))
+            prefix_id = f"{tenant_id}/fs{template}"
+            if prefix_id in seen:
+                hit, shared = True, system_sizes[tenant] + template_size
+            elif tenant_id in seen:
+                hit, shared = True, system_sizes[tenant]
+            else:
+                hit, shared = False, 0
+            messages = [
+                system_msg,
+                {"role": "user", "content": templates[(tenant, template)] + "\n\n" + question},
+            ]
+            seen.update((tenant_id, prefix_id))
+        elif kind == "conversation":
+            conv = conversations.get(tenant)
+            if conv is None or len(conv["turns"]) >= config.max_turns:
+                conv = {"id": next_conv, "turns": []}
+                conversations[tenant] = conv
+                next_conv += 1
+            prefix_id = f"{tenant_id}/c{conv['id']}"
+            history = [m for turn in conv["turns"] for m in turn]
+            if conv["turns"]:
+                # 직전 턴 요청(시스템 + 이전 기록 + 직전 질문)까지가 공유 접두사
+                hit, shared = True, system_sizes[tenant] + (2 * len(conv["turns"]) - 1) * config.example_tokens
+            else:
+                hit, shared = (True, system_sizes[tenant]) if tenant_id in seen else (False, 0)
+            messages = [system_msg, *history, {"role": "user", "content": question}]
+            # 다음 턴을 위해 이번 턴(질문 + 합성 응답)을 대화 기록에 추가
+            conv["turns"].append([
+                {"role": "user", "content": question},
+                {"role": "assistant", "content": f"(turn {len(conv['turns'])}) {example}"},
+            ])
+            seen.add(tenant_id)
+        else:
+            prefix_id = tenant_id
+            hit, shared = (True, system_sizes[tenant]) if tenant_id in seen else (False, 0)
+            messages = [system_msg, {"role": "user", "content": question}]
+            seen.add(tenant_id)
+
+        requests.append(WorkloadRequest(messages, kind, prefix_id, hit, shared))
+
+    return requests
+
+
+def workload_stats(requests: list[WorkloadRequest]) -> dict:
+    """워크로드 구성 요약 (결과 JSON 기록용)."""
+    kinds: dict[str, int] = {}
+    for r in requests:
+        kinds[r.kind] = kinds.get(r.kind, 0) + 1
+    return {
+        "num_requests": len(requests),
+        "kinds": kinds,
+        "unique_prefixes": len({r.prefix_id for r in requests}),
+        "expected_hit_ratio": round(sum(r.expected_hit for r in requests) / max(len(requests), 1), 4),
+        "avg_shared_prefix_tokens": round(
+            sum(r.shared_prefix_tokens for r in requests) / max(len(requests), 1), 1
+        ),
+    }
+
+
+def ttft_by_cache(results: list[RequestResult], requests: list[WorkloadRequest]) -> dict:
+    """성공한 요청의 TTFT를 캐시 적중 예상/콜드로 나눠 요약 (results의 index로 요청과 연결)."""
+    groups = {"hit_expected": [], "cold": []}
+    for r in results:
+        if r.success and r.ttft_ms > 0:
+            groups["hit_expected" if requests[r.index].expected_hit else "cold"].append(r.ttft_ms)
+    summary = {}
+    for name, ttfts in groups.items():
+        if not ttfts:
+            summary[name] = {"count": 0}
+            continue
+        arr = np.array(ttfts)
+        summary[name] = {
+            "count": len(ttfts),
+            "avg_ttft_ms": round(float(arr.mean()), 2),
+            "p50_ttft_ms": round(float(np.percentile(arr, 50)), 2),
+            "p99_ttft_ms": round(float(np.percentile(arr, 99)), 2),
+        }
+    hit, cold = summary["hit_expected"], summary["cold"]
+    if hit["count"] and cold["count"]:
+        summary["cold_to_hit_ttft_ratio"] = round(cold["avg_ttft_ms"] / hit["avg_ttft_ms"], 2)
+    return summary
+
+
+def generate_session_workload(
+    num_users: int, num_turns: int, system_tokens: int = 512, seed: int = 0, tokenizer=None
+) -> list[list[list[dict]]]:
+    """멀티턴 대화 세션 목록 (run_session_requests 입력).
+
+    모든 사용자가 같은 앱 시스템 프롬프트를 공유하고 (seed가 다르면 다른 프롬프트),
+    턴마다 사용자 고유의 질문 하나를 보낸다. 응답은 실행 중에 실제 출력으로 채워진다.
+    """
+    system = (
+        f"[Chat app | session workload {seed}] You are a helpful assistant in a long conversation.\n"
+        + generate_prompt(system_tokens, tokenizer=tokenizer)
+    )
+    sessions = []
+    for u in range(num_users):
+        turns = []
+        for t in range(num_turns):
+            question = {"role": "user", "content": f"User {u}, turn {t}: {_QUESTIONS[(u + t) % len(_QUESTIONS)]}"}
+            turns.append([{"role": "system", "content": system}, question] if t == 0 else [question])
+        sessions.append(turns)
+    return sessions
+
+
+def ttft_by_turn(results: list[RequestResult], num_turns: int) -> dict:
+    """성공한 요청의 TTFT를 턴별로 요약하고, 입력(대화 기록) 길이에 대한 TTFT 기울기를 구한다.
+
+    results의 index는 run_session_requests 규칙(사용자 * num_turns + 턴)을 따른다.
+    """
+    ok = [r for r in results if r.success and r.ttft_ms > 0]
+    turns = []
+    for t in range(num_turns):
+        group = [r for r in ok if r.index % num_turns == t]
+        if not group:
+            continue
+        ttfts = np.array([r.ttft_ms for r in group])
+        turns.append({
+            "turn": t,
+            "count": len(group),
+            "avg_prompt_tokens": round(sum(r.prompt_tokens for r in group) / len(group), 1),
+            "avg_ttft_ms": round(float(ttfts.mean()), 2),
+            "p50_ttft_ms": round(float(np.percentile(ttfts, 50)), 2),
+            "p99_ttft_ms": round(float(np.percentile(ttfts, 99)), 2),
+        })
+    summary = {"turns": turns, "ttft_ms_per_1k_prompt_tokens": None}
+    prompt_tokens = np.array([r.prompt_tokens for r in ok], dtype=float)
+    if len(ok) >= 2 and prompt_tokens.min() < prompt_tokens.max():
+        slope = np.polyfit(prompt_tokens, [r.ttft_ms for r in ok], 1)[0]
+        summary["ttft_ms_per_1k_prompt_tokens"] = round(float(slope) * 1000, 2)
+    return summary
+
+
+LENGTH_DISTRIBUTIONS = ["fixed", "uniform", "normal", "lognormal"]
+
+
+@dataclass
+class LengthDistribution:
+    """토큰 길이 분포. mean/std는 normal, mean/sigma(로그 표준편차)는 lognormal에 사용."""
+    kind: str = "fixed"
+    mean: float = 512
+    std: float = 0.0
+    sigma: float = 0.5
+    min: int = 1
+    max: int = 8192
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.kind == "fixed":
+            values = np.full(n, self.mean)
+        elif self.kind == "uniform":
+            values = rng.uniform(self.min, self.max, n)
+        elif self.kind == "normal":
+            values = rng.normal(self.mean, self.std, n)
+        elif self.kind == "lognormal":
+            # mean이 분포의 평균이 되도록 mu 보정
+            mu = np.log(self.mean) - self.sigma ** 2 / 2
+            values = rng.lognormal(mu, self.sigma, n)
+        else:
+            raise ValueError(f"Unknown length distribution: {self.kind}")
+        return np.clip(np.rint(values), self.min, self.max).astype(int)
+
+
+def parse_length_distribution(spec: str) -> LengthDistribution:
+    """'lognormal:mean=512,sigma=0.8,min=16,max=4096' 또는 '256' (fixed) 형식 파싱."""
+    kind, _, params = spec.partition(":")
+    if kind.isdigit():
+        return LengthDistribution("fixed", mean=int(kind))
+    if kind not in LENGTH_DISTRIBUTIONS:
+        raise ValueError(f"Unknown length distribution '{kind}' (choose from {', '.join(LENGTH_DISTRIBUTIONS)})")
+    dist = LengthDistribution(kind)
+    for item in filter(None, params.split(",")):
+        key, _, value = item.partition("=")
+        if key not in ("mean", "std", "sigma", "min", "max"):
+            raise ValueError(f"Unknown length distribution parameter '{key}'")
+        setattr(dist, key, int(value) if key in ("min", "max") else float(value))
+    return dist
+
+
+def generate_synthetic_workload(
+    num_requests: int,
+    input_dist: LengthDistribution,
+    output_dist: LengthDistribution,
+    seed: int = 0,
+    tokenizer=None,
+) -> Workload:
+    """입력/출력 길이를 분포에서 뽑은 합성 워크로드.
+
+    요청마다 맨 앞에 고유 헤더를 붙이고 본문도 다른 질문으로 끝나게 해서
+    동일 요청 중복 제거나 접두사 캐시가 개입하지 않게 한다.
+    """
+    rng = np.random.default_rng(seed)
+    input_lengths = input_dist.sample(rng, num_requests)
+    output_lengths = output_dist.sample(rng, num_requests)
+    requests = []
+    for i in range(num_requests):
+        content = (
+            f"[Request {i} | synthetic {seed}]\n"
+            + generate_prompt(int(input_lengths[i]), tokenizer=tokenizer)
+            + f"\n{_QUESTIONS[i % len(_QUESTIONS)]}"
+        )
+        requests.append(WorkloadRequest(
+            [{"role": "user", "content": content}], kind="synthetic", prefix_id=f"synthetic/{i}",
+            max_tokens=int(output_lengths[i]), input_tokens=int(input_lengths[i]),
+        ))
+    return Workload("synthetic", requests, {
+        "seed": seed,
+        "input_dist": vars(input_dist).copy(),
+        "output_dist": vars(output_dist).copy(),
+    })
+
+
+_SHAREGPT_ROLES = {"human": "user", "user": "user", "gpt": "assistant", "chatgpt": "assistant",
+                   "assistant": "assistant", "system": "system"}
+
+
+def _parse_conversation(record: dict) -> tuple[list[dict], str] | None:
+    """데이터셋 레코드 -> (프롬프트 messages, 참조 응답). 첫 assistant 응답 직전까지가 프롬프트."""
+    if "messages" in record:
+        turns = [(m.get("role"), m.get("content")) for m in record["messages"]]
+    elif "conversations" in record:
+        turns = [(_SHAREGPT_ROLES.get(m.get("from")), m.get("value")) for m in record["conversations"]]
+    else:
+        return None
+    prompt = []
+    for role, content in turns:
+        if not isinstance(content, str) or role is None:
+            return None
+        if role == "assistant" and prompt and prompt[-1]["role"] == "user":
+            return prompt, content
+        prompt.append({"role": role, "content": content})
+    return None
+
+
+def iter_dataset_conversations(path: str):
+    """JSONL 데이터셋을 한 줄씩 읽어 (줄 번호, 프롬프트 messages, 참조 응답)을 내는 제너레이터."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                parsed = _parse_conversation(json.loads(line))
+            except (json.JSONDecodeError, AttributeError):
+                continue
+            if parsed is not None:
+                yield line_no, parsed[0], parsed[1]
+
+
+def _approx_tokens(text: str, tokenizer) -> int:
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    return max(1, len(text) // 4)
+
+
+def sample_dataset_workload(
+    path: str,
+    num_requests: int,
+    seed: int = 0,
+    min_input_tokens: int = 4,
+    max_input_tokens: int = 4096,
+    max_output_tokens: int = 2048,
+    tokenizer=None,
+    max_scan: int | None = None,
+) -> Workload:
+    """JSONL 데이터셋에서 길이 조건을 만족하는 대화 num_requests개를 균일 샘플링.
+
+    파일은 한 번만 순차적으로 읽고 reservoir 샘플링으로 num_requests개만 메모리에 유지한다.
+    길이 필터는 문자 수 기반 근사로 하고, 뽑힌 요청만 tokenizer로 정확히 센다.
+    max_tokens는 참조 응답 길이 (max_output_tokens로 상한).
+    """
+    rng = random.Random(seed)
+    reservoir: list[tuple[int, list[dict], str]] = []
+    eligible = 0
+    for scanned, (line_no, messages, reply) in enumerate(iter_dataset_conversations(path)):
+        if max_scan is not None and scanned >= max_scan:
+            break
+        approx = sum(len(m["content"]) for m in messages) // 4
+        if not min_input_tokens <= approx <= max_input_tokens or not reply.strip():
+            continue
+        eligible += 1
+        if len(reservoir) < num_requests:
+            reservoir.append((line_no, messages, reply))
+        else:
+            j = rng.randrange(eligible)
+            if j < num_requests:
+                reservoir[j] = (line_no, messages, reply)
+    if not reservoir:
+        raise ValueError(f"No usable conversations in {path} (input {min_input_tokens}-{max_input_tokens} tokens)")
+
+    rng.shuffle(reservoir)
+    requests = [
+        WorkloadRequest(
+            messages, kind="dataset", prefix_id=f"dataset/{line_no}",
+            max_tokens=min(max_output_tokens, _approx_tokens(reply, tokenizer)),
+            input_tokens=sum(_approx_tokens(m["content"], tokenizer) for m in messages),
+        )
+        for line_no, messages, reply in reservoir
+    ]
+    return Workload("dataset", requests, {"path": path, "seed": seed, "eligible": eligible})
+
+
+CACHE_MODES = ["cold", "warm", "ratio"]
+
+# salt = 실행 nonce + apply_cache_mode 호출 순번. 다중 프레임워크 실행은 프레임워크마다 순번을
+# 새로 세므로(reset_salt_sequence) 같은 포인트의 프롬프트가 프레임워크 간에 바이트 단위로 같다
+_RUN_SALT = secrets.token_hex(3)
+_salt_seq: contextvars.ContextVar = contextvars.ContextVar("salt_seq", default=itertools.count())
+
+
+def reset_salt_sequence():
+    """현재 컨텍스트(프레임워크 태스크)의 salt 순번을 0부터 다시 센다."""
+    _salt_seq.set(itertools.count())
+
+
+def parse_cache_mode(spec: str) -> float:
+    """캐시 모드 -> 접두사를 공유하는 요청 비율. cold=0, warm=1, ratio:0.3=0.3."""
+    kind, _, value = spec.partition(":")
+    if kind == "cold" and not value:
+        return 0.0
+    if kind == "warm" and not value:
+        return 1.0
+    if kind == "ratio":
+        try:
+            ratio = float(value)
+        except ValueError:
+            ratio = -1.0
+        if 0.0 <= ratio <= 1.0:
+            return ratio
+    raise ValueError(f"Invalid cache mode '{spec}' (cold, warm or ratio:<0..1>)")
+
+
+def apply_cache_mode(messages_list: list[list[dict]], mode: str, seed: int = 0) -> list[list[dict]]:
+    """반복 프롬프트 목록에 캐시 모드를 적용.
+
+    공유하지 않을 요청은 첫 메시지 맨 앞에 호출마다 다른 짧은 salt를 붙여 첫 캐시 블록부터
+    다른 요청(이전 실행 포함)과 갈라지게 한다. 첫 메시지 dict만 새로 만들고 나머지는 원본을
+    그대로 참조하므로 요청 수천 개도 문자열 연결 비용만 든다. salt는 입력에 몇 토큰을 더한다.
+    warm이면 원본 목록을 그대로 반환한다.
+    """
+    ratio = parse_cache_mode(mode)
+    n = len(messages_list)
+    if ratio >= 1.0 or n == 0:
+        return messages_list
+    rng = np.random.default_rng(seed)
+    shared = np.zeros(n, dtype=bool)
+    shared[rng.choice(n, size=round(ratio * n), replace=False)] = True
+    nonce = f"{_RUN_SALT}{next(_salt_seq.get()):02x}"
+    salted = []
+    for i, messages in enumerate(messages_list):
+        if shared[i]:
+            salted.append(messages)
+            continue
+        first = messages[0]
+        salted.append([{**first, "content": f"[{nonce}-{i:x}] {first['content']}"}, *messages[1:]])
+    return salted
+
+
+def cache_salter(mode: str, seed: int = 0):
+    """apply_cache_mode의 요청 단위 버전: salt(messages, index) -> 캐시 모드를 적용한 메시지.
+
+    요청 목록을 미리 만들지 않는 장시간 실행용이다. ratio 모드의 공유 여부는 요청마다
+    ratio 확률로 정하며, index 순서로 호출하면 같은 seed에서 같은 결과가 나온다.
+    """
+    ratio = parse_cache_mode(mode)
+    rng = np.random.default_rng(seed)
+    nonce = f"{_RUN_SALT}{next(_salt_seq.get()):02x}"
+
+    def salt(messages: list[dict], index: int) -> list[dict]:
+        if ratio >= 1.0 or (ratio > 0.0 and rng.random() < ratio):
+            return messages
+        first = messages[0]
+        return [{**first, "content": f"[{nonce}-{index:x}] {first['content']}"}, *messages[1:]]
+
+    return salt
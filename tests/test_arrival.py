@@ -0,0 +1,30 @@
+"""오픈 루프 도착 스케줄 (bench.arrival)."""
+
+import numpy as np
+import pytest
+
+from bench.arrival import build_schedule
+
+
+@pytest.mark.parametrize("pattern", ["poisson", "constant", "gamma"])
+def test_schedule_rate(pattern):
+    offsets = build_schedule(pattern, rate=50.0, num_requests=5000, seed=1)
+    assert len(offsets) == 5000
+    assert offsets[0] == 0.0
+    assert np.all(np.diff(offsets) >= 0)
+    # 평균 도착률이 목표 rate에 가깝다
+    assert (len(offsets) - 1) / offsets[-1] == pytest.approx(50.0, rel=0.05)
+    assert np.array_equal(offsets, build_schedule(pattern, rate=50.0, num_requests=5000, seed=1))
+
+
+def test_trace_rescaled(tmp_path):
+    trace = tmp_path / "trace.txt"
+    trace.write_text("# seconds\n10\n11\n12.5\n14\n")
+    assert list(build_schedule("trace", rate=0, num_requests=10, trace_path=str(trace))) == [0.0, 1.0, 2.5, 4.0]
+    offsets = build_schedule("trace", rate=1.5, num_requests=10, trace_path=str(trace))
+    assert offsets[-1] == pytest.approx(2.0)
+
+
+def test_unknown_pattern():
+    with pytest.raises(ValueError):
+        build_schedule("bursty", rate=1.0, num_requests=10)
@@ -0,0 +1,40 @@
+"""체크포인트 매니페스트와 재개 조건 (bench.checkpoint)."""
+
+import json
+
+import pytest
+
+from bench.checkpoint import RunManifest, manifest_path, resume_conflicts
+from bench.client import ScenarioResult
+from bench.config import RUN_OPTIONS
+
+
+@pytest.fixture
+def manifest_file(tmp_path):
+    path = manifest_path(str(tmp_path), "mock", "gpt-oss-20b")
+    manifest = RunManifest(path, "mock", "gpt-oss-20b")
+    manifest.save(manifest.key("single_request", input_tokens=128), ScenarioResult("single_request", "mock", 1, 128, 256, 10))
+    return path
+
+
+def test_resume_same_options(manifest_file):
+    assert resume_conflicts(manifest_file, "mock", "gpt-oss-20b") == []
+    manifest = RunManifest(manifest_file, "mock", "gpt-oss-20b", resume=True)
+    assert manifest.get(manifest.key("single_request", input_tokens=128)).input_tokens == 128
+
+
+def test_resume_rejects_changed_options(manifest_file, monkeypatch):
+    monkeypatch.setitem(RUN_OPTIONS, "arrival", "gamma")
+    assert resume_conflicts(manifest_file, "mock", "gpt-oss-20b") == ["arrival='poisson' (now 'gamma')"]
+    assert resume_conflicts(manifest_file, "vllm", "gpt-oss-20b")
+    with pytest.raises(ValueError):
+        RunManifest(manifest_file, "mock", "gpt-oss-20b", resume=True)
+
+
+def test_resume_rejects_manifest_without_options(manifest_file):
+    with open(manifest_file) as f:
+        data = json.load(f)
+    del data["run_options"]
+    with open(manifest_file, "w") as f:
+        json.dump(data, f)
+    assert resume_conflicts(manifest_file, "mock", "gpt-oss-20b")
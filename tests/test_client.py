@@ -0,0 +1,27 @@
+"""집계 (bench.client.ScenarioResult)."""
+
+import json
+
+from bench.client import RequestResult, ScenarioResult
+from bench.config import SLO_MIN_SUCCESS_RATE, SLO_P99_TTFT_MS
+
+
+def _result(i: int, ttft_ms: float) -> RequestResult:
+    return RequestResult(
+        success=True, ttft_ms=ttft_ms, total_latency_ms=ttft_ms + 50, tokens_generated=10,
+        token_throughput=200.0, index=i, send_lag_ms=0.1 * i,
+    )
+
+
+def test_rate_point_serializes():
+    """rate_sweep 포인트의 집계값과 slo_met이 numpy 스칼라 없이 JSON으로 직렬화된다."""
+    sr = ScenarioResult(
+        scenario="rate_sweep", framework="mock", concurrency=0, input_tokens=512, output_tokens=10,
+        num_requests=20, results=[_result(i, 5.0 + i) for i in range(20)],
+        total_time_sec=2.0, arrival_pattern="poisson", offered_rate_rps=10,
+    )
+    sr.compute_aggregates()
+    sr.slo_met = bool(sr.success_rate >= SLO_MIN_SUCCESS_RATE and 0 < sr.p99_ttft_ms <= SLO_P99_TTFT_MS)
+    for name in ("p50_ttft_ms", "p99_ttft_ms", "p99_latency_ms", "p99_tpot_ms", "p99_send_lag_ms"):
+        assert type(getattr(sr, name)) is float, name
+    assert json.loads(json.dumps(sr.to_dict()))["slo_met"] is True
@@ -0,0 +1,15 @@
+"""멀티 프로세스 부하 생성기의 요청 분배 (bench.distributed)."""
+
+from bench.distributed import _shards, _split
+
+
+def test_shards_follow_worker_concurrency():
+    weights = _split(8, 3)  # [3, 3, 2]
+    shards = _shards(800, weights)
+    assert [len(s) for s in shards] == [300, 300, 200]
+    assert sorted(i for s in shards for i in s) == list(range(800))
+
+
+def test_shards_interleave():
+    assert _shards(6, [2, 1]) == [[0, 2, 3, 5], [1, 4]]
+    assert [len(s) for s in _shards(7, [1, 1, 1])] == [3, 2, 2]
@@ -0,0 +1,49 @@
+"""같은 프로세스의 모의 서버를 대상으로 한 end-to-end 실행 (bench.mock_server)."""
+
+import asyncio
+import json
+
+from bench import scenarios
+from bench.__main__ import run_benchmark
+from bench.checkpoint import run_options
+from bench.config import FRAMEWORK_CONFIG, RUN_OPTIONS
+from bench.mock_server import LATENCY_PRESETS, start_mock_server
+
+
+def test_run_benchmark_against_mock(tmp_path, monkeypatch):
+    """single과 rate_sweep 한 포인트를 실행하고 결과/매니페스트 파일이 완결되는지 확인."""
+    monkeypatch.setattr(scenarios, "RATE_SWEEP_RATES", [20])
+    monkeypatch.setattr(scenarios, "RATE_SWEEP_DURATION_SEC", 1)
+    monkeypatch.setitem(RUN_OPTIONS, "gpu_telemetry", "off")
+
+    async def run():
+        runner, base_url = await start_mock_server(LATENCY_PRESETS["zero"], served_model=FRAMEWORK_CONFIG["mock"]["model"])
+        monkeypatch.setitem(FRAMEWORK_CONFIG["mock"], "base_url", base_url)
+        try:
+            await run_benchmark(["mock"], ["single", "rate_sweep"], str(tmp_path))
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+    with open(tmp_path / "mock_gpt-oss-20b_results.json") as f:
+        data = json.load(f)
+    assert data["complete"]
+    by_scenario = {}
+    for r in data["results"]:
+        by_scenario.setdefault(r["scenario"], []).append(r)
+
+    single = by_scenario["single_request"]
+    assert [r["input_tokens"] for r in single] == [128, 512, 1024]
+    assert all(r["success_rate"] == 100.0 and r["avg_ttft_ms"] > 0 for r in single)
+
+    (point,) = by_scenario["rate_sweep"]
+    assert point["offered_rate_rps"] == 20
+    assert point["num_requests"] == 20
+    assert point["success_rate"] == 100.0
+    assert point["slo_met"] is True
+
+    with open(tmp_path / "mock_gpt-oss-20b_manifest.json") as f:
+        manifest = json.load(f)
+    assert len(manifest["points"]) == 4
+    assert manifest["run_options"] == run_options()
@@ -0,0 +1,45 @@
+"""분위수 스케치와 스트리밍 집계 (bench.sketch)."""
+
+import numpy as np
+
+from bench.client import RequestResult, ScenarioResult
+from bench.config import SKETCH_RELATIVE_ACCURACY
+from bench.sketch import DDSketch, StreamingAggregator
+
+
+def test_ddsketch_quantile_error():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=4.0, sigma=1.0, size=100_000)
+    sketch = DDSketch()
+    sketch.add_many(values[:50_000])
+    other = DDSketch()
+    for v in values[50_000:]:
+        other.add(float(v))
+    sketch.merge(other)
+
+    assert sketch.count == len(values)
+    qs = [0.5, 0.9, 0.99, 0.999]
+    for q, estimate in zip(qs, sketch.quantiles(qs)):
+        exact = np.quantile(values, q)
+        assert abs(estimate - exact) / exact <= SKETCH_RELATIVE_ACCURACY * 1.05, q
+
+
+def test_aggregator_matches_exact_aggregates():
+    rng = np.random.default_rng(1)
+    results = [
+        RequestResult(success=True, ttft_ms=float(t), total_latency_ms=float(t) + 100, tokens_generated=20,
+                      start_offset_ms=i * 10.0)
+        for i, t in enumerate(rng.lognormal(3.0, 0.5, 2000))
+    ]
+    exact = ScenarioResult("concurrent", "mock", 8, 512, 20, len(results), results=results, total_time_sec=20.0)
+    exact.compute_aggregates()
+    aggregator = StreamingAggregator(window_sec=5.0)
+    for r in results:
+        aggregator.add(r)
+    approx = ScenarioResult("concurrent", "mock", 8, 512, 20, len(results), total_time_sec=20.0)
+    approx.compute_from_aggregator(aggregator)
+
+    for name in ("p50_ttft_ms", "p99_ttft_ms", "p99_latency_ms"):
+        assert abs(getattr(approx, name) - getattr(exact, name)) / getattr(exact, name) <= 0.02, name
+    assert approx.total_token_throughput == exact.total_token_throughput
+    assert sum(w["requests"] for w in approx.windows) == len(results)
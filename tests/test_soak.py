@@ -0,0 +1,29 @@
+"""soak 기간 파싱과 추세 검정 (bench.soak, bench.stats.mann_kendall)."""
+
+import numpy as np
+import pytest
+
+from bench.soak import parse_duration
+from bench.stats import mann_kendall
+
+
+def test_parse_duration():
+    assert parse_duration("3600") == 3600
+    assert parse_duration("90s") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration(" 4H ") == 4 * 3600
+    for spec in ("", "abc", "0", "-5m", "10d"):
+        with pytest.raises(ValueError):
+            parse_duration(spec)
+
+
+def test_mann_kendall():
+    rng = np.random.default_rng(0)
+    rising = 2.0 * np.arange(30) + rng.normal(0, 1, 30)
+    test = mann_kendall(rising)
+    assert test["trend"] == "increasing"
+    assert test["p_value"] < 0.05
+    assert test["sen_slope"] == pytest.approx(2.0, rel=0.1)
+    assert mann_kendall(-rising)["trend"] == "decreasing"
+    assert mann_kendall(rng.normal(0, 1, 30))["trend"] == "none"
+    assert mann_kendall([1.0, 2.0]) is None
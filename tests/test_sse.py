@@ -0,0 +1,43 @@
+"""증분 SSE 파서 (bench.sse)."""
+
+import json
+
+from bench.sse import SSEStreamParser, synthetic_stream
+
+
+def _events(*events: dict) -> bytes:
+    return b"".join(b"data: " + json.dumps(e).encode() + b"\n\n" for e in events)
+
+
+def test_split_chunks():
+    """이벤트 경계와 무관하게 잘린 청크에서도 토큰 이벤트, usage, [DONE]을 모두 읽는다."""
+    stream = b"".join(synthetic_stream(50, events_per_chunk=3))
+    parser = SSEStreamParser(capture_text=True)
+    count = sum(parser.feed(stream[i:i + 37]) for i in range(0, len(stream), 37))
+    assert count == parser.content_events == 50
+    assert parser.done
+    assert parser.usage == {"prompt_tokens": 512, "completion_tokens": 50}
+    assert parser.text == "".join(f" token{i}" for i in range(50))
+
+
+def test_usage_on_last_content_event():
+    parser = SSEStreamParser()
+    chunk = _events(
+        {"choices": [{"delta": {"content": "a"}}]},
+        {"choices": [{"delta": {"content": "b"}}], "usage": {"prompt_tokens": 3, "completion_tokens": 2}},
+    )
+    assert parser.feed(chunk + b"data: [DONE]\n\n") == 2
+    assert parser.usage == {"prompt_tokens": 3, "completion_tokens": 2}
+
+
+def test_reasoning_and_error():
+    parser = SSEStreamParser()
+    chunk = _events(
+        {"choices": [{"delta": {"reasoning_content": "think"}}]},
+        {"choices": [{"delta": {"content": "answer"}}]},
+        {"error": {"message": "overloaded"}},
+    )
+    assert parser.feed(chunk) == 2
+    assert (parser.reasoning_events, parser.content_events) == (1, 1)
+    assert parser.error == "overloaded"
+    assert not parser.done
@@ -0,0 +1,20 @@
+"""부트스트랩 신뢰구간과 유의성 검정 (bench.stats)."""
+
+import numpy as np
+
+from bench.stats import bootstrap_ci, compare_samples
+
+
+def test_bootstrap_ci_covers_mean():
+    values = np.random.default_rng(0).normal(100.0, 10.0, 400)
+    lo, hi = bootstrap_ci(values, "mean")
+    assert lo < values.mean() < hi
+    assert hi - lo < 5.0
+    assert bootstrap_ci([1.0], "mean") is None
+
+
+def test_compare_samples():
+    rng = np.random.default_rng(1)
+    a = rng.normal(100.0, 10.0, 300)
+    assert compare_samples(a, a + 20.0)["significant"]
+    assert not compare_samples(a, rng.permutation(a))["significant"]
@@ -0,0 +1,32 @@
+"""워크로드 생성기 (bench.workloads)."""
+
+import numpy as np
+import pytest
+
+from bench.workloads import apply_cache_mode, parse_cache_mode, parse_length_distribution
+
+
+def test_parse_length_distribution():
+    dist = parse_length_distribution("lognormal:mean=512,sigma=0.8,min=16,max=4096")
+    assert (dist.kind, dist.mean, dist.sigma, dist.min, dist.max) == ("lognormal", 512, 0.8, 16, 4096)
+    lengths = dist.sample(np.random.default_rng(0), 20000)
+    assert lengths.min() >= 16 and lengths.max() <= 4096
+    assert lengths.mean() == pytest.approx(512, rel=0.05)
+    assert parse_length_distribution("256").sample(np.random.default_rng(0), 3).tolist() == [256, 256, 256]
+    for spec in ("zipf:mean=1", "normal:median=3"):
+        with pytest.raises(ValueError):
+            parse_length_distribution(spec)
+
+
+def test_cache_modes():
+    assert (parse_cache_mode("cold"), parse_cache_mode("warm"), parse_cache_mode("ratio:0.25")) == (0.0, 1.0, 0.25)
+    for spec in ("hot", "ratio:1.5", "cold:1"):
+        with pytest.raises(ValueError):
+            parse_cache_mode(spec)
+
+    messages_list = [[{"role": "user", "content": "same prompt"}]] * 100
+    assert apply_cache_mode(messages_list, "warm") is messages_list
+    cold = apply_cache_mode(messages_list, "cold")
+    assert len({m[0]["content"] for m in cold}) == 100
+    half = apply_cache_mode(messages_list, "ratio:0.5")
+    assert sum(m[0]["content"] == "same prompt" for m in half) == 50